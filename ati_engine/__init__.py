@@ -6,4 +6,5 @@ __all__ = [
     "taxonomy",
     "xai",
     "utils",
+    "benchmarks",
 ]
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -14,14 +18,46 @@ from ati_engine.api.schemas import (
 )
 from ati_engine.api.routers import health as health_router
 from ati_engine.api.routers import inference as inference_router
+from ati_engine.api.routers import metrics as metrics_router
 from ati_engine.core.config import settings
 from ati_engine.core.logging import configure_logging
+from ati_engine.inference.service import get_inference_service
 
 
 configure_logging()
 logger = logging.getLogger(__name__)
 
+
+def _on_warmup_done(task: "asyncio.Task[None]") -> None:
+    """Retrieve the warm-up outcome so a failure is logged and reported by /health/ready."""
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is None:
+        return
+    service = get_inference_service()
+    if not service.warmup_error:
+        # warm_up() records (and logs) its own failures; anything else must still fail readiness
+        service.warmup_error = str(exc) or type(exc).__name__
+        logger.error("Warm-up task failed", exc_info=exc)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Warm up in the background: liveness (/health/z) answers immediately while
+    # readiness (/health/ready) stays 503 until the model has served a batch, and
+    # reports "failed" with the error if warm-up raised.
+    task = None
+    if settings.WARMUP_ON_STARTUP:
+        task = asyncio.create_task(asyncio.to_thread(get_inference_service().warm_up))
+        task.add_done_callback(_on_warmup_done)
+    yield
+    if task is not None and not task.done():
+        task.cancel()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Autonomous Transaction Intelligence (ATI) Engine",
     version=settings.APP_VERSION,
     description="FastAPI microservice for DistilBERT inference, SHAP explainability, and YAML-based taxonomy mapping.",
@@ -34,11 +70,13 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(metrics_router.MetricsMiddleware)
 
 
 # Routers
 app.include_router(health_router.router, prefix="/health")
 app.include_router(inference_router.router, prefix="/v1")
+app.include_router(metrics_router.router)
 
 
 @app.get("/", response_model=HealthResponse)
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 
-from ati_engine.api.schemas import HealthResponse
+from ati_engine.api.schemas import HealthResponse, MemoryResponse, ReadinessResponse
 from ati_engine.core.config import settings
+from ati_engine.inference.service import get_inference_service
+from ati_engine.utils.memory import memory_report
 
 router = APIRouter()
 
@@ -11,3 +13,31 @@ router = APIRouter()
 @router.get("/z", response_model=HealthResponse, tags=["health"])
 def healthz() -> HealthResponse:
     return HealthResponse(status="ok", version=settings.APP_VERSION)
+
+
+@router.get("/ready", response_model=ReadinessResponse, tags=["health"])
+def ready(response: Response) -> ReadinessResponse:
+    """Readiness probe: succeeds only once the model is loaded and warmed up."""
+    service = get_inference_service()
+    is_ready = service.ready or not settings.WARMUP_ON_STARTUP
+    if service.warmup_error:
+        status = "failed"
+    else:
+        status = "ready" if is_ready else "starting"
+    if status != "ready":
+        response.status_code = 503
+    checks = {
+        "warmup_enabled": settings.WARMUP_ON_STARTUP,
+        "warmup_ms": service.warmup_ms,
+        "error": service.warmup_error,
+    }
+    return ReadinessResponse(status=status, version=settings.APP_VERSION, checks=checks)
+
+
+@router.get("/memory", response_model=MemoryResponse, tags=["health"])
+def memory() -> MemoryResponse:
+    """Per-worker unique vs shared resident memory, now and right after warm-up."""
+    service = get_inference_service()
+    return MemoryResponse(
+        model_sharing=settings.MODEL_SHARING, at_startup=service.startup_memory or {}, **memory_report()
+    )
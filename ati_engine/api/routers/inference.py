@@ -1,22 +1,27 @@
 from __future__ import annotations
 
 import logging
-from typing import List
+from typing import Any, Dict, List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
 
 from ati_engine.api.schemas import (
+    BatchInferenceRequest,
+    BatchInferenceResponse,
     InferenceRequest,
     InferenceResponse,
     Prediction,
+    ExplainJobResponse,
     ExplainRequest,
     ExplainResponse,
     TaxonomyResponse,
 )
+from ati_engine.api.streaming import RequestStreamingResponse, classify_ndjson
 from ati_engine.core.config import settings
 from ati_engine.inference.service import InferenceService, get_inference_service
-from ati_engine.taxonomy.loader import TaxonomyLoader
-from ati_engine.xai.explainer import ShapExplainer
+from ati_engine.taxonomy.registry import UnknownTaxonomyError
+from ati_engine.xai.service import ExplainService, get_explain_service
 
 router = APIRouter(tags=["inference"]) 
 logger = logging.getLogger(__name__)
@@ -28,35 +33,166 @@ async def infer(
     service: InferenceService = Depends(get_inference_service),
 ) -> InferenceResponse:
     try:
-        result = service.predict(payload.text, top_k=payload.top_k, include_scores=payload.include_scores)
-        return result
+        return await service.predict_async(
+            payload.text, top_k=payload.top_k, include_scores=payload.include_scores, taxonomy_id=payload.taxonomy_id
+        )
+    except UnknownTaxonomyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.exception("Inference failed")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/explain", response_model=ExplainResponse)
+@router.post("/infer/batch", response_model=BatchInferenceResponse)
+async def infer_batch(
+    payload: BatchInferenceRequest,
+    service: InferenceService = Depends(get_inference_service),
+) -> BatchInferenceResponse:
+    if len(payload.texts) > settings.MAX_BATCH_TEXTS:
+        raise HTTPException(
+            status_code=413, detail=f"Batch too large: {len(payload.texts)} > {settings.MAX_BATCH_TEXTS} texts"
+        )
+    try:
+        results = await run_in_threadpool(
+            service.predict_batch,
+            payload.texts,
+            top_k=payload.top_k,
+            include_scores=payload.include_scores,
+            batch_size=payload.batch_size,
+            taxonomy_id=payload.taxonomy_id,
+        )
+        return BatchInferenceResponse(results=results)
+    except UnknownTaxonomyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.exception("Batch inference failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/infer/stream",
+    response_class=RequestStreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def infer_stream(
+    request: Request,
+    service: InferenceService = Depends(get_inference_service),
+) -> RequestStreamingResponse:
+    """Classify an NDJSON upload of ``InferenceRequest`` lines; responses stream back as NDJSON."""
+    return RequestStreamingResponse(classify_ndjson(request.stream(), service))
+
+
+@router.post("/explain", response_model=Union[ExplainResponse, ExplainJobResponse])
 async def explain(
     payload: ExplainRequest,
-    service: InferenceService = Depends(get_inference_service),
-) -> ExplainResponse:
+    response: Response,
+    explain_service: ExplainService = Depends(get_explain_service),
+) -> Union[ExplainResponse, ExplainJobResponse]:
     try:
-        top_pred = service.predict(payload.text, top_k=1)
-        target_label = payload.target_label or top_pred.primary_label
-        explainer = ShapExplainer(service)
-        return explainer.explain(payload.text, target_label=target_label, max_tokens=payload.max_tokens)
+        probabilities = None
+        if payload.target_label is None:
+            probabilities = await run_in_threadpool(explain_service.predict_full, payload.text, payload.taxonomy_id)
+        if explain_service.should_run_async(payload):
+            response.status_code = 202
+            return explain_service.submit(payload, probabilities=probabilities)
+        return await run_in_threadpool(explain_service.explain, payload, probabilities)
+    except UnknownTaxonomyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.exception("Explain failed")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/taxonomy", response_model=TaxonomyResponse)
-async def get_taxonomy() -> TaxonomyResponse:
+@router.get("/explain/jobs/{job_id}", response_model=ExplainJobResponse)
+async def explain_job(
+    job_id: str,
+    explain_service: ExplainService = Depends(get_explain_service),
+) -> ExplainJobResponse:
+    job = explain_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown explain job: {job_id}")
+    return job
+
+
+@router.get("/cache/stats")
+async def cache_stats(service: InferenceService = Depends(get_inference_service)) -> Dict[str, Any]:
+    return service.cache_stats()
+
+
+@router.delete("/cache")
+async def clear_cache(service: InferenceService = Depends(get_inference_service)) -> Dict[str, Any]:
+    service.clear_cache()
+    return service.cache_stats()
+
+
+@router.get("/rules/stats")
+async def rules_stats(service: InferenceService = Depends(get_inference_service)) -> Dict[str, Any]:
+    return service.rules_stats()
+
+
+@router.get("/cascade/stats")
+async def cascade_stats(service: InferenceService = Depends(get_inference_service)) -> Dict[str, Any]:
+    return service.cascade_stats()
+
+
+@router.get("/padding/stats")
+async def padding_stats(service: InferenceService = Depends(get_inference_service)) -> Dict[str, Any]:
+    return service.padding_stats()
+
+
+@router.get(
+    "/taxonomy",
+    response_model=TaxonomyResponse,
+    responses={304: {"description": "Taxonomy unchanged since the ETag in If-None-Match"}},
+)
+async def get_taxonomy(
+    request: Request,
+    taxonomy_id: Optional[str] = None,
+    service: InferenceService = Depends(get_inference_service),
+) -> Response:
     try:
-        loader = TaxonomyLoader(settings.TAXONOMY_PATH)
-        taxonomy = loader.load()
-        labels = loader.list_labels(taxonomy)
-        return TaxonomyResponse(labels=labels, taxonomy=taxonomy)
+        index = service.taxonomy(taxonomy_id)
+    except UnknownTaxonomyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.exception("Failed to load taxonomy")
         raise HTTPException(status_code=500, detail=str(e))
+    headers = {"ETag": index.etag, "X-Taxonomy-Version": str(index.version)}
+    if_none_match = request.headers.get("if-none-match", "")
+    if index.etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    return Response(content=index.body, media_type="application/json", headers=headers)
+
+
+@router.get("/taxonomies")
+async def list_taxonomies(service: InferenceService = Depends(get_inference_service)) -> Dict[str, Any]:
+    """Tenant taxonomy ids available in ``TAXONOMY_DIR`` and those currently compiled in memory."""
+    if service.catalog is None:
+        return {"enabled": False, "available": [], "loaded": []}
+    return {"enabled": True, "available": service.catalog.available(), "loaded": service.catalog.loaded()}
+
+
+@router.post("/taxonomy/reload")
+async def reload_taxonomy(
+    taxonomy_id: Optional[str] = None,
+    service: InferenceService = Depends(get_inference_service),
+) -> Dict[str, Any]:
+    """Re-read a taxonomy file now; in-flight requests finish on the index they started with."""
+    try:
+        previous = service.taxonomy(taxonomy_id)
+    except UnknownTaxonomyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    try:
+        index = await run_in_threadpool(service.reload_taxonomy, taxonomy_id)
+    except Exception as e:
+        logger.exception("Taxonomy reload failed")
+        detail = f"Taxonomy reload failed; still serving version {previous.version}: {e}"
+        raise HTTPException(status_code=400, detail=detail)
+    return {
+        "changed": index is not previous,
+        "version": index.version,
+        "content_hash": index.content_hash,
+        "num_labels": len(index.labels),
+    }
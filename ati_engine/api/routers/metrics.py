@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import time
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ati_engine.core.config import settings
+from ati_engine.core.metrics import HTTP_REQUESTS, HTTP_SECONDS, REGISTRY, format_metric
+from ati_engine.inference.service import InferenceService, get_inference_service
+from ati_engine.utils.memory import memory_report
+
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _route_template(scope: Scope) -> str:
+    """Route template (``/v1/explain/jobs/{job_id}``) of a handled request, or ``unmatched``."""
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    # Routes of an included router may carry only their own path; recover the mount prefix
+    path = scope.get("path", "")
+    for i, char in enumerate(path):
+        if char == "/" and route.path_regex.match(path[i:]):
+            return path[:i] + template
+    return template
+
+
+class MetricsMiddleware:
+    """Counts requests and latency per route template (not raw path, to bound label cardinality).
+
+    Plain ASGI rather than ``BaseHTTPMiddleware`` so streaming request bodies pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            path = _route_template(scope)
+            HTTP_REQUESTS.inc(path=path, status=str(status))
+            HTTP_SECONDS.observe(time.perf_counter() - start, path=path)
+
+
+def _memory_metrics() -> str:
+    report = memory_report()
+    samples = [
+        ({"kind": kind}, report[f"{kind}_mb"] * 1024 * 1024)
+        for kind in ("rss", "pss", "unique", "shared")
+        if report[f"{kind}_mb"] is not None
+    ]
+    return format_metric("ati_process_memory_bytes", "gauge", "Worker memory from /proc/self/smaps_rollup", samples)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, tags=["metrics"])
+def metrics(service: InferenceService = Depends(get_inference_service)) -> PlainTextResponse:
+    """Prometheus text exposition: stage timers, batch sizes, HTTP traffic, caches, queue depth, memory."""
+    body = REGISTRY.render() + service.render_metrics() + _memory_metrics()
+    return PlainTextResponse(body, media_type=CONTENT_TYPE)
@@ -1,18 +1,48 @@
 from __future__ import annotations
 
-from typing import List, Optional, Dict, Any
+from typing import List, Literal, Optional, Dict, Any
 from pydantic import BaseModel, Field
 
+# Mirrors ati_engine.taxonomy.registry.TAXONOMY_ID_PATTERN (ids map to file names)
+_TAXONOMY_ID = r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$"
+
 
 class HealthResponse(BaseModel):
     status: str = Field(..., description="Service status")
     version: str = Field(..., description="Application version")
 
 
+class ReadinessResponse(HealthResponse):
+    checks: Dict[str, Any] = Field(default_factory=dict, description="Readiness details")
+
+
+class MemoryResponse(BaseModel):
+    pid: int = Field(..., description="Worker process id")
+    model_sharing: str = Field(..., description="Configured MODEL_SHARING mode")
+    rss_mb: Optional[float] = Field(None, description="Resident set size")
+    pss_mb: Optional[float] = Field(None, description="Proportional set size (shared pages split across processes)")
+    unique_mb: Optional[float] = Field(None, description="Pages private to this worker")
+    shared_mb: Optional[float] = Field(None, description="Pages shared with other processes")
+    at_startup: Dict[str, Any] = Field(default_factory=dict, description="Report taken after warm-up")
+
+
 class InferenceRequest(BaseModel):
     text: str = Field(..., min_length=1, description="Transaction description or free text to classify")
     top_k: int = Field(5, ge=1, le=20, description="Number of top candidate labels to return")
     include_scores: bool = Field(True, description="Whether to return per-label scores")
+    taxonomy_id: Optional[str] = Field(
+        None, pattern=_TAXONOMY_ID, description="Tenant taxonomy in TAXONOMY_DIR (default: TAXONOMY_PATH)"
+    )
+
+
+class BatchInferenceRequest(BaseModel):
+    texts: List[str] = Field(..., min_length=1, description="Transaction descriptions to classify, in order")
+    top_k: int = Field(5, ge=1, le=20, description="Number of top candidate labels to return per text")
+    include_scores: bool = Field(True, description="Whether to return per-label scores")
+    batch_size: Optional[int] = Field(None, ge=1, le=1024, description="Premise/hypothesis pairs per forward pass")
+    taxonomy_id: Optional[str] = Field(
+        None, pattern=_TAXONOMY_ID, description="Tenant taxonomy in TAXONOMY_DIR (default: TAXONOMY_PATH)"
+    )
 
 
 class Prediction(BaseModel):
@@ -27,10 +57,32 @@ class InferenceResponse(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
+class BatchInferenceResponse(BaseModel):
+    results: List[InferenceResponse]
+
+
 class ExplainRequest(BaseModel):
     text: str = Field(..., min_length=1)
     target_label: Optional[str] = Field(None, description="Label to explain; defaults to the top predicted label")
     max_tokens: int = Field(50, ge=5, le=256, description="Maximum number of tokens to attribute")
+    method: Literal["shap", "gradient_x_input", "integrated_gradients", "occlusion"] = Field(
+        "shap", description="Attribution method, trading fidelity for latency"
+    )
+    mode: Literal["sync", "async", "auto"] = Field(
+        "sync", description="'async' always returns a job id; 'auto' does so when the estimate exceeds the threshold"
+    )
+    max_evals: Optional[int] = Field(
+        None,
+        ge=2,
+        le=5000,
+        description=(
+            "SHAP/occlusion evaluation budget (SHAP defaults to SHAP_MAX_SAMPLES) "
+            "or integrated-gradients steps (default IG_STEPS)"
+        ),
+    )
+    taxonomy_id: Optional[str] = Field(
+        None, pattern=_TAXONOMY_ID, description="Tenant taxonomy used to pick the predicted label"
+    )
 
 
 class TokenAttribution(BaseModel):
@@ -45,6 +97,13 @@ class ExplainResponse(BaseModel):
     summary: Dict[str, Any] = Field(default_factory=dict)
 
 
+class ExplainJobResponse(BaseModel):
+    job_id: str
+    status: Literal["pending", "running", "done", "failed"]
+    result: Optional[ExplainResponse] = None
+    error: Optional[str] = None
+
+
 class TaxonomyResponse(BaseModel):
     labels: List[str]
     taxonomy: Dict[str, Any]
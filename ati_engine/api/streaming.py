@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from starlette.requests import ClientDisconnect
+from starlette.types import Receive, Scope, Send
+
+from ati_engine.api.schemas import InferenceRequest
+from ati_engine.core.config import settings
+from ati_engine.core.metrics import ACTIVE_STREAMS, observe_batch
+from ati_engine.taxonomy.registry import UnknownTaxonomyError
+
+logger = logging.getLogger(__name__)
+
+# A parsed line: the request, or an error message for a line that could not be parsed
+_Item = Union[InferenceRequest, str]
+
+
+class _Batch:
+    def __init__(self) -> None:
+        self.lines: List[int] = []
+        self.items: List[_Item] = []
+        self.started = time.monotonic()
+
+    def add(self, line: int, item: _Item) -> None:
+        if not self.items:
+            self.started = time.monotonic()
+        self.lines.append(line)
+        self.items.append(item)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """Streaming response for handlers that keep reading the request body while responding.
+
+    On servers older than ASGI 2.4 the stock response watches for disconnects by calling
+    ``receive()`` concurrently, which would steal body chunks from ``request.stream()``. Here
+    a disconnect surfaces through the body reader (or a failing ``send``) instead.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
+
+
+def _parse(raw: bytes) -> _Item:
+    try:
+        return InferenceRequest.model_validate_json(raw)
+    except ValidationError as e:
+        return "; ".join(f"{'.'.join(map(str, err['loc'])) or 'line'}: {err['msg']}" for err in e.errors())
+
+
+async def _read_batches(
+    body: AsyncIterator[bytes], queue: "asyncio.Queue[Optional[Union[_Batch, Exception]]]"
+) -> None:
+    """Split the request body into lines and enqueue batches of parsed requests.
+
+    A batch is handed over when it holds ``STREAM_BATCH_SIZE`` lines, or once its first line has
+    waited ``STREAM_MAX_WAIT_MS`` even if the client sends nothing more: the next body chunk is
+    awaited with a deadline, and the read stays pending (it is not cancelled) across the flush.
+    ``queue`` is bounded, so while the classifier is behind, this coroutine stops reading and the
+    client is throttled by TCP flow control instead of the server buffering the upload.
+    """
+    buffer = b""
+    batch = _Batch()
+    line_no = 0
+    max_wait_s = settings.STREAM_MAX_WAIT_MS / 1000.0
+    chunks = body.__aiter__()
+    pending: "Optional[asyncio.Future[bytes]]" = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(chunks.__anext__())
+            timeout = max(batch.started + max_wait_s - time.monotonic(), 0.0) if len(batch) else None
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:
+                await queue.put(batch)
+                batch = _Batch()
+                continue
+            try:
+                chunk = pending.result()
+            except StopAsyncIteration:
+                break
+            finally:
+                pending = None
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for raw in lines:
+                if len(raw) > settings.STREAM_MAX_LINE_BYTES:
+                    # A chunk can carry whole oversized lines; answer the lines before it first
+                    if len(batch):
+                        await queue.put(batch)
+                    raise ValueError(f"Line {line_no} exceeds {settings.STREAM_MAX_LINE_BYTES} bytes")
+                if raw.strip():
+                    batch.add(line_no, _parse(raw))
+                line_no += 1
+                if len(batch) >= settings.STREAM_BATCH_SIZE:
+                    await queue.put(batch)
+                    batch = _Batch()
+            if len(buffer) > settings.STREAM_MAX_LINE_BYTES:
+                if len(batch):
+                    await queue.put(batch)
+                raise ValueError(f"Line {line_no} exceeds {settings.STREAM_MAX_LINE_BYTES} bytes")
+        if buffer.strip():
+            batch.add(line_no, _parse(buffer))
+        if len(batch):
+            await queue.put(batch)
+        await queue.put(None)
+    except Exception as e:
+        await queue.put(e)
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+def _classify(service: Any, batch: _Batch) -> List[Dict[str, Any]]:
+    groups: Dict[Optional[str], List[InferenceRequest]] = {}
+    for item in batch.items:
+        if isinstance(item, InferenceRequest):
+            groups.setdefault(item.taxonomy_id, []).append(item)
+    # One predict_batch per taxonomy; responses are consumed back in line order
+    responses: Dict[Optional[str], Any] = {}
+    for taxonomy_id, requests in groups.items():
+        top_k = max(r.top_k for r in requests)
+        try:
+            texts = [r.text for r in requests]
+            responses[taxonomy_id] = iter(service.predict_batch(texts, top_k=top_k, taxonomy_id=taxonomy_id))
+        except UnknownTaxonomyError as e:
+            responses[taxonomy_id] = e
+        except Exception as e:
+            # A failing tenant only fails its own lines, not the other tenants' or the stream
+            logger.exception("Streaming inference failed for taxonomy_id=%s", taxonomy_id)
+            responses[taxonomy_id] = e
+    size = sum(len(requests) for requests in groups.values())
+    out: List[Dict[str, Any]] = []
+    for line, item in zip(batch.lines, batch.items):
+        if isinstance(item, str):
+            out.append({"line": line, "error": item})
+            continue
+        source = responses[item.taxonomy_id]
+        if isinstance(source, Exception):
+            out.append({"line": line, "error": str(source)})
+            continue
+        response = next(source)
+        metadata = dict(response.metadata, line=line, batch_size=size)
+        out.append(
+            response.model_copy(
+                update={"top_predictions": response.top_predictions[: item.top_k], "metadata": metadata}
+            ).model_dump()
+        )
+    return out
+
+
+async def classify_ndjson(body: AsyncIterator[bytes], service: Any) -> AsyncIterator[bytes]:
+    """Classify an NDJSON stream of ``InferenceRequest`` lines, yielding NDJSON responses in input order.
+
+    Reading/parsing and classification overlap: while one batch runs on a worker thread, the
+    next is assembled, with at most ``STREAM_MAX_INFLIGHT_BATCHES`` parsed batches waiting.
+    Lines that fail validation, and the lines of a taxonomy whose classification failed, produce
+    ``{"line": n, "error": ...}`` in their place; a fatal error (unreadable body, oversized line)
+    ends the stream with an error line.
+    """
+    queue: "asyncio.Queue[Optional[Union[_Batch, Exception]]]" = asyncio.Queue(
+        maxsize=settings.STREAM_MAX_INFLIGHT_BATCHES
+    )
+    reader = asyncio.create_task(_read_batches(body, queue))
+    ACTIVE_STREAMS.inc()
+    try:
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                break
+            if isinstance(batch, Exception):
+                yield (json.dumps({"error": str(batch)}) + "\n").encode("utf-8")
+                break
+            observe_batch("stream", len(batch))
+            try:
+                results = await run_in_threadpool(_classify, service, batch)
+            except Exception as e:
+                logger.exception("Streaming inference failed")
+                yield (json.dumps({"error": str(e)}) + "\n").encode("utf-8")
+                break
+            yield "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in results).encode("utf-8")
+    finally:
+        ACTIVE_STREAMS.dec()
+        reader.cancel()
@@ -0,0 +1,236 @@
+"""Classify a large JSONL or CSV file offline, streaming it through a pool of worker processes.
+
+Usage:
+    python -m ati_engine.batch INPUT OUTPUT [--text-field text] [--id-field id] [--workers 4] [--resume]
+
+Each output line is the ``InferenceResponse`` the API would return for that record, plus its
+input ``row`` and optional ``id``. Output is written in input order, one chunk at a time, and a
+checkpoint (``OUTPUT.ckpt``) records how many input rows are safely on disk so an interrupted
+run continues where it stopped with ``--resume``.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from ati_engine.core.config import settings
+from ati_engine.core.logging import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# (row index, record id, text)
+Record = Tuple[int, Optional[str], Optional[str]]
+
+_worker_service: Any = None
+
+
+def _jsonl_rows(f: Any, path: str) -> Iterator[Any]:
+    # A malformed line becomes an empty row (reported as missing text) instead of failing the
+    # job, which would otherwise crash again at the same line on every resume
+    for lineno, line in enumerate(f, start=1):
+        if not line.strip():
+            yield {}
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            logger.warning("Malformed JSON at %s:%d: %s", path, lineno, e)
+            yield None
+
+
+def iter_records(
+    path: str, fmt: Optional[str] = None, text_field: str = "text", id_field: Optional[str] = None
+) -> Iterator[Record]:
+    """Yield records one at a time from a JSONL or CSV file (format inferred from the extension).
+
+    JSONL lines that are not valid JSON yield a record with no text, so they are reported per row.
+    """
+    fmt = (fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")).lower()
+    with open(path, encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            rows: Iterator[Any] = csv.DictReader(f)
+        elif fmt == "jsonl":
+            rows = _jsonl_rows(f, path)
+        else:
+            raise ValueError(f"Unknown input format: {fmt!r} (expected 'jsonl' or 'csv')")
+        for i, row in enumerate(rows):
+            text = row.get(text_field) if isinstance(row, dict) else None
+            rid = row.get(id_field) if id_field and isinstance(row, dict) else None
+            yield i, None if rid is None else str(rid), text if isinstance(text, str) else None
+
+
+def _init_worker(intra_op_threads: int) -> None:
+    global _worker_service
+    from ati_engine.inference.service import InferenceService
+
+    if intra_op_threads > 0:
+        settings.INTRA_OP_THREADS = intra_op_threads
+    _worker_service = InferenceService()
+
+
+def classify_chunk(chunk: List[Record], top_k: int, service: Any = None) -> List[Dict[str, Any]]:
+    """Classify one chunk with the process-local ``InferenceService``; results follow chunk order."""
+    service = service or _worker_service
+    valid = [r for r in chunk if r[2] and r[2].strip()]
+    responses = iter(service.predict_batch([r[2] for r in valid], top_k=top_k) if valid else [])
+    out: List[Dict[str, Any]] = []
+    for row, rid, text in chunk:
+        if text and text.strip():
+            out.append({"row": row, "id": rid, **next(responses).model_dump()})
+        else:
+            out.append({"row": row, "id": rid, "error": "missing or empty text"})
+    return out
+
+
+def _chunks(records: Iterator[Record], size: int) -> Iterator[List[Record]]:
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _checkpoint_path(output_path: str) -> str:
+    return output_path + ".ckpt"
+
+
+def _write_checkpoint(output_path: str, state: Dict[str, Any]) -> None:
+    path = _checkpoint_path(output_path)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def run(
+    input_path: str,
+    output_path: str,
+    fmt: Optional[str] = None,
+    text_field: str = "text",
+    id_field: Optional[str] = None,
+    top_k: int = 5,
+    chunk_size: int = 256,
+    workers: int = 1,
+    threads_per_worker: int = 0,
+    resume: bool = False,
+    limit: Optional[int] = None,
+    service: Any = None,
+) -> Dict[str, Any]:
+    """Classify ``input_path`` into ``output_path`` and return run statistics.
+
+    Memory stays constant: at most ``2 * workers`` chunks are in flight. With ``workers=1`` the
+    chunks are classified in this process (by ``service`` when given). ``limit`` stops after that
+    many input rows in total, counting rows completed by earlier runs.
+    """
+    start = time.perf_counter()
+    rows_done = 0
+    ckpt = _checkpoint_path(output_path)
+    if resume and os.path.exists(ckpt) and os.path.exists(output_path):
+        with open(ckpt, encoding="utf-8") as f:
+            state = json.load(f)
+        rows_done = int(state["rows_done"])
+        out = open(output_path, "r+b")
+        # Drop any partially written chunk past the last checkpoint
+        out.truncate(int(state["output_bytes"]))
+        out.seek(0, os.SEEK_END)
+        logger.info("Resuming %s after %d rows", input_path, rows_done)
+    else:
+        out = open(output_path, "wb")
+        if os.path.exists(ckpt):
+            os.remove(ckpt)
+
+    records: Iterator[Record] = islice(iter_records(input_path, fmt, text_field, id_field), rows_done, limit)
+    processed = 0
+
+    def write(results: List[Dict[str, Any]]) -> None:
+        nonlocal rows_done, processed
+        out.write(b"".join((json.dumps(r, ensure_ascii=False) + "\n").encode("utf-8") for r in results))
+        out.flush()
+        os.fsync(out.fileno())
+        rows_done += len(results)
+        processed += len(results)
+        _write_checkpoint(output_path, {"rows_done": rows_done, "output_bytes": out.tell(), "complete": False})
+        logger.info("%d rows written (%.0f rows/s)", rows_done, processed / (time.perf_counter() - start))
+
+    try:
+        if workers <= 1:
+            if service is None:
+                _init_worker(threads_per_worker)
+            for chunk in _chunks(records, chunk_size):
+                write(classify_chunk(chunk, top_k, service=service))
+        else:
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(threads_per_worker,)
+            ) as pool:
+                pending: Deque[Future] = deque()
+                for chunk in _chunks(records, chunk_size):
+                    pending.append(pool.submit(classify_chunk, chunk, top_k))
+                    # Bounded in-flight work; results are written in submission (= input) order
+                    if len(pending) >= 2 * workers:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+        _write_checkpoint(output_path, {"rows_done": rows_done, "output_bytes": out.tell(), "complete": True})
+    finally:
+        out.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rows_done": rows_done,
+        "rows_processed": processed,
+        "elapsed_s": elapsed,
+        "rows_per_s": processed / elapsed if elapsed > 0 else None,
+    }
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="Input .jsonl or .csv file")
+    parser.add_argument("output", help="Output .jsonl file")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default=None, help="Input format (default: by extension)")
+    parser.add_argument("--text-field", default="text", help="Field/column holding the text (default: text)")
+    parser.add_argument("--id-field", default=None, help="Field/column copied to the output as 'id'")
+    parser.add_argument("--top-k", type=int, default=5, help="Labels returned per record (default: 5)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Records per worker task (default: 256)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes, each holding one model")
+    parser.add_argument(
+        "--threads-per-worker",
+        type=int,
+        default=None,
+        help="Intra-op threads per worker (default: CPU count / workers)",
+    )
+    parser.add_argument("--resume", action="store_true", help="Continue from OUTPUT.ckpt instead of starting over")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many input rows")
+    args = parser.parse_args(argv)
+    configure_logging()
+    threads = args.threads_per_worker
+    if threads is None:
+        threads = max(1, (os.cpu_count() or 1) // max(args.workers, 1)) if args.workers > 1 else 0
+    stats = run(
+        args.input,
+        args.output,
+        fmt=args.format,
+        text_field=args.text_field,
+        id_field=args.id_field,
+        top_k=args.top_k,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        threads_per_worker=threads,
+        resume=args.resume,
+        limit=args.limit,
+    )
+    logger.info("Done: %s", json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""HTTP load generator for ``POST /v1/infer`` with a fixed number of concurrent clients.
+
+Targets a running server (``--url``), or with ``--serve-tiny`` starts one in-process on a free
+port backed by the tiny offline stand-in model. Each client thread sends requests back to back
+(closed loop) until ``--requests`` have been sent or ``--duration`` seconds have passed.
+
+Usage:
+    python -m ati_engine.benchmarks.load --serve-tiny --concurrency 8 --requests 500
+    python -m ati_engine.benchmarks.load --url http://localhost:8000 --concurrency 32 --duration 60
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import http.client
+import itertools
+import json
+import logging
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+from ati_engine.benchmarks import report
+from ati_engine.preprocessing.benchmark import synthetic_texts
+
+
+def run_load(
+    url: str,
+    texts: Sequence[str],
+    concurrency: int = 8,
+    total_requests: Optional[int] = 500,
+    duration_s: Optional[float] = None,
+    top_k: int = 3,
+    timeout_s: float = 30.0,
+) -> Dict[str, Any]:
+    """Drive ``{url}/v1/infer`` from ``concurrency`` threads and summarize latency and throughput.
+
+    Each thread keeps one persistent connection (stdlib ``http.client``), reconnecting after errors.
+    """
+    parts = urlsplit(url)
+    conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    endpoint = parts.path.rstrip("/") + "/v1/infer"
+    headers = {"Content-Type": "application/json"}
+    counter = itertools.count()
+    lock = threading.Lock()
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    deadline = time.perf_counter() + duration_s if duration_s else None
+
+    def client() -> None:
+        conn = conn_cls(parts.netloc, timeout=timeout_s)
+        try:
+            while True:
+                i = next(counter)
+                if total_requests is not None and i >= total_requests:
+                    return
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return
+                body = json.dumps({"text": texts[i % len(texts)], "top_k": top_k})
+                start = time.perf_counter()
+                try:
+                    conn.request("POST", endpoint, body=body, headers=headers)
+                    response = conn.getresponse()
+                    response.read()
+                    error = None if response.status == 200 else f"HTTP {response.status}"
+                except (OSError, http.client.HTTPException) as e:
+                    error = type(e).__name__
+                    conn.close()
+                elapsed = time.perf_counter() - start
+                with lock:
+                    if error is None:
+                        latencies.append(elapsed)
+                    else:
+                        errors[error] = errors.get(error, 0) + 1
+        finally:
+            conn.close()
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+    summary = report.summarize(latencies, items=len(latencies), wall_s=wall, errors=sum(errors.values()))
+    summary["error_types"] = errors
+    return summary
+
+
+@contextlib.contextmanager
+def serve_tiny(host: str = "127.0.0.1") -> Iterator[str]:
+    """Run the API with the tiny stand-in model on a free port; yields its base URL."""
+    import uvicorn
+
+    from ati_engine.core.config import settings
+    from ati_engine.taxonomy.loader import TaxonomyLoader
+    from ati_engine.utils.testing import build_tiny_nli_model
+
+    with tempfile.TemporaryDirectory(prefix="ati-load-") as tmp:
+        settings.MODEL_NAME = build_tiny_nli_model(tmp, taxonomy=TaxonomyLoader(settings.TAXONOMY_PATH).load())
+        settings.INFERENCE_BACKEND = "torch"
+        from ati_engine.api.main import app
+
+        server = uvicorn.Server(uvicorn.Config(app, host=host, port=0, log_level="warning"))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            if not thread.is_alive():
+                raise RuntimeError("In-process server failed to start")
+            time.sleep(0.05)
+        port = server.servers[0].sockets[0].getsockname()[1]
+        url = f"http://{host}:{port}"
+        try:
+            # Wait for warm-up so the first requests do not measure model loading
+            while True:
+                conn = http.client.HTTPConnection(host, port, timeout=5)
+                conn.request("GET", "/health/ready")
+                status = conn.getresponse().status
+                conn.close()
+                if status == 200:
+                    break
+                time.sleep(0.1)
+            yield url
+        finally:
+            server.should_exit = True
+            thread.join(timeout=10)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Base URL of a running server, e.g. http://localhost:8000")
+    target.add_argument("--serve-tiny", action="store_true", help="Start an in-process server with the tiny model")
+    parser.add_argument(
+        "--concurrency", type=str, default="8", help="Concurrent clients; comma-separated for a sweep (e.g. 1,8,32)"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=None, help="Requests per concurrency level (default: 500 without --duration)"
+    )
+    parser.add_argument("--duration", type=float, default=None, help="Stop each level after this many seconds")
+    parser.add_argument("--n-texts", type=int, default=1000, help="Distinct synthetic descriptors to send")
+    parser.add_argument("--top-k", type=int, default=3)
+    report.add_report_args(parser)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    total = args.requests if args.requests is not None or args.duration else 500
+    texts = synthetic_texts(args.n_texts)
+    server = serve_tiny() if args.serve_tiny else contextlib.nullcontext(args.url)
+    with server as url:
+        benchmarks = {
+            f"http_infer_c{level}": run_load(
+                url, texts, concurrency=level, total_requests=total, duration_s=args.duration, top_k=args.top_k
+            )
+            for level in levels
+        }
+    result = {
+        "environment": report.environment(),
+        "config": {
+            "url": "tiny" if args.serve_tiny else args.url,
+            "requests": total,
+            "duration_s": args.duration,
+            "top_k": args.top_k,
+        },
+        "benchmarks": benchmarks,
+    }
+    return report.finish(result, args.output, args.baseline, args.save_baseline, args.tolerance)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""Latency summaries and baseline comparison shared by the benchmark suite and the load generator."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Summary fields compared against a baseline, and the direction that counts as a regression
+HIGHER_IS_BETTER = ("throughput_per_s",)
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def summarize(latencies_s: Sequence[float], items: int, wall_s: float, errors: int = 0) -> Dict[str, Any]:
+    """Throughput (items per wall-clock second) and latency percentiles of one benchmark."""
+    ms = np.asarray(latencies_s, dtype=np.float64) * 1000.0
+    summary: Dict[str, Any] = {
+        "samples": int(ms.size),
+        "items": items,
+        "errors": errors,
+        "wall_s": wall_s,
+        "throughput_per_s": items / wall_s if wall_s > 0 else None,
+    }
+    if ms.size:
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        summary.update(mean_ms=float(ms.mean()), p50_ms=float(p50), p95_ms=float(p95), p99_ms=float(p99))
+        summary["max_ms"] = float(ms.max())
+    return summary
+
+
+def measure(
+    fn: Callable[[], Any], items_per_call: int = 1, repeat: int = 20, warmup: int = 2, inner: int = 1
+) -> Dict[str, Any]:
+    """Run ``fn`` ``repeat`` times (after ``warmup`` untimed calls) and summarize.
+
+    For sub-millisecond functions set ``inner`` > 1: each sample then times ``inner`` calls and
+    reports their mean, so timer overhead does not dominate.
+    """
+    for _ in range(warmup):
+        fn()
+    latencies: List[float] = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(inner):
+            fn()
+        latencies.append((time.perf_counter() - t0) / inner)
+    wall = time.perf_counter() - start
+    return summarize(latencies, items=items_per_call * repeat * inner, wall_s=wall)
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.2) -> List[Dict[str, Any]]:
+    """Regressions of ``report`` against ``baseline`` beyond ``tolerance`` (0.2 = 20% worse).
+
+    Both are ``{"benchmarks": {name: summary}}``; benchmarks missing on either side are skipped.
+    """
+    regressions: List[Dict[str, Any]] = []
+    current = report.get("benchmarks", {})
+    for name, base in baseline.get("benchmarks", {}).items():
+        now = current.get(name)
+        if now is None:
+            continue
+        for field in HIGHER_IS_BETTER + LOWER_IS_BETTER:
+            old, new = base.get(field), now.get(field)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if field in HIGHER_IS_BETTER else change
+            if worse > tolerance:
+                regressions.append(
+                    {"benchmark": name, "metric": field, "baseline": old, "current": new, "change": change}
+                )
+    return regressions
+
+
+def load_json(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json(path: str, data: Dict[str, Any]) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def add_report_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--output", default=None, help="Also write the JSON report to this file")
+    parser.add_argument("--baseline", default=None, help="Compare with this baseline; exit 1 on regression")
+    parser.add_argument("--save-baseline", default=None, help="Write this run's results as a new baseline")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Allowed slowdown before failing (default: 0.2 = 20%%)"
+    )
+
+
+def finish(
+    report: Dict[str, Any],
+    output: Optional[str],
+    baseline: Optional[str],
+    save_baseline: Optional[str],
+    tolerance: float,
+) -> int:
+    """Print/write ``report``, compare it with ``baseline`` and return the process exit code."""
+    if baseline:
+        regressions = compare(report, load_json(baseline), tolerance)
+        report["baseline"] = {"path": baseline, "tolerance": tolerance, "regressions": regressions}
+    text = json.dumps(report, indent=2)
+    if output:
+        write_json(output, report)
+    print(text)
+    if save_baseline:
+        write_json(save_baseline, {"environment": report.get("environment"), "benchmarks": report["benchmarks"]})
+    if baseline and report["baseline"]["regressions"]:
+        for r in report["baseline"]["regressions"]:
+            print(
+                f"REGRESSION {r['benchmark']}.{r['metric']}: {r['baseline']:.3f} -> {r['current']:.3f} "
+                f"({r['change']:+.0%})",
+                file=sys.stderr,
+            )
+        return 1
+    return 0
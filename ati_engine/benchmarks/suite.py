@@ -0,0 +1,156 @@
+"""Offline micro-benchmarks for preprocessing, taxonomy parsing, inference and SHAP explanations.
+
+Runs against a tiny, randomly initialized stand-in model built locally (no downloads), so the
+numbers track the cost of this codebase's own paths, not of a particular checkpoint. Pass
+``--model`` to benchmark a real model instead.
+
+Usage:
+    python -m ati_engine.benchmarks.suite [--quick] [--baseline FILE] [--save-baseline FILE]
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import logging
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence
+
+from ati_engine.benchmarks import report
+from ati_engine.core.config import settings
+from ati_engine.preprocessing.benchmark import synthetic_texts
+from ati_engine.preprocessing.cleaner import normalize_text
+from ati_engine.taxonomy.loader import TaxonomyLoader
+
+BENCHMARKS = (
+    "normalize_text",
+    "taxonomy_load",
+    "predict_single",
+    "predict_batch",
+    "shap_explain",
+    "shap_fast_explain",
+)
+
+
+def _build_service(model_dir: str) -> Any:
+    from ati_engine.inference.model import DistilBertClassifier
+    from ati_engine.inference.service import InferenceService
+
+    service = InferenceService(model=DistilBertClassifier(model_name=model_dir, backend="torch"))
+    # No result cache: every call must reach the model
+    service.result_cache = None
+    return service
+
+
+def run(
+    model_dir: Optional[str] = None,
+    only: Sequence[str] = BENCHMARKS,
+    n_texts: int = 64,
+    batch_size: int = 32,
+    repeat: int = 20,
+    shap_repeat: int = 3,
+) -> Dict[str, Any]:
+    """Run the selected benchmarks and return ``{"environment", "config", "benchmarks"}``."""
+    texts = synthetic_texts(n_texts)
+    model_name = model_dir or "tiny"
+    results: Dict[str, Any] = {}
+
+    if "normalize_text" in only:
+        results["normalize_text"] = report.measure(
+            lambda: [normalize_text(t) for t in texts], items_per_call=len(texts), repeat=repeat, inner=10
+        )
+    if "taxonomy_load" in only:
+        loader = TaxonomyLoader(settings.TAXONOMY_PATH)
+        results["taxonomy_load"] = report.measure(lambda: loader.list_labels(loader.load()), repeat=repeat, inner=5)
+
+    needs_model = [b for b in only if b.startswith(("predict", "shap"))]
+    if needs_model:
+        with tempfile.TemporaryDirectory(prefix="ati-bench-") as tmp:
+            if model_dir is None:
+                from ati_engine.utils.testing import build_tiny_nli_model
+
+                model_dir = build_tiny_nli_model(tmp, taxonomy=TaxonomyLoader(settings.TAXONOMY_PATH).load())
+            results.update(_model_benchmarks(model_dir, needs_model, texts, batch_size, repeat, shap_repeat))
+
+    return {
+        "environment": report.environment(),
+        "config": {
+            "model": model_name,
+            "n_texts": n_texts,
+            "batch_size": batch_size,
+            "repeat": repeat,
+            "max_seq_length": settings.MAX_SEQ_LENGTH,
+            "rules_mode": settings.RULES_MODE,
+        },
+        "benchmarks": results,
+    }
+
+
+def _model_benchmarks(
+    model_dir: str, only: List[str], texts: List[str], batch_size: int, repeat: int, shap_repeat: int
+) -> Dict[str, Any]:
+    service = _build_service(model_dir)
+    service.warm_up()
+    results: Dict[str, Any] = {}
+    if "predict_single" in only:
+        cycle = itertools.cycle(texts)
+        results["predict_single"] = report.measure(lambda: service.predict(next(cycle), top_k=3), repeat=repeat * 5)
+    if "predict_batch" in only:
+        batch = texts[:batch_size]
+        results["predict_batch"] = report.measure(
+            lambda: service.predict_batch(batch, top_k=3), items_per_call=len(batch), repeat=repeat
+        )
+    shap_methods = [("shap_explain", "ShapExplainer"), ("shap_fast_explain", "FastShapExplainer")]
+    if any(name in only for name, _ in shap_methods):
+        from ati_engine.xai import explainer as xai
+
+        text = texts[0]
+        label = service.labels[0]
+        for name, cls_name in shap_methods:
+            if name not in only:
+                continue
+            explainer = getattr(xai, cls_name)(service)
+            results[name] = report.measure(
+                lambda: explainer.explain(text, target_label=label, max_evals=settings.SHAP_MAX_SAMPLES),
+                repeat=shap_repeat,
+                warmup=1,
+            )
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=None, help="Model directory or hub name (default: tiny stand-in)")
+    parser.add_argument("--only", default=",".join(BENCHMARKS), help="Comma-separated benchmarks to run")
+    parser.add_argument("--n-texts", type=int, default=64, help="Synthetic descriptors to cycle through")
+    parser.add_argument("--batch-size", type=int, default=32, help="Texts per predict_batch call")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed samples per benchmark")
+    parser.add_argument(
+        "--rules-mode", default="off", help="RULES_MODE during the run (default: off, so every text hits the model)"
+    )
+    parser.add_argument("--quick", action="store_true", help="Few samples; for smoke tests, not baselines")
+    report.add_report_args(parser)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    only = [b.strip() for b in args.only.split(",") if b.strip()]
+    unknown = sorted(set(only) - set(BENCHMARKS))
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)} (choose from {', '.join(BENCHMARKS)})")
+    rules_mode, settings.RULES_MODE = settings.RULES_MODE, args.rules_mode
+    try:
+        result = run(
+            model_dir=args.model,
+            only=only,
+            n_texts=args.n_texts,
+            batch_size=args.batch_size,
+            repeat=3 if args.quick else args.repeat,
+            shap_repeat=1 if args.quick else 3,
+        )
+    finally:
+        settings.RULES_MODE = rules_mode
+    return report.finish(result, args.output, args.baseline, args.save_baseline, args.tolerance)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import os
 from functools import lru_cache
-from pydantic import Field
+from typing import Literal, Optional
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -14,13 +15,109 @@ class Settings(BaseSettings):
         description="Hugging Face model to use for zero-shot classification (DistilBERT MNLI).",
     )
     DEVICE: int = Field(-1, description="Inference device id (-1 for CPU)")
+    INFERENCE_BACKEND: Literal["torch", "onnx", "onnx-int8"] = Field(
+        "torch", description="NLI execution backend: 'torch', 'onnx' or 'onnx-int8'"
+    )
+    ONNX_MODEL_DIR: str = Field("models/onnx", description="Directory written by ati_engine.inference.export")
+    INTRA_OP_THREADS: int = Field(0, description="Intra-op threads for torch/ONNX Runtime (0 = library default)")
+    MODEL_SHARING: Literal["off", "mmap"] = Field(
+        "off", description="Torch weight loading: 'off' (private copy per worker) or 'mmap' (shared across workers)"
+    )
+    SHARED_WEIGHTS_DIR: str = Field("models/shared", description="Memory-mappable weight files for MODEL_SHARING=mmap")
+    TEXT_CLASSIFICATION_FALLBACK: bool = Field(
+        True, description="Load the SST-2 text-classification model when zero-shot fails (disable to save memory)"
+    )
     TAXONOMY_PATH: str = Field(
         default=os.getenv("TAXONOMY_PATH", "ati_engine/taxonomy/sample_taxonomy.yaml"),
         description="Path to YAML taxonomy file.",
     )
+    TAXONOMY_WATCH_INTERVAL_S: float = Field(
+        2.0, description="Seconds between checks of TAXONOMY_PATH for changes (0 disables hot reload)"
+    )
+    TAXONOMY_DIR: str = Field("", description="Directory of per-tenant <taxonomy_id>.yaml files (empty disables)")
+    MAX_LOADED_TAXONOMIES: int = Field(32, description="Tenant taxonomies kept compiled in memory (LRU)")
+    CANONICALIZE_DESCRIPTORS: bool = Field(
+        False, description="Strip card suffixes, store numbers, dates and reference ids before tokenization"
+    )
+    PREPROCESS_WORKERS: int = Field(0, description="Processes used to normalize very large batches (0 = in-process)")
+    PREPROCESS_POOL_MIN_BATCH: int = Field(50000, description="Smallest batch normalized in the process pool")
+    CLASSIFIER_MODE: Literal["nli", "embedding"] = Field(
+        "nli", description="Classifier engine: 'nli' (zero-shot) or 'embedding' (similarity)"
+    )
+    EMBEDDING_MODEL_NAME: str = Field(
+        "sentence-transformers/all-MiniLM-L6-v2", description="Encoder used by the embedding classifier"
+    )
+    EMBEDDING_TEMPERATURE: float = Field(0.05, description="Softmax temperature over label cosine similarities")
+    RULES_MODE: Literal["off", "shortcircuit", "shadow"] = Field(
+        "off",
+        description="Keyword rules: 'off', 'shortcircuit' (confident hits skip the model) or 'shadow' (run both)",
+    )
+    RULES_CONFIDENCE: float = Field(0.95, description="Score reported for a confident keyword rule hit")
+    CASCADE_MODEL_PATH: str = Field(
+        "", description="First-stage n-gram model written by ati_engine.inference.train_cascade (empty disables)"
+    )
+    CASCADE_THRESHOLD: Optional[float] = Field(
+        None, description="Calibrated confidence at which the first stage answers (default: the tuned value)"
+    )
     MAX_CANDIDATES: int = Field(20, description="Maximum number of taxonomy labels to consider")
-    SHAP_MAX_SAMPLES: int = Field(50, description="Maximum number of samples for SHAP background")
+    PREFILTER_TOP_N: int = Field(
+        0, description="Labels per text sent to NLI after a cheap lexical ranking of all labels (0 = score all)"
+    )
+    HIERARCHICAL_MODE: bool = Field(
+        False, description="Classify top-level categories first, then only subcategories of the winners"
+    )
+    HIERARCHY_TOP_K: int = Field(2, description="Number of winning categories whose subcategories are scored")
+    HYPOTHESIS_TEMPLATE: str = Field("This example is {}.", description="NLI hypothesis template for zero-shot labels")
+    LABEL_CACHE_SIZE: int = Field(
+        0,
+        description=(
+            "Taxonomies whose label encodings are cached; at least MAX_LOADED_TAXONOMIES + 1 "
+            "(0 = exactly that, the default taxonomy plus every loaded tenant)"
+        ),
+    )
+    BATCH_SIZE: int = Field(32, description="Premise/hypothesis pairs per NLI forward pass")
+    MAX_SEQ_LENGTH: int = Field(128, description="Tokens per model input; longer premises are truncated")
+    BATCH_MAX_TOKENS: int = Field(
+        0, description="Padded-token budget per forward pass, letting short inputs batch wider (0 = off)"
+    )
+    MAX_BATCH_TEXTS: int = Field(512, description="Maximum number of texts accepted by the batch endpoint")
+    STREAM_BATCH_SIZE: int = Field(64, description="Lines classified together by /v1/infer/stream")
+    STREAM_MAX_WAIT_MS: float = Field(50.0, description="Flush a partial stream batch after this wait")
+    STREAM_MAX_INFLIGHT_BATCHES: int = Field(2, description="Parsed stream batches buffered ahead of the model")
+    STREAM_MAX_LINE_BYTES: int = Field(65536, description="Maximum length of one NDJSON line")
+    MICRO_BATCH_ENABLED: bool = Field(True, description="Coalesce concurrent /v1/infer requests into batched passes")
+    MICRO_BATCH_MAX_SIZE: int = Field(16, description="Maximum number of requests per micro-batch")
+    MICRO_BATCH_MAX_WAIT_MS: float = Field(5.0, description="Maximum time to wait for a micro-batch to fill")
+    RESULT_CACHE_SIZE: int = Field(10000, description="Maximum cached inference results (0 disables the cache)")
+    RESULT_CACHE_TTL_S: float = Field(3600.0, description="Time-to-live of cached inference results in seconds")
+    RESULT_CACHE_BACKEND: Literal["memory", "sqlite"] = Field(
+        "memory", description="Result cache backend: 'memory' or 'sqlite'"
+    )
+    RESULT_CACHE_PATH: str = Field(".ati_cache.sqlite3", description="SQLite file shared by workers (sqlite backend)")
+    SHAP_MAX_SAMPLES: int = Field(50, description="Default SHAP evaluation budget (masked variants per explanation)")
+    EXPLAIN_CACHE_SIZE: int = Field(64, description="SHAP explainers kept per taxonomy (one per target label)")
+    EXPLAIN_ASYNC_THRESHOLD_MS: float = Field(
+        2000.0, description="In 'auto' mode, explanations estimated above this latency run as background jobs"
+    )
+    EXPLAIN_JOB_WORKERS: int = Field(1, description="Worker threads for background explain jobs")
+    EXPLAIN_JOB_RETENTION: int = Field(1000, description="Number of finished explain jobs kept for polling")
+    IG_STEPS: int = Field(16, description="Interpolation steps for integrated-gradients attribution")
+    WARMUP_ON_STARTUP: bool = Field(True, description="Load the model and run a warm-up batch at startup")
     LOG_LEVEL: str = Field("INFO", description="Logging level")
+    METRICS_ENABLED: bool = Field(True, description="Record stage timers and batch-size histograms for /metrics")
+    RESPONSE_TIMINGS: bool = Field(False, description="Add a per-stage timing breakdown to response metadata")
+
+    @model_validator(mode="after")
+    def _size_label_cache(self) -> "Settings":
+        # Tenants share one label cache; a smaller one re-tokenizes a taxonomy on every tenant switch
+        minimum = self.MAX_LOADED_TAXONOMIES + 1
+        if self.LABEL_CACHE_SIZE == 0:
+            self.LABEL_CACHE_SIZE = minimum
+        elif self.LABEL_CACHE_SIZE < minimum:
+            raise ValueError(
+                f"LABEL_CACHE_SIZE={self.LABEL_CACHE_SIZE} is below MAX_LOADED_TAXONOMIES + 1 = {minimum}"
+            )
+        return self
 
 
 @lru_cache()
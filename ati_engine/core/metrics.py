@@ -0,0 +1,256 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Kept dependency-free: a registry of counters and histograms, a ``timed`` stage timer that also
+feeds an optional per-request breakdown, and helpers to format gauges computed at scrape time.
+"""
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from ati_engine.core.config import settings
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+
+Labels = Tuple[str, ...]
+Sample = Tuple[Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def format_metric(name: str, kind: str, help_text: str, samples: Iterable[Sample]) -> str:
+    """Render one metric family; ``samples`` are ``(labels, value)`` pairs."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples)
+    return "\n".join(lines) + "\n"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Labels:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def render(self) -> str:
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> str:
+        with self._lock:
+            items = sorted(self._values.items())
+        return format_metric(
+            self.name, self.kind, self.help_text, ((dict(zip(self.labelnames, k)), v) for k, v in items)
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: per-bucket (non-cumulative) counts + overflow, sum
+        self._counts: Dict[Labels, List[int]] = {}
+        self._sums: Dict[Labels, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[slot] += 1
+            self._sums[key] += value
+
+    def snapshot(self, **labels: str) -> Tuple[int, float]:
+        """``(count, sum)`` for one label set."""
+        key = self._key(labels)
+        with self._lock:
+            return sum(self._counts.get(key, ())), self._sums.get(key, 0.0)
+
+    def render(self) -> str:
+        with self._lock:
+            items = sorted((k, list(c), self._sums[k]) for k, c in self._counts.items())
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for key, counts, total in items:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = _format_labels({**labels, "le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "".join(m.render() for m in metrics)
+
+    def reset(self) -> None:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for m in metrics:
+            m.reset()
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "ati_stage_seconds",
+    "Time spent per pipeline stage (normalize, label_fetch, tokenize, forward, postprocess, shap, ...)",
+    ("stage",),
+)
+BATCH_SIZE = REGISTRY.histogram(
+    "ati_batch_size",
+    "Items per batch: texts per predict_batch call, requests per micro-batch, rows per forward pass",
+    ("kind",),
+    buckets=SIZE_BUCKETS,
+)
+HTTP_REQUESTS = REGISTRY.counter("ati_http_requests_total", "HTTP requests by route and status", ("path", "status"))
+HTTP_SECONDS = REGISTRY.histogram("ati_http_request_seconds", "HTTP request latency by route", ("path",))
+ACTIVE_STREAMS = REGISTRY.gauge("ati_active_streams", "Open /v1/infer/stream requests")
+
+# Per-request stage breakdown in milliseconds, collected only inside ``collect_timings``
+_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("ati_timings", default=None)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Time a pipeline stage into ``ati_stage_seconds`` and the active per-request breakdown."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if settings.METRICS_ENABLED:
+            STAGE_SECONDS.observe(elapsed, stage=stage)
+        timings = _timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + elapsed * 1000.0
+
+
+@contextmanager
+def collect_timings() -> Iterator[Dict[str, float]]:
+    """Gather ``timed`` stages run in this context (including worker threads it is copied to).
+
+    Nested uses share the outermost breakdown.
+    """
+    current = _timings.get()
+    if current is not None:
+        yield current
+        return
+    timings: Dict[str, float] = {}
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+def observe_batch(kind: str, size: Union[int, float]) -> None:
+    if settings.METRICS_ENABLED:
+        BATCH_SIZE.observe(size, kind=kind)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import logging
+import os
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from ati_engine.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ONNX_FILENAMES = {"onnx": "model.onnx", "onnx-int8": "model.int8.onnx"}
+
+
+class TorchBackend:
+    """PyTorch execution through the Hugging Face zero-shot pipeline's model."""
+
+    name = "torch"
+
+    def __init__(self, pipe: Any, intra_op_threads: Optional[int] = None) -> None:
+        import torch
+
+        threads = intra_op_threads if intra_op_threads is not None else settings.INTRA_OP_THREADS
+        if threads and threads > 0:
+            torch.set_num_threads(threads)
+        self._torch = torch
+        self.pipe = pipe
+        self.tokenizer = pipe.tokenizer
+        self.config = pipe.model.config
+
+    def logits(self, batch: Dict[str, np.ndarray]) -> np.ndarray:
+        torch = self._torch
+        model = self.pipe.model
+        with torch.inference_mode():
+            inputs = {k: torch.from_numpy(v).to(model.device) for k, v in batch.items()}
+            return model(**inputs).logits.float().cpu().numpy()
+
+
+class OnnxBackend:
+    """ONNX Runtime execution of an exported (optionally INT8-quantized) model.
+
+    ``model_dir`` must contain the files written by ``python -m ati_engine.inference.export``:
+    ``model.onnx`` and/or ``model.int8.onnx`` plus the tokenizer and config.
+    """
+
+    def __init__(self, model_dir: str, variant: str = "onnx", intra_op_threads: Optional[int] = None) -> None:
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+
+        if variant not in ONNX_FILENAMES:
+            raise ValueError(f"Unknown ONNX variant: {variant!r}")
+        path = os.path.join(model_dir, ONNX_FILENAMES[variant])
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"{path} not found; export it with `python -m ati_engine.inference.export --out {model_dir}`"
+            )
+        options = ort.SessionOptions()
+        threads = intra_op_threads if intra_op_threads is not None else settings.INTRA_OP_THREADS
+        if threads and threads > 0:
+            options.intra_op_num_threads = threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        logger.info("Loading ONNX Runtime session from %s (threads=%s)", path, threads or "default")
+        self.name = variant
+        self.session = ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.config = AutoConfig.from_pretrained(model_dir)
+
+    def logits(self, batch: Dict[str, np.ndarray]) -> np.ndarray:
+        feed = {k: v.astype(np.int64) for k, v in batch.items() if k in self._input_names}
+        return np.asarray(self.session.run(["logits"], feed)[0], dtype=np.float32)
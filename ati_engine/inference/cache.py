@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from ati_engine.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryCacheBackend:
+    """In-process LRU store with per-entry expiry."""
+
+    name = "memory"
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._data: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict[str, Any], ttl_s: float) -> None:
+        with self._lock:
+            self._data[key] = (time.time() + ttl_s, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCacheBackend:
+    """File-backed store shared by every worker process on the host.
+
+    Uses WAL journaling so readers do not block the writer. Expired rows are purged and the
+    table trimmed to ``max_size`` (least recently accessed first) every ``purge_every`` writes.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str, max_size: int, purge_every: int = 256) -> None:
+        self.path = path
+        self.max_size = max_size
+        self.purge_every = purge_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM results WHERE key = ? AND expires_at >= ?", (key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Dict[str, Any], ttl_s: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + ttl_s, now),
+            )
+            self._writes += 1
+            if self._writes % self.purge_every == 0:
+                self._purge(now)
+
+    def _purge(self, now: float) -> None:
+        self._conn.execute("DELETE FROM results WHERE expires_at < ?", (now,))
+        self._conn.execute(
+            "DELETE FROM results WHERE key IN ("
+            "SELECT key FROM results ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_size,),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0])
+
+
+class ResultCache:
+    """Exact-result cache for classified transactions.
+
+    Keys combine the normalized text, taxonomy hash, model identity and ``top_k``, so a
+    changed taxonomy or model never serves stale results; old entries age out via LRU/TTL.
+    """
+
+    def __init__(self, backend: Any, ttl_s: float) -> None:
+        self.backend = backend
+        self.ttl_s = ttl_s
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(clean_text: str, taxonomy_hash: Optional[str], model_id: str, top_k: int) -> str:
+        raw = "\x1f".join([clean_text, taxonomy_hash or "", model_id, str(top_k)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            value = self.backend.get(key)
+        except Exception:
+            logger.exception("Result cache lookup failed")
+            value = None
+        with self._lock:
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        try:
+            self.backend.set(key, value, self.ttl_s)
+        except Exception:
+            logger.exception("Result cache store failed")
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits, misses = self._hits, self._misses
+        total = hits + misses
+        return {
+            "backend": self.backend.name,
+            "size": len(self.backend),
+            "max_size": self.backend.max_size,
+            "ttl_s": self.ttl_s,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else None,
+        }
+
+
+def build_result_cache() -> Optional[ResultCache]:
+    """Create the configured result cache, or None when ``RESULT_CACHE_SIZE`` is 0."""
+    if settings.RESULT_CACHE_SIZE <= 0:
+        return None
+    backend_name = settings.RESULT_CACHE_BACKEND.lower()
+    if backend_name == "memory":
+        backend: Any = MemoryCacheBackend(settings.RESULT_CACHE_SIZE)
+    elif backend_name == "sqlite":
+        backend = SQLiteCacheBackend(settings.RESULT_CACHE_PATH, settings.RESULT_CACHE_SIZE)
+    else:
+        raise ValueError(f"Unknown RESULT_CACHE_BACKEND: {backend_name!r} (expected 'memory' or 'sqlite')")
+    return ResultCache(backend, ttl_s=settings.RESULT_CACHE_TTL_S)
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ati_engine.core.config import settings
+from ati_engine.core.metrics import observe_batch, timed
+from ati_engine.inference.padding import PaddingStats, length_buckets
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingClassifier:
+    """Embedding-similarity classifier, an alternative to per-label NLI.
+
+    Each text is embedded once (mean-pooled encoder states) and scored against a precomputed,
+    L2-normalized label embedding matrix with a single matmul, so cost no longer grows with
+    the number of taxonomy labels. Label embeddings are built from label names plus taxonomy
+    keywords and cached per taxonomy hash.
+    """
+
+    engine = "embedding"
+    backend_name = "torch"
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        device: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> None:
+        self.model_name = model_name or settings.EMBEDDING_MODEL_NAME
+        self.device = device if device is not None else settings.DEVICE
+        self.batch_size = batch_size or settings.BATCH_SIZE
+        self.temperature = temperature or settings.EMBEDDING_TEMPERATURE
+        self._tokenizer: Any = None
+        self._model: Any = None
+        self._label_matrices: "OrderedDict[str, Tuple[List[str], np.ndarray]]" = OrderedDict()
+        self.padding = PaddingStats()
+        self._load_lock = threading.Lock()
+        self._matrix_lock = threading.Lock()
+
+    def _load(self) -> Tuple[Any, Any]:
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    from transformers import AutoModel, AutoTokenizer
+
+                    logger.info("Loading embedding model=%s device=%s", self.model_name, self.device)
+                    tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                    model = AutoModel.from_pretrained(self.model_name)
+                    model.eval()
+                    if self.device is not None and self.device >= 0:
+                        model.to(f"cuda:{self.device}")
+                    self._tokenizer = tokenizer
+                    self._model = model
+        return self._tokenizer, self._model
+
+    def embed(self, texts: Sequence[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """Return L2-normalized embeddings, one row per text, in input order."""
+        import torch
+
+        tokenizer, model = self._load()
+        batch_size = batch_size or self.batch_size
+        max_length = min(int(getattr(tokenizer, "model_max_length", 512) or 512), settings.MAX_SEQ_LENGTH)
+        # Tokenize once, then bucket by token length so each padded batch wastes as little as possible
+        with timed("tokenize"):
+            encoded = tokenizer(list(texts), truncation=True, max_length=max_length)
+        lengths = [len(ids) for ids in encoded["input_ids"]]
+        self.padding.record_truncated(sum(n >= max_length for n in lengths))
+        out = np.zeros((len(texts), model.config.hidden_size), dtype=np.float32)
+        with torch.inference_mode():
+            for idx in length_buckets(lengths, batch_size, settings.BATCH_MAX_TOKENS):
+                with timed("tokenize"):
+                    features = [{k: encoded[k][i] for k in encoded.keys()} for i in idx]
+                    enc = tokenizer.pad(features, return_tensors="pt")
+                self.padding.record([lengths[i] for i in idx], max(lengths[i] for i in idx))
+                observe_batch("forward", len(idx))
+                with timed("forward"):
+                    enc = {k: v.to(model.device) for k, v in enc.items()}
+                    hidden = model(**enc).last_hidden_state
+                    mask = enc["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+                    pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+                    out[idx] = pooled.float().cpu().numpy()
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.clip(norms, 1e-12, None)
+
+    def _label_matrix(
+        self,
+        labels: Sequence[str],
+        label_descriptions: Optional[Dict[str, str]],
+        taxonomy_hash: Optional[str],
+    ) -> np.ndarray:
+        key = taxonomy_hash or "labels:" + hashlib.sha256("\x1f".join(labels).encode("utf-8")).hexdigest()
+        with self._matrix_lock:
+            cached = self._label_matrices.get(key)
+            if cached is not None:
+                self._label_matrices.move_to_end(key)
+        known = set(cached[0]) if cached is not None else set()
+        missing = [lbl for lbl in dict.fromkeys(labels) if lbl not in known]
+        if missing:
+            # Extend the entry rather than replacing it, so a request for a few labels (e.g. an
+            # explanation) does not evict the full taxonomy matrix
+            descriptions = label_descriptions or {}
+            added = self.embed([descriptions.get(lbl, lbl) for lbl in missing])
+            with self._matrix_lock:
+                current = self._label_matrices.get(key)
+                if current is None:
+                    current = ([], np.zeros((0, added.shape[1]), dtype=added.dtype))
+                fresh = [i for i, lbl in enumerate(missing) if lbl not in current[0]]
+                cached = (current[0] + [missing[i] for i in fresh], np.vstack([current[1], added[fresh]]))
+                self._label_matrices[key] = cached
+                self._label_matrices.move_to_end(key)
+                while len(self._label_matrices) > settings.LABEL_CACHE_SIZE:
+                    self._label_matrices.popitem(last=False)
+        assert cached is not None
+        names, matrix = cached
+        if list(labels) == names:
+            return matrix
+        position = {lbl: i for i, lbl in enumerate(names)}
+        return matrix[[position[lbl] for lbl in labels]]
+
+    def label_probabilities(
+        self,
+        texts: Sequence[str],
+        label: str,
+        batch_size: Optional[int] = None,
+        taxonomy_hash: Optional[str] = None,
+        label_descriptions: Optional[Dict[str, str]] = None,
+    ) -> np.ndarray:
+        """Similarity of each text to a single ``label``, rescaled to [0, 1]."""
+        if not texts:
+            return np.zeros(0, dtype=np.float32)
+        label_matrix = self._label_matrix([label], label_descriptions, taxonomy_hash)
+        sims = self.embed(texts, batch_size=batch_size) @ label_matrix.T
+        return (sims[:, 0] + 1.0) / 2.0
+
+    def predict_batch(
+        self,
+        texts: Sequence[str],
+        candidate_labels: Optional[List[str]] = None,
+        top_k: int = 5,
+        multi_label: bool = False,
+        batch_size: Optional[int] = None,
+        taxonomy_hash: Optional[str] = None,
+        label_descriptions: Optional[Dict[str, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Score texts against all candidate labels with one matmul; results follow input order."""
+        if not texts:
+            return []
+        if not candidate_labels:
+            raise ValueError("EmbeddingClassifier requires candidate labels")
+        with timed("label_fetch"):
+            label_matrix = self._label_matrix(candidate_labels, label_descriptions, taxonomy_hash)
+        embeddings = self.embed(texts, batch_size=batch_size)
+        results: List[Dict[str, Any]] = []
+        with timed("postprocess"):
+            sims = embeddings @ label_matrix.T
+            if multi_label:
+                scores = (sims + 1.0) / 2.0
+            else:
+                logits = sims / self.temperature
+                logits -= logits.max(axis=1, keepdims=True)
+                exp = np.exp(logits)
+                scores = exp / exp.sum(axis=1, keepdims=True)
+            for row in scores:
+                order = np.argsort(-row, kind="stable")[:top_k]
+                results.append(
+                    {"labels": [candidate_labels[j] for j in order], "scores": [float(row[j]) for j in order]}
+                )
+        return results
+
+    def predict(
+        self,
+        text: str,
+        candidate_labels: Optional[List[str]] = None,
+        top_k: int = 5,
+        multi_label: bool = False,
+        taxonomy_hash: Optional[str] = None,
+        label_descriptions: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        return self.predict_batch(
+            [text],
+            candidate_labels=candidate_labels,
+            top_k=top_k,
+            multi_label=multi_label,
+            taxonomy_hash=taxonomy_hash,
+            label_descriptions=label_descriptions,
+        )[0]
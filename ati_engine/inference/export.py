@@ -0,0 +1,77 @@
+"""Export the configured MNLI model to ONNX, optionally with a dynamically quantized INT8 copy.
+
+Usage:
+    python -m ati_engine.inference.export --out models/onnx [--model NAME] [--no-quantize]
+"""
+from __future__ import annotations
+
+import argparse
+import inspect
+import logging
+import os
+from typing import Optional
+
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from ati_engine.core.config import settings
+from ati_engine.core.logging import configure_logging
+from ati_engine.inference.backends import ONNX_FILENAMES
+
+logger = logging.getLogger(__name__)
+
+
+def export_onnx(model_name: Optional[str] = None, out_dir: Optional[str] = None, quantize: bool = True) -> str:
+    """Write ``model.onnx`` (and ``model.int8.onnx``), tokenizer and config to ``out_dir``."""
+    model_name = model_name or settings.MODEL_NAME
+    out_dir = out_dir or settings.ONNX_MODEL_DIR
+    os.makedirs(out_dir, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+    model.config.return_dict = True
+    tokenizer.save_pretrained(out_dir)
+    model.config.save_pretrained(out_dir)
+
+    sample = tokenizer("paid at starbucks", "This example is Food & Dining.", return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+    fp32_path = os.path.join(out_dir, ONNX_FILENAMES["onnx"])
+    kwargs = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        kwargs["dynamo"] = False
+    logger.info("Exporting %s to %s", model_name, fp32_path)
+    torch.onnx.export(
+        model,
+        tuple(sample[name] for name in input_names),
+        fp32_path,
+        input_names=input_names,
+        output_names=["logits"],
+        dynamic_axes=dynamic_axes,
+        opset_version=17,
+        **kwargs,
+    )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        int8_path = os.path.join(out_dir, ONNX_FILENAMES["onnx-int8"])
+        logger.info("Quantizing to INT8: %s", int8_path)
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    return out_dir
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=None, help="Model name or path (default: MODEL_NAME)")
+    parser.add_argument("--out", default=None, help="Output directory (default: ONNX_MODEL_DIR)")
+    parser.add_argument("--no-quantize", action="store_true", help="Skip the INT8 dynamic quantization step")
+    args = parser.parse_args(argv)
+    configure_logging()
+    export_onnx(args.model, args.out, quantize=not args.no_quantize)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ati_engine.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LabelEncodingCache:
+    """Pre-tokenized NLI hypotheses, keyed by (taxonomy content hash, hypothesis template).
+
+    The candidate label set only changes with the taxonomy, so hypothesis token ids are built
+    once and reused across requests. A new taxonomy hash or template yields a new entry; the
+    least recently used entries are evicted beyond ``max_entries``.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        self.max_entries = max_entries or settings.LABEL_CACHE_SIZE
+        self._entries: "OrderedDict[Tuple[str, str], Dict[str, List[int]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _labels_key(labels: Sequence[str]) -> str:
+        return "labels:" + hashlib.sha256("\x1f".join(labels).encode("utf-8")).hexdigest()
+
+    def encode(
+        self,
+        tokenizer: Any,
+        labels: Sequence[str],
+        template: str,
+        taxonomy_hash: Optional[str] = None,
+    ) -> List[List[int]]:
+        """Return hypothesis token ids (without special tokens) for ``labels``, in order."""
+        key = (taxonomy_hash or self._labels_key(labels), template)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                logger.info("Building label encodings for taxonomy=%s", key[0][:12])
+                entry = {}
+                self._entries[key] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+            missing = [lbl for lbl in dict.fromkeys(labels) if lbl not in entry]
+            if not missing:
+                self._hits += 1
+            else:
+                self._misses += 1
+                hypotheses = [template.format(lbl) for lbl in missing]
+                encoded = tokenizer(hypotheses, add_special_tokens=False)["input_ids"]
+                entry.update(zip(missing, encoded))
+            return [entry[lbl] for lbl in labels]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits, misses, entries = self._hits, self._misses, len(self._entries)
+        total = hits + misses
+        return {"entries": entries, "hits": hits, "misses": misses, "hit_rate": hits / total if total else None}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,15 +1,95 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
 
-from transformers import pipeline, Pipeline
+import numpy as np
 
 from ati_engine.core.config import settings
+from ati_engine.core.metrics import observe_batch, timed
+from ati_engine.inference.backends import OnnxBackend, TorchBackend
+from ati_engine.inference.label_cache import LabelEncodingCache
+from ati_engine.inference.padding import PaddingStats, length_buckets
+
+if TYPE_CHECKING:
+    import torch
+    from transformers import Pipeline
 
 logger = logging.getLogger(__name__)
 
 
+class _PairEncoder:
+    """Assembles premise/hypothesis token ids into model inputs.
+
+    The special-token layout (e.g. ``[CLS] a [SEP] b [SEP]``) is learned once from a probe
+    encoding so that premises and hypotheses can be tokenized separately and joined at the id
+    level, independent of the tokenizer class or transformers version.
+    """
+
+    def __init__(self, tokenizer: Any, max_length: int) -> None:
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        a = tokenizer("a", add_special_tokens=False)["input_ids"]
+        b = tokenizer("b", add_special_tokens=False)["input_ids"]
+        probe = tokenizer("a", "b")
+        full: List[int] = probe["input_ids"]
+        start_a = self._find(full, a, 0)
+        start_b = self._find(full, b, start_a + len(a))
+        self.prefix = full[:start_a]
+        self.middle = full[start_a + len(a) : start_b]
+        self.suffix = full[start_b + len(b) :]
+        self.use_token_types = "token_type_ids" in probe
+        self.pad_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else 0
+
+    @staticmethod
+    def _find(seq: List[int], sub: List[int], start: int) -> int:
+        for i in range(start, len(seq) - len(sub) + 1):
+            if seq[i : i + len(sub)] == sub:
+                return i
+        raise ValueError("Unable to infer pair layout from tokenizer")
+
+    @property
+    def num_special(self) -> int:
+        return len(self.prefix) + len(self.middle) + len(self.suffix)
+
+    def join(self, premise: List[int], hypothesis: List[int]) -> Tuple[List[int], List[int]]:
+        # Truncate the premise only ("only_first"), as the HF zero-shot pipeline does
+        budget = self.max_length - self.num_special - len(hypothesis)
+        premise = premise[: max(budget, 0)]
+        first = self.prefix + premise + self.middle
+        second = hypothesis + self.suffix
+        return first + second, [0] * len(first) + [1] * len(second)
+
+    def pad(self, rows: List[Tuple[List[int], List[int]]]) -> Dict[str, np.ndarray]:
+        width = max(len(ids) for ids, _ in rows)
+        input_ids = np.full((len(rows), width), self.pad_id, dtype=np.int64)
+        attention_mask = np.zeros((len(rows), width), dtype=np.int64)
+        token_type_ids = np.zeros((len(rows), width), dtype=np.int64)
+        for i, (ids, types) in enumerate(rows):
+            input_ids[i, : len(ids)] = ids
+            attention_mask[i, : len(ids)] = 1
+            token_type_ids[i, : len(types)] = types
+        batch = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if self.use_token_types:
+            batch["token_type_ids"] = token_type_ids
+        return batch
+
+
+@dataclass
+class GradientInputs:
+    """One encoded premise/hypothesis pair for gradient attribution, all from one tokenizer."""
+
+    model: Any
+    tokenizer: Any
+    inputs: Dict[str, "torch.Tensor"]
+    premise_span: Tuple[int, int]
+    entailment_id: int
+    contradiction_id: int
+    pad_id: int
+
+
 class DistilBertClassifier:
     """Wrapper around Hugging Face pipelines to support zero-shot classification.
 
@@ -17,56 +97,323 @@ class DistilBertClassifier:
     Fallbacks to text-classification when the configured model doesn't support NLI.
     """
 
-    def __init__(self, model_name: Optional[str] = None, device: Optional[int] = None) -> None:
+    engine = "nli"
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        device: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        hypothesis_template: Optional[str] = None,
+        label_cache: Optional[LabelEncodingCache] = None,
+        backend: Optional[str] = None,
+    ) -> None:
         self.model_name = model_name or settings.MODEL_NAME
         self.device = device if device is not None else settings.DEVICE
+        self.batch_size = batch_size or settings.BATCH_SIZE
+        self.hypothesis_template = hypothesis_template or settings.HYPOTHESIS_TEMPLATE
         self._zs_pipe: Optional[Pipeline] = None
         self._tc_pipe: Optional[Pipeline] = None
+        self.backend_name = (backend or settings.INFERENCE_BACKEND).lower()
+        self._backend: Any = None
+        self._pair_encoder: Optional[_PairEncoder] = None
+        self.label_cache = label_cache or LabelEncodingCache()
+        self.padding = PaddingStats()
+        # Guards lazy loading; predict may be called from the event loop and worker threads
+        self._load_lock = threading.Lock()
 
     def _get_zero_shot(self) -> Pipeline:
         if self._zs_pipe is None:
-            logger.info("Loading zero-shot pipeline with model=%s device=%s", self.model_name, self.device)
-            self._zs_pipe = pipeline(
-                task="zero-shot-classification",
-                model=self.model_name,
-                device=self.device,
-            )
+            with self._load_lock:
+                if self._zs_pipe is None:
+                    from transformers import pipeline
+
+                    sharing = settings.MODEL_SHARING.lower()
+                    logger.info(
+                        "Loading zero-shot pipeline with model=%s device=%s sharing=%s",
+                        self.model_name,
+                        self.device,
+                        sharing,
+                    )
+                    if sharing == "mmap":
+                        from ati_engine.inference.sharing import load_shared_model
+
+                        model, tokenizer = load_shared_model(self.model_name, settings.SHARED_WEIGHTS_DIR)
+                        self._zs_pipe = pipeline(
+                            task="zero-shot-classification", model=model, tokenizer=tokenizer, device=self.device
+                        )
+                    elif sharing == "off":
+                        self._zs_pipe = pipeline(
+                            task="zero-shot-classification",
+                            model=self.model_name,
+                            device=self.device,
+                        )
+                    else:
+                        raise ValueError(f"Unknown MODEL_SHARING: {sharing!r} (expected 'off' or 'mmap')")
         return self._zs_pipe
 
     def _get_text_class(self) -> Pipeline:
         if self._tc_pipe is None:
-            fallback = "distilbert-base-uncased-finetuned-sst-2-english"
-            logger.warning(
-                "Falling back to text-classification with %s (no zero-shot available for %s)", fallback, self.model_name
-            )
-            self._tc_pipe = pipeline(task="text-classification", model=fallback, device=self.device)
+            with self._load_lock:
+                if self._tc_pipe is None:
+                    from transformers import pipeline
+
+                    fallback = "distilbert-base-uncased-finetuned-sst-2-english"
+                    logger.warning(
+                        "Falling back to text-classification with %s (no zero-shot available for %s)",
+                        fallback,
+                        self.model_name,
+                    )
+                    self._tc_pipe = pipeline(task="text-classification", model=fallback, device=self.device)
         return self._tc_pipe
 
-    def predict(
+    def _get_backend(self) -> Any:
+        """Execution backend for NLI forward passes, selected by ``INFERENCE_BACKEND``."""
+        if self._backend is None:
+            if self.backend_name == "torch":
+                backend: Any = TorchBackend(self._get_zero_shot())
+            elif self.backend_name in ("onnx", "onnx-int8"):
+                with self._load_lock:
+                    backend = OnnxBackend(settings.ONNX_MODEL_DIR, variant=self.backend_name)
+            else:
+                raise ValueError(
+                    f"Unknown INFERENCE_BACKEND: {self.backend_name!r} (expected 'torch', 'onnx' or 'onnx-int8')"
+                )
+            self._backend = backend
+        return self._backend
+
+    @property
+    def tokenizer(self) -> Any:
+        return self._get_backend().tokenizer
+
+    @staticmethod
+    def _max_length(tokenizer: Any, config: Any) -> int:
+        return min(
+            int(getattr(tokenizer, "model_max_length", 512) or 512),
+            int(getattr(config, "max_position_embeddings", 512) or 512),
+            settings.MAX_SEQ_LENGTH,
+        )
+
+    def _get_pair_encoder(self) -> _PairEncoder:
+        if self._pair_encoder is None:
+            backend = self._get_backend()
+            self._pair_encoder = _PairEncoder(backend.tokenizer, self._max_length(backend.tokenizer, backend.config))
+        return self._pair_encoder
+
+    def gradient_inputs(self, premise: str, label: str) -> GradientInputs:
+        """Encode (``premise``, hypothesis for ``label``) for the PyTorch model, as a batch of one.
+
+        The PyTorch model is loaded on demand even when ``INFERENCE_BACKEND`` serves predictions
+        from ONNX. Premise and hypothesis are tokenized with that model's own tokenizer (not the
+        backend's or the label cache's) so the ids always index its embedding matrix.
+        """
+        import torch
+
+        zs = self._get_zero_shot()
+        tokenizer, model = zs.tokenizer, zs.model
+        encoder = self._pair_encoder
+        if encoder is None or encoder.tokenizer is not tokenizer:
+            encoder = _PairEncoder(tokenizer, self._max_length(tokenizer, model.config))
+        premise_ids = tokenizer(premise, add_special_tokens=False, truncation=True, max_length=encoder.max_length)
+        hypothesis = tokenizer(self.hypothesis_template.format(label), add_special_tokens=False)["input_ids"]
+        ids, types = encoder.join(premise_ids["input_ids"], hypothesis)
+        inputs = {k: torch.from_numpy(v).to(model.device) for k, v in encoder.pad([(ids, types)]).items()}
+        start = len(encoder.prefix)
+        end = len(ids) - len(encoder.middle) - len(hypothesis) - len(encoder.suffix)
+        entailment_id, contradiction_id = self._nli_label_ids(model.config)
+        return GradientInputs(
+            model=model,
+            tokenizer=tokenizer,
+            inputs=inputs,
+            premise_span=(start, end),
+            entailment_id=entailment_id,
+            contradiction_id=contradiction_id,
+            pad_id=encoder.pad_id,
+        )
+
+    @staticmethod
+    def _nli_label_ids(config: Any) -> Tuple[int, int]:
+        """Return (entailment_id, contradiction_id) following the HF zero-shot convention."""
+        entailment_id = -1
+        for label, ind in (getattr(config, "label2id", None) or {}).items():
+            if str(label).lower().startswith("entail"):
+                entailment_id = int(ind)
+                break
+        contradiction_id = -1 if entailment_id == 0 else 0
+        return entailment_id, contradiction_id
+
+    def _nli_scores(
         self,
-        text: str,
+        texts: Sequence[str],
+        candidate_labels: Sequence[str],
+        multi_label: bool,
+        batch_size: int,
+        taxonomy_hash: Optional[str] = None,
+        shortlists: Optional[Sequence[Sequence[int]]] = None,
+    ) -> np.ndarray:
+        """Score every (text, label) pair and return a ``(len(texts), len(labels))`` matrix.
+
+        Premises are tokenized once each (capped at ``MAX_SEQ_LENGTH``) and hypotheses come
+        pre-tokenized from the label cache. Pairs are then bucketed by length so similar-length
+        sequences share a padded forward pass (see ``length_buckets``), and scores are
+        scattered back to input order. Real vs padded token counts go to ``self.padding``.
+        With ``shortlists`` (label indices per text) only those pairs run; other labels score 0.
+        """
+        backend = self._get_backend()
+        encoder = self._get_pair_encoder()
+        tokenizer = backend.tokenizer
+        with timed("label_fetch"):
+            hypothesis_ids = self.label_cache.encode(
+                tokenizer, candidate_labels, self.hypothesis_template, taxonomy_hash=taxonomy_hash
+            )
+        with timed("tokenize"):
+            premise_ids: List[List[int]] = tokenizer(
+                list(texts), add_special_tokens=False, truncation=True, max_length=encoder.max_length
+            )["input_ids"]
+            n_labels = len(candidate_labels)
+            if shortlists is None:
+                pairs = [(i, j) for i in range(len(texts)) for j in range(n_labels)]
+            else:
+                pairs = [(i, j) for i, picked in enumerate(shortlists) for j in picked]
+            rows = [encoder.join(premise_ids[i], hypothesis_ids[j]) for i, j in pairs]
+            lengths = [len(ids) for ids, _ in rows]
+            budget = [encoder.max_length - encoder.num_special - len(h) for h in hypothesis_ids]
+            truncated = sum(len(premise_ids[i]) > budget[j] for i, j in pairs)
+
+        entailment_id, contradiction_id = self._nli_label_ids(backend.config)
+        out_entail = np.zeros((len(texts), n_labels), dtype=np.float32)
+        out_contra = np.zeros((len(texts), n_labels), dtype=np.float32)
+        for bucket in length_buckets(lengths, batch_size, settings.BATCH_MAX_TOKENS):
+            chunk = [pairs[k] for k in bucket]
+            bucket_lengths = [lengths[k] for k in bucket]
+            with timed("tokenize"):
+                inputs = encoder.pad([rows[k] for k in bucket])
+            with timed("forward"):
+                logits = backend.logits(inputs)
+            observe_batch("forward", len(bucket))
+            self.padding.record(bucket_lengths, max(bucket_lengths))
+            for (i, j), row in zip(chunk, logits):
+                out_entail[i, j] = row[entailment_id]
+                out_contra[i, j] = row[contradiction_id]
+        self.padding.record_truncated(truncated)
+
+        unscored = None
+        if shortlists is not None:
+            unscored = np.ones((len(texts), n_labels), dtype=bool)
+            for i, j in pairs:
+                unscored[i, j] = False
+            out_entail[unscored] = -np.inf
+        if multi_label or n_labels == 1:
+            # Independent entailment vs contradiction softmax per label
+            return 1.0 / (1.0 + np.exp(out_contra - out_entail))
+        # Softmax of entailment logits across labels
+        shifted = out_entail - out_entail.max(axis=1, keepdims=True)
+        exp = np.exp(shifted)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def label_probabilities(
+        self,
+        texts: Sequence[str],
+        label: str,
+        batch_size: Optional[int] = None,
+        taxonomy_hash: Optional[str] = None,
+        label_descriptions: Optional[Dict[str, str]] = None,
+    ) -> np.ndarray:
+        """Entailment probability of a single ``label`` for each text.
+
+        Scores one premise/hypothesis pair per text (entailment vs contradiction) instead of
+        every candidate label, which is what explanation methods need for masked variants.
+        """
+        if not texts:
+            return np.zeros(0, dtype=np.float32)
+        scores = self._nli_scores(texts, [label], True, batch_size or self.batch_size, taxonomy_hash=taxonomy_hash)
+        return scores[:, 0]
+
+    def predict_batch(
+        self,
+        texts: Sequence[str],
         candidate_labels: Optional[List[str]] = None,
         top_k: int = 5,
         multi_label: bool = False,
-    ) -> Dict[str, Any]:
-        """Run prediction.
+        batch_size: Optional[int] = None,
+        taxonomy_hash: Optional[str] = None,
+        label_descriptions: Optional[Dict[str, str]] = None,
+        shortlists: Optional[Sequence[Sequence[int]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run prediction for many texts at once.
 
-        If candidate_labels are provided, attempts zero-shot classification.
-        Otherwise falls back to sentiment classification.
+        All (text x label) pairs are scored in padded, length-bucketed batches of
+        ``batch_size`` pairs. Results are returned per text, in input order. ``taxonomy_hash``
+        keys the hypothesis encoding cache; ad-hoc label lists are keyed by their content.
+        ``label_descriptions`` is accepted for interface parity with the embedding engine and
+        unused here: NLI hypotheses are built from label names. ``shortlists`` restricts each
+        text to those indices of ``candidate_labels`` (see ``inference.prefilter``); the
+        returned labels then come from its shortlist only.
         """
+        if not texts:
+            return []
         if candidate_labels:
             try:
-                zs = self._get_zero_shot()
-                result = zs(text, candidate_labels=candidate_labels, multi_label=multi_label)
-                # Ensure top_k handling
-                labels = result["labels"][:top_k]
-                scores = result["scores"][:top_k]
-                return {"labels": labels, "scores": scores}
+                scores = self._nli_scores(
+                    texts,
+                    candidate_labels,
+                    multi_label,
+                    batch_size or self.batch_size,
+                    taxonomy_hash=taxonomy_hash,
+                    shortlists=shortlists,
+                )
+                results: List[Dict[str, Any]] = []
+                with timed("postprocess"):
+                    for i, row in enumerate(scores):
+                        k = top_k if shortlists is None else min(top_k, len(shortlists[i]))
+                        order = np.argsort(-row, kind="stable")[:k]
+                        results.append(
+                            {"labels": [candidate_labels[j] for j in order], "scores": [float(row[j]) for j in order]}
+                        )
+                return results
             except Exception:
+                if not settings.TEXT_CLASSIFICATION_FALLBACK:
+                    raise
                 logger.exception("Zero-shot classification failed; using text-classification fallback")
                 # continue to fallback
+        elif not settings.TEXT_CLASSIFICATION_FALLBACK:
+            raise ValueError("candidate_labels are required when TEXT_CLASSIFICATION_FALLBACK is disabled")
         tc = self._get_text_class()
-        result = tc(text)
-        if isinstance(result, list) and result:
-            result = result[0]
-        return {"labels": [result["label"]], "scores": [float(result["score"])], "task": "text-classification"}
+        with timed("forward"):
+            outputs = tc(
+                list(texts),
+                batch_size=batch_size or self.batch_size,
+                truncation=True,
+                max_length=settings.MAX_SEQ_LENGTH,
+            )
+        results = []
+        for result in outputs:
+            if isinstance(result, list) and result:
+                result = result[0]
+            results.append(
+                {"labels": [result["label"]], "scores": [float(result["score"])], "task": "text-classification"}
+            )
+        return results
+
+    def predict(
+        self,
+        text: str,
+        candidate_labels: Optional[List[str]] = None,
+        top_k: int = 5,
+        multi_label: bool = False,
+        taxonomy_hash: Optional[str] = None,
+        label_descriptions: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """Run prediction.
+
+        If candidate_labels are provided, attempts zero-shot classification.
+        Otherwise falls back to sentiment classification.
+        """
+        return self.predict_batch(
+            [text],
+            candidate_labels=candidate_labels,
+            top_k=top_k,
+            multi_label=multi_label,
+            taxonomy_hash=taxonomy_hash,
+            label_descriptions=label_descriptions,
+        )[0]
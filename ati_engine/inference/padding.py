@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Iterator, List, Sequence
+
+
+def length_buckets(lengths: Sequence[int], batch_size: int, max_tokens: int = 0) -> Iterator[List[int]]:
+    """Yield batches of indices into ``lengths`` grouped by similar length.
+
+    Indices are sorted by length and cut into batches of at most ``batch_size``; with
+    ``max_tokens`` > 0 a batch is also closed once its padded size (rows x longest row) would
+    exceed that budget, so short sequences travel in larger batches than long ones. Callers
+    scatter results back by index to restore input order.
+    """
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    batch: List[int] = []
+    for i in order:
+        if batch and (
+            len(batch) >= batch_size or (max_tokens > 0 and (len(batch) + 1) * lengths[i] > max_tokens)
+        ):
+            yield batch
+            batch = []
+        batch.append(i)
+    if batch:
+        yield batch
+
+
+class PaddingStats:
+    """Running count of real vs padded token slots fed to the model."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._batches = 0
+            self._sequences = 0
+            self._real_tokens = 0
+            self._padded_tokens = 0
+            self._truncated = 0
+
+    def record(self, lengths: Sequence[int], width: int) -> None:
+        with self._lock:
+            self._batches += 1
+            self._sequences += len(lengths)
+            self._real_tokens += int(sum(lengths))
+            self._padded_tokens += width * len(lengths)
+
+    def record_truncated(self, count: int) -> None:
+        with self._lock:
+            self._truncated += count
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            batches, sequences = self._batches, self._sequences
+            real, padded, truncated = self._real_tokens, self._padded_tokens, self._truncated
+        return {
+            "batches": batches,
+            "sequences": sequences,
+            "truncated_sequences": truncated,
+            "real_tokens": real,
+            "padded_tokens": padded,
+            "padding_efficiency": real / padded if padded else None,
+            "mean_batch_size": sequences / batches if batches else None,
+            "mean_sequence_length": real / sequences if sequences else None,
+        }
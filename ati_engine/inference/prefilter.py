@@ -0,0 +1,181 @@
+"""Cheap lexical ranking of taxonomy labels, so NLI only scores a per-text shortlist.
+
+Each label gets a profile from its name, category keywords and description (the taxonomy's
+``label_descriptions``), hashed into the same word and character n-gram features as the cascade
+first stage and IDF-weighted across labels. A text is scored against every label with one sparse
+lookup per feature in an inverted index; ties keep taxonomy order, so a text that overlaps no
+label falls back to the first labels of the taxonomy.
+
+The module also reports how much of full NLI scoring a shortlist recovers on a sample:
+
+Usage:
+    python -m ati_engine.inference.prefilter [--input FILE --text-field text] [--top-n 5,10,20] [--k 1,3]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import re
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from ati_engine.core.config import settings
+from ati_engine.inference.cascade import featurize
+
+_punct_re = re.compile(r"[^\w\s]+")
+
+
+def _tokens(text: str) -> str:
+    # Descriptors glue words to punctuation ("netflix.com", "amzn*mktp"); split them apart
+    return " ".join(_punct_re.sub(" ", text.lower()).split())
+
+
+class LabelPrefilter:
+    """Inverted index from hashed n-gram features to the labels whose profiles contain them."""
+
+    def __init__(self, labels: Sequence[str], profiles: Mapping[str, str], n_features: int = 2**18) -> None:
+        self.labels = list(labels)
+        self.n_features = n_features
+        rows = [
+            featurize(_tokens(profiles.get(lbl) or lbl.replace("::", " ")), n_features, bias=False) for lbl in labels
+        ]
+        features = np.concatenate([idx for idx, _ in rows])
+        owners = np.concatenate([np.full(len(idx), j, np.int64) for j, (idx, _) in enumerate(rows)])
+        weights = np.concatenate([val for _, val in rows])
+        # Features shared by many labels (e.g. a category name repeated in its subcategories) rank less
+        uniq, df = np.unique(features, return_counts=True)
+        weights = weights * (np.log((1 + len(rows)) / (1 + df[np.searchsorted(uniq, features)])) + 1.0)
+        norms = np.zeros(len(rows), np.float64)
+        np.add.at(norms, owners, weights.astype(np.float64) ** 2)
+        weights = weights / np.sqrt(np.maximum(norms, 1e-12))[owners]
+        order = np.argsort(features, kind="stable")
+        self._features = features[order]
+        self._owners = owners[order]
+        self._weights = weights[order].astype(np.float32)
+
+    @classmethod
+    def from_index(cls, index: Any) -> "LabelPrefilter":
+        """Build from a ``TaxonomyIndex`` (labels plus name/keyword descriptions)."""
+        return cls(index.labels, index.descriptions)
+
+    def scores(self, clean_texts: Sequence[str]) -> np.ndarray:
+        """Cosine-style overlap of each text with each label profile, ``(len(texts), len(labels))``."""
+        out = np.zeros((len(clean_texts), len(self.labels)), np.float32)
+        rows = [featurize(_tokens(t), self.n_features, bias=False) for t in clean_texts]
+        if not rows:
+            return out
+        idx = np.concatenate([r[0] for r in rows])
+        val = np.concatenate([r[1] for r in rows])
+        text_of = np.repeat(np.arange(len(rows)), [len(r[0]) for r in rows])
+        lo = np.searchsorted(self._features, idx, "left")
+        counts = np.searchsorted(self._features, idx, "right") - lo
+        # Expand each text feature's [lo, lo + count) posting range into index positions
+        positions = np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        flat = np.repeat(text_of, counts) * len(self.labels) + self._owners[positions]
+        np.add.at(out.reshape(-1), flat, self._weights[positions] * np.repeat(val, counts))
+        return out
+
+    def shortlist(self, clean_texts: Sequence[str], n: int) -> List[List[int]]:
+        """Indices into ``labels`` of the ``n`` best-ranked labels per text, best first."""
+        if n >= len(self.labels):
+            return [list(range(len(self.labels)))] * len(clean_texts)
+        return [np.argsort(-row, kind="stable")[:n].tolist() for row in self.scores(clean_texts)]
+
+
+def shortlist_recall(
+    full_scores: np.ndarray, shortlists: Sequence[Sequence[int]], ks: Sequence[int] = (1, 3)
+) -> Dict[str, float]:
+    """Share of each text's full-scoring top-k labels that its shortlist contains, per k."""
+    report: Dict[str, float] = {}
+    for k in ks:
+        hits = 0
+        for row, picked in zip(full_scores, shortlists):
+            top = np.argsort(-row, kind="stable")[:k]
+            hits += len(set(top.tolist()) & set(picked))
+        report[f"recall_at_{k}"] = hits / (k * len(shortlists)) if len(shortlists) else math.nan
+    return report
+
+
+def recall_report(
+    service: Any,
+    texts: Sequence[str],
+    top_ns: Sequence[int],
+    ks: Sequence[int] = (1, 3),
+    taxonomy_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Score ``texts`` against every taxonomy label with the NLI model and measure each shortlist size."""
+    from ati_engine.preprocessing.cleaner import normalize_batch
+
+    index = service.taxonomy(taxonomy_id)
+    labels = list(index.labels)
+    clean = normalize_batch(list(texts))
+    prefilter = LabelPrefilter.from_index(index)
+    start = time.perf_counter()
+    full = service.model.predict_batch(
+        clean, candidate_labels=labels, top_k=len(labels), taxonomy_hash=index.content_hash
+    )
+    full_s = time.perf_counter() - start
+    position = {lbl: j for j, lbl in enumerate(labels)}
+    full_scores = np.zeros((len(clean), len(labels)), np.float32)
+    for i, raw in enumerate(full):
+        for lbl, score in zip(raw["labels"], raw["scores"]):
+            full_scores[i, position[lbl]] = score
+    result: Dict[str, Any] = {
+        "texts": len(clean),
+        "labels": len(labels),
+        "full_scoring_s": round(full_s, 4),
+        "shortlists": {},
+    }
+    for n in top_ns:
+        start = time.perf_counter()
+        shortlists = prefilter.shortlist(clean, n)
+        rank_s = time.perf_counter() - start
+        result["shortlists"][str(n)] = {
+            "pairs_scored_fraction": min(n, len(labels)) / len(labels),
+            "prefilter_ms_per_text": round(rank_s * 1000.0 / max(len(clean), 1), 4),
+            **shortlist_recall(full_scores, shortlists, ks),
+        }
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", default=None, help="JSONL/CSV sample of texts (default: synthetic descriptors)")
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--sample", type=int, default=200, help="Texts to score")
+    parser.add_argument("--top-n", default="5,10,20", help="Comma-separated shortlist sizes to evaluate")
+    parser.add_argument("--k", default="1,3", help="Comma-separated full-scoring top-k sets to recover")
+    parser.add_argument("--taxonomy-id", default=None, help="Tenant taxonomy from TAXONOMY_DIR")
+    args = parser.parse_args(argv)
+
+    from ati_engine.core.logging import configure_logging
+    from ati_engine.inference.service import InferenceService
+
+    configure_logging()
+    if args.input:
+        from itertools import islice
+
+        from ati_engine.batch import iter_records
+
+        records = iter_records(args.input, text_field=args.text_field)
+        texts = [text for _, _, text in islice((r for r in records if r[2] and r[2].strip()), args.sample)]
+    else:
+        from ati_engine.preprocessing.benchmark import synthetic_texts
+
+        texts = synthetic_texts(args.sample)
+    report = recall_report(
+        InferenceService(),
+        texts,
+        [int(n) for n in args.top_n.split(",") if n.strip()],
+        [int(k) for k in args.k.split(",") if k.strip()],
+        taxonomy_id=args.taxonomy_id,
+    )
+    report["configured_top_n"] = settings.PREFILTER_TOP_N
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
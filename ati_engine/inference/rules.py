@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class KeywordHit:
+    start: int
+    end: int
+    keyword: str
+    labels: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class RuleMatch:
+    label: str
+    keywords: Tuple[str, ...]
+
+
+@dataclass
+class _Node:
+    goto: Dict[str, int] = field(default_factory=dict)
+    fail: int = 0
+    outputs: List[str] = field(default_factory=list)
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over taxonomy keywords.
+
+    All keywords are matched in a single pass over the text. Hits must fall on word
+    boundaries; overlapping hits are resolved leftmost-longest, so "uber eats" wins over
+    "uber". A text is classified only when every surviving hit points at the same label.
+    """
+
+    def __init__(self, keywords: Dict[str, Iterable[str]]) -> None:
+        self._nodes: List[_Node] = [_Node()]
+        self._labels: Dict[str, Set[str]] = {}
+        for label, words in keywords.items():
+            for word in words:
+                kw = " ".join(str(word).lower().split())
+                if not kw:
+                    continue
+                self._labels.setdefault(kw, set()).add(label)
+                self._insert(kw)
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def _insert(self, keyword: str) -> None:
+        state = 0
+        for ch in keyword:
+            nxt = self._nodes[state].goto.get(ch)
+            if nxt is None:
+                nxt = len(self._nodes)
+                self._nodes.append(_Node())
+                self._nodes[state].goto[ch] = nxt
+            state = nxt
+        if keyword not in self._nodes[state].outputs:
+            self._nodes[state].outputs.append(keyword)
+
+    def _build_failure_links(self) -> None:
+        queue: deque = deque()
+        for child in self._nodes[0].goto.values():
+            queue.append(child)
+        while queue:
+            state = queue.popleft()
+            node = self._nodes[state]
+            for ch, child in node.goto.items():
+                queue.append(child)
+                fail = node.fail
+                while fail and ch not in self._nodes[fail].goto:
+                    fail = self._nodes[fail].fail
+                target = self._nodes[fail].goto.get(ch, 0)
+                self._nodes[child].fail = target if target != child else 0
+                self._nodes[child].outputs.extend(self._nodes[self._nodes[child].fail].outputs)
+
+    def find(self, text: str) -> List[KeywordHit]:
+        """Return all word-bounded keyword hits in ``text`` (expected to be normalized)."""
+        hits: List[KeywordHit] = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self._nodes[state].goto:
+                state = self._nodes[state].fail
+            state = self._nodes[state].goto.get(ch, 0)
+            for kw in self._nodes[state].outputs:
+                start, end = i - len(kw) + 1, i + 1
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if end < len(text) and text[end].isalnum():
+                    continue
+                hits.append(KeywordHit(start, end, kw, tuple(sorted(self._labels[kw]))))
+        return hits
+
+    def classify(self, text: str) -> Optional[RuleMatch]:
+        """Return a match only when the non-overlapping hits agree on a single label."""
+        hits = sorted(self.find(text), key=lambda h: (h.start, -(h.end - h.start)))
+        selected: List[KeywordHit] = []
+        cursor = 0
+        for hit in hits:
+            if hit.start >= cursor:
+                selected.append(hit)
+                cursor = hit.end
+        labels = {lbl for hit in selected for lbl in hit.labels}
+        if len(labels) != 1:
+            return None
+        return RuleMatch(label=labels.pop(), keywords=tuple(hit.keyword for hit in selected))
@@ -1,45 +1,217 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Dict, List, Optional
+import math
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
 
 from ati_engine.api.schemas import InferenceResponse, Prediction
 from ati_engine.core.config import settings
-from ati_engine.preprocessing.cleaner import normalize_text
+from ati_engine.core.metrics import collect_timings, format_metric, observe_batch, timed
+from ati_engine.preprocessing.cleaner import normalize_batch
+from ati_engine.inference.cache import ResultCache, build_result_cache
+from ati_engine.inference.cascade import HashedNgramClassifier, load_cascade
+from ati_engine.inference.embedding import EmbeddingClassifier
 from ati_engine.inference.model import DistilBertClassifier
+from ati_engine.inference.prefilter import LabelPrefilter
+from ati_engine.inference.rules import RuleMatch
 from ati_engine.taxonomy.loader import TaxonomyLoader
+from ati_engine.taxonomy.registry import TaxonomyCatalog, TaxonomyIndex, TaxonomyRegistry, UnknownTaxonomyError
+from ati_engine.utils.memory import memory_report
 
 logger = logging.getLogger(__name__)
 
+WARMUP_TEXTS = [
+    "UBER *TRIP HELP.UBER.COM",
+    "NETFLIX.COM 866-579-7172",
+    "Paid $23.45 at Starbucks Seattle",
+    "AMAZON MKTPLACE PMTS AMZN.COM/BILL WA",
+]
+
+Classifier = Union[DistilBertClassifier, EmbeddingClassifier]
+
+
+def build_classifier(mode: Optional[str] = None) -> Classifier:
+    mode = (mode or settings.CLASSIFIER_MODE).lower()
+    if mode == "nli":
+        return DistilBertClassifier()
+    if mode == "embedding":
+        return EmbeddingClassifier()
+    raise ValueError(f"Unknown CLASSIFIER_MODE: {mode!r} (expected 'nli' or 'embedding')")
+
 
 class InferenceService:
-    def __init__(self, model: Optional[DistilBertClassifier] = None, taxonomy_loader: Optional[TaxonomyLoader] = None) -> None:
-        self.model = model or DistilBertClassifier()
-        self.taxonomy_loader = taxonomy_loader or TaxonomyLoader(settings.TAXONOMY_PATH)
-        self._taxonomy = None
-        self._labels: Optional[List[str]] = None
-
-    def _get_labels(self) -> List[str]:
-        if self._labels is None:
-            self._taxonomy = self.taxonomy_loader.load()
-            self._labels = self.taxonomy_loader.list_labels(self._taxonomy)[: settings.MAX_CANDIDATES]
-            if not self._labels:
-                raise ValueError("No labels found in taxonomy")
-        return self._labels
-
-    def predict(self, text: str, top_k: int = 5, include_scores: bool = True) -> InferenceResponse:
-        clean_text = normalize_text(text)
-        labels = self._get_labels()
-        raw = self.model.predict(clean_text, candidate_labels=labels, top_k=top_k, multi_label=False)
+    def __init__(
+        self,
+        model: Optional[Classifier] = None,
+        taxonomy_loader: Optional[TaxonomyLoader] = None,
+        result_cache: Optional[ResultCache] = None,
+        registry: Optional[TaxonomyRegistry] = None,
+        catalog: Optional[TaxonomyCatalog] = None,
+        cascade: Optional[HashedNgramClassifier] = None,
+    ) -> None:
+        self.model = model or build_classifier()
+        self.registry = registry or TaxonomyRegistry(
+            settings.TAXONOMY_PATH, loader=taxonomy_loader, watch_interval_s=settings.TAXONOMY_WATCH_INTERVAL_S
+        )
+        self.taxonomy_loader = self.registry.loader
+        # Tenant taxonomies share the model; each gets its own index and label encodings
+        if catalog is None and settings.TAXONOMY_DIR:
+            catalog = TaxonomyCatalog(
+                settings.TAXONOMY_DIR,
+                max_loaded=settings.MAX_LOADED_TAXONOMIES,
+                watch_interval_s=settings.TAXONOMY_WATCH_INTERVAL_S,
+            )
+        self.catalog = catalog
+        self.result_cache = result_cache if result_cache is not None else build_result_cache()
+        # Cheap first stage answering confident texts before the transformer (None = disabled)
+        self.cascade = cascade if cascade is not None else load_cascade(settings.CASCADE_MODEL_PATH)
+        # Per-taxonomy derived data, LRU by content hash; request threads share them under the lock
+        self._candidates: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._prefilters: "OrderedDict[str, LabelPrefilter]" = OrderedDict()
+        self._derived_lock = threading.Lock()
+        self._rules_stats: Dict[str, int] = {"matched": 0, "short_circuited": 0, "compared": 0, "agreed": 0}
+        self._cascade_stats: Dict[str, int] = {"answered": 0, "escalated": 0}
+        self._stats_lock = threading.Lock()
+        self.ready = False
+        self.warmup_error: Optional[str] = None
+        self.warmup_ms: Optional[float] = None
+        self.startup_memory: Optional[Dict[str, Any]] = None
+        self._batcher: Optional[MicroBatcher] = None
+
+    def taxonomy(self, taxonomy_id: Optional[str] = None) -> TaxonomyIndex:
+        """Current index of the default taxonomy or of tenant ``taxonomy_id``.
+
+        Take it once per request and pass it along.
+        """
+        if taxonomy_id is None:
+            return self.registry.current()
+        if self.catalog is None:
+            raise UnknownTaxonomyError("Per-request taxonomies are disabled; set TAXONOMY_DIR")
+        return self.catalog.get(taxonomy_id).current()
+
+    def _candidate_labels(self, index: TaxonomyIndex) -> List[str]:
+        with self._derived_lock:
+            cached = self._candidates.get(index.content_hash)
+            if cached is not None:
+                self._candidates.move_to_end(index.content_hash)
+                return cached
+        labels = list(index.labels)
+        # Embedding scoring is one matmul regardless of label count and hierarchical mode
+        # bounds NLI passes by design, so only flat NLI is capped
+        if self.model.engine == "nli" and not settings.HIERARCHICAL_MODE:
+            if len(labels) > settings.MAX_CANDIDATES:
+                logger.warning(
+                    "Taxonomy has %d labels; only the first MAX_CANDIDATES=%d are scored",
+                    len(labels),
+                    settings.MAX_CANDIDATES,
+                )
+            labels = labels[: settings.MAX_CANDIDATES]
+        with self._derived_lock:
+            self._candidates[index.content_hash] = labels
+            while len(self._candidates) > settings.MAX_LOADED_TAXONOMIES + 1:
+                self._candidates.popitem(last=False)
+        return labels
+
+    def _prefilter(self, index: TaxonomyIndex) -> Optional[LabelPrefilter]:
+        """Label ranking for ``index`` when ``PREFILTER_TOP_N`` applies (flat NLI only), else None."""
+        if settings.PREFILTER_TOP_N <= 0 or self.model.engine != "nli" or settings.HIERARCHICAL_MODE:
+            return None
+        with self._derived_lock:
+            prefilter = self._prefilters.get(index.content_hash)
+            if prefilter is not None:
+                self._prefilters.move_to_end(index.content_hash)
+                return prefilter
+        # Built outside the lock; if two threads race, the first one stored wins
+        prefilter = LabelPrefilter.from_index(index)
+        with self._derived_lock:
+            prefilter = self._prefilters.setdefault(index.content_hash, prefilter)
+            while len(self._prefilters) > settings.MAX_LOADED_TAXONOMIES + 1:
+                self._prefilters.popitem(last=False)
+        return prefilter
+
+    def warm_up(self) -> None:
+        """Load the model, tokenize the taxonomy labels and run one batch through the model.
+
+        Goes straight to the classifier so warm-up traffic is not cached or counted.
+        """
+        start = time.perf_counter()
+        try:
+            index = self.taxonomy()
+            self.model.predict_batch(
+                normalize_batch(WARMUP_TEXTS),
+                candidate_labels=self._candidate_labels(index),
+                top_k=1,
+                taxonomy_hash=index.content_hash,
+                label_descriptions=dict(index.descriptions),
+            )
+        except Exception as e:
+            # An empty message would leave readiness at "starting" instead of "failed"
+            self.warmup_error = str(e) or type(e).__name__
+            logger.exception("Warm-up failed")
+            raise
+        self.warmup_ms = (time.perf_counter() - start) * 1000.0
+        self.ready = True
+        self.startup_memory = memory_report()
+        logger.info("Warm-up finished in %.0f ms", self.warmup_ms)
+        if self.startup_memory["rss_mb"] is not None:
+            logger.info(
+                "Worker pid=%d memory: rss=%.0f MiB unique=%.0f MiB shared=%.0f MiB pss=%.0f MiB (sharing=%s)",
+                self.startup_memory["pid"],
+                self.startup_memory["rss_mb"],
+                self.startup_memory["unique_mb"],
+                self.startup_memory["shared_mb"],
+                self.startup_memory["pss_mb"],
+                settings.MODEL_SHARING,
+            )
+
+    @property
+    def labels(self) -> List[str]:
+        return list(self._candidate_labels(self.taxonomy()))
+
+    @property
+    def taxonomy_hash(self) -> Optional[str]:
+        return self.taxonomy().content_hash
+
+    def reload_taxonomy(self, taxonomy_id: Optional[str] = None) -> TaxonomyIndex:
+        """Re-read a taxonomy file now and publish a new index if its content changed.
+
+        Label encodings and cached results are keyed by the taxonomy content hash, so a
+        changed file is re-encoded on first use while an unchanged one keeps its entries.
+        """
+        if taxonomy_id is None:
+            return self.registry.reload()
+        self.taxonomy(taxonomy_id)
+        assert self.catalog is not None
+        return self.catalog.get(taxonomy_id).reload()
+
+    def _build_response(
+        self,
+        text: str,
+        raw: Dict[str, Any],
+        top_k: int,
+        num_labels: int,
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> InferenceResponse:
         predictions: List[Prediction] = [
             Prediction(label=lbl, score=float(scr)) for lbl, scr in zip(raw.get("labels", []), raw.get("scores", []))
         ]
         primary_label = predictions[0].label if predictions else "UNKNOWN"
         metadata: Dict[str, object] = {
             "model": self.model.model_name,
+            "engine": self.model.engine,
+            "backend": getattr(self.model, "backend_name", None),
             "device": settings.DEVICE,
-            "num_labels": len(labels),
+            "num_labels": num_labels,
         }
+        metadata.update(extra or {})
         return InferenceResponse(
             input_text=text,
             top_predictions=predictions[:top_k],
@@ -47,6 +219,569 @@ class InferenceService:
             metadata=metadata,
         )
 
+    def _match_rules(self, clean_texts: List[str], index: TaxonomyIndex) -> List[Optional[RuleMatch]]:
+        if settings.RULES_MODE == "off" or not len(index.matcher):
+            return [None] * len(clean_texts)
+        matches = [index.matcher.classify(t) for t in clean_texts]
+        with self._stats_lock:
+            self._rules_stats["matched"] += sum(m is not None for m in matches)
+        return matches
+
+    def _compare_rules(self, match: RuleMatch, raw: Dict[str, Any]) -> Dict[str, Any]:
+        model_labels = raw.get("labels") or []
+        model_label = model_labels[0] if model_labels else None
+        # Keywords are defined per top-level category, so compare at that level
+        agree = model_label is not None and model_label.split("::", 1)[0] == match.label
+        with self._stats_lock:
+            self._rules_stats["compared"] += 1
+            self._rules_stats["agreed"] += int(agree)
+        return {"rules_label": match.label, "rules_agree": agree}
+
+    def rules_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats: Dict[str, Any] = dict(self._rules_stats)
+        stats["mode"] = settings.RULES_MODE
+        stats["agreement_rate"] = stats["agreed"] / stats["compared"] if stats["compared"] else None
+        return stats
+
+    def _cascade_threshold(self) -> float:
+        if settings.CASCADE_THRESHOLD is not None:
+            return settings.CASCADE_THRESHOLD
+        return self.cascade.threshold if self.cascade is not None else math.inf
+
+    def _run_cascade(
+        self, clean_texts: List[str], top_k: int, index: TaxonomyIndex
+    ) -> List[Tuple[Optional[Dict[str, Any]], float]]:
+        """First-stage answer (or None to escalate) and calibrated confidence for each text.
+
+        Only labels of the current taxonomy are eligible; a text whose top label is not in it
+        escalates whatever its confidence.
+        """
+        assert self.cascade is not None
+        probs = self.cascade.predict_proba(clean_texts)
+        taxonomy_labels = set(index.labels)
+        allowed = np.array([lbl in taxonomy_labels for lbl in self.cascade.labels])
+        threshold = self._cascade_threshold()
+        out: List[Tuple[Optional[Dict[str, Any]], float]] = []
+        for row in probs:
+            best = int(row.argmax())
+            confidence = float(row[best])
+            if confidence < threshold or not allowed[best]:
+                out.append((None, confidence))
+                continue
+            ranked = [j for j in np.argsort(-row, kind="stable") if allowed[j]][:top_k]
+            raw = {"labels": [self.cascade.labels[j] for j in ranked], "scores": [float(row[j]) for j in ranked]}
+            out.append((raw, confidence))
+        answered = sum(raw is not None for raw, _ in out)
+        with self._stats_lock:
+            self._cascade_stats["answered"] += answered
+            self._cascade_stats["escalated"] += len(out) - answered
+        return out
+
+    def cascade_stats(self) -> Dict[str, Any]:
+        if self.cascade is None:
+            return {"enabled": False}
+        with self._stats_lock:
+            stats: Dict[str, Any] = dict(self._cascade_stats)
+        total = stats["answered"] + stats["escalated"]
+        threshold = self._cascade_threshold()
+        stats.update(
+            enabled=True,
+            fingerprint=self.cascade.fingerprint,
+            labels=len(self.cascade.labels),
+            # inf (never answer) is not valid JSON
+            threshold=threshold if math.isfinite(threshold) else None,
+            answer_rate=stats["answered"] / total if total else None,
+            calibration=self.cascade.meta.get("calibration"),
+        )
+        return stats
+
+    def padding_stats(self) -> Dict[str, Any]:
+        padding = getattr(self.model, "padding", None)
+        stats: Dict[str, Any] = padding.snapshot() if padding is not None else {}
+        stats["max_seq_length"] = settings.MAX_SEQ_LENGTH
+        stats["batch_max_tokens"] = settings.BATCH_MAX_TOKENS
+        return stats
+
+    def render_metrics(self) -> str:
+        """Scrape-time metrics for ``/metrics``; process-wide timers live in ``core.metrics``."""
+        caches: Dict[str, Dict[str, Any]] = {}
+        if self.result_cache is not None:
+            caches["result"] = self.result_cache.stats()
+        label_cache = getattr(self.model, "label_cache", None)
+        if label_cache is not None:
+            caches["label"] = label_cache.stats()
+        rules = self.rules_stats()
+        cascade = self.cascade_stats()
+        padding = self.padding_stats()
+        queue_depth = self._batcher.queue_depth if self._batcher is not None else 0
+        return "".join(
+            [
+                format_metric("ati_ready", "gauge", "1 once warm-up has completed", [({}, float(self.ready))]),
+                format_metric(
+                    "ati_cache_hits_total",
+                    "counter",
+                    "Cache hits",
+                    [({"cache": k}, v["hits"]) for k, v in caches.items()],
+                ),
+                format_metric(
+                    "ati_cache_misses_total",
+                    "counter",
+                    "Cache misses",
+                    [({"cache": k}, v["misses"]) for k, v in caches.items()],
+                ),
+                format_metric(
+                    "ati_cache_hit_ratio",
+                    "gauge",
+                    "Cache hits / lookups since start",
+                    [({"cache": k}, v["hit_rate"]) for k, v in caches.items() if v["hit_rate"] is not None],
+                ),
+                format_metric(
+                    "ati_rules_total",
+                    "counter",
+                    "Keyword rule outcomes",
+                    [({"outcome": k}, rules[k]) for k in ("matched", "short_circuited", "compared", "agreed")],
+                ),
+                format_metric(
+                    "ati_cascade_total",
+                    "counter",
+                    "Texts answered by the cascade first stage vs escalated to the model",
+                    [({"outcome": k}, cascade[k]) for k in ("answered", "escalated") if cascade["enabled"]],
+                ),
+                format_metric(
+                    "ati_model_tokens_total",
+                    "counter",
+                    "Token slots fed to the model, real vs padded",
+                    [({"kind": k}, padding.get(f"{k}_tokens", 0)) for k in ("real", "padded")],
+                ),
+                format_metric(
+                    "ati_micro_batch_queue_depth", "gauge", "Requests waiting for a micro-batch", [({}, queue_depth)]
+                ),
+            ]
+        )
+
+    def _predict_flat(
+        self, clean_texts: List[str], top_k: int, batch_size: Optional[int], index: TaxonomyIndex
+    ) -> List[Tuple[Dict[str, Any], int]]:
+        prefilter = self._prefilter(index)
+        if prefilter is not None:
+            # The shortlist replaces the MAX_CANDIDATES cap: every label is ranked, N are scored
+            with timed("prefilter"):
+                shortlists = prefilter.shortlist(clean_texts, max(settings.PREFILTER_TOP_N, top_k))
+            raws = self.model.predict_batch(
+                clean_texts,
+                candidate_labels=prefilter.labels,
+                top_k=top_k,
+                multi_label=False,
+                batch_size=batch_size,
+                taxonomy_hash=index.content_hash,
+                shortlists=shortlists,
+            )
+            return [(raw, len(picked)) for raw, picked in zip(raws, shortlists)]
+        labels = self._candidate_labels(index)
+        raws = self.model.predict_batch(
+            clean_texts,
+            candidate_labels=labels,
+            top_k=top_k,
+            multi_label=False,
+            batch_size=batch_size,
+            taxonomy_hash=index.content_hash,
+            label_descriptions=dict(index.descriptions),
+        )
+        return [(raw, len(labels)) for raw in raws]
+
+    def _predict_hierarchical(
+        self, clean_texts: List[str], top_k: int, batch_size: Optional[int], index: TaxonomyIndex
+    ) -> List[Tuple[Dict[str, Any], int]]:
+        """Two-stage classification: categories first, then subcategories of the top categories.
+
+        Scores form a distribution over leaves: a subcategory gets ``p(cat) * p(sub | cat)``
+        (stage-two scores renormalized within each category); categories that were not expanded
+        or have no subcategories keep ``p(cat)``. Leaves are sorted by that score before ``top_k``
+        is applied, so an unexpanded category can outrank the subcategories of a winner.
+        """
+        hierarchy = index.hierarchy
+        categories = list(hierarchy)
+        common: Dict[str, Any] = {
+            "multi_label": False,
+            "batch_size": batch_size,
+            "taxonomy_hash": index.content_hash,
+            "label_descriptions": dict(index.descriptions),
+        }
+        stage1 = self.model.predict_batch(clean_texts, candidate_labels=categories, top_k=len(categories), **common)
+        cat_probs = [dict(zip(raw["labels"], raw["scores"])) for raw in stage1]
+
+        # Texts sharing the same winning categories share a stage-two candidate list
+        groups: Dict[Tuple[str, ...], List[int]] = {}
+        for i, raw in enumerate(stage1):
+            winners = tuple(c for c in raw["labels"][: settings.HIERARCHY_TOP_K] if hierarchy.get(c))
+            groups.setdefault(winners, []).append(i)
+
+        results: List[Optional[Tuple[Dict[str, Any], int]]] = [None] * len(clean_texts)
+        for winners, idx in groups.items():
+            subs = [sub for cat in winners for sub in hierarchy[cat]]
+            stage2 = (
+                self.model.predict_batch(
+                    [clean_texts[i] for i in idx], candidate_labels=subs, top_k=len(subs), **common
+                )
+                if subs
+                else [{"labels": [], "scores": []}] * len(idx)
+            )
+            for i, raw in zip(idx, stage2):
+                sub_probs = dict(zip(raw["labels"], raw["scores"]))
+                ranked: List[Tuple[str, float]] = []
+                for cat in stage1[i]["labels"]:
+                    if cat not in winners:
+                        ranked.append((cat, cat_probs[i][cat]))
+                        continue
+                    total = sum(sub_probs[sub] for sub in hierarchy[cat]) or 1.0
+                    conditional = sorted(hierarchy[cat], key=lambda sub: sub_probs[sub], reverse=True)
+                    ranked.extend((sub, cat_probs[i][cat] * sub_probs[sub] / total) for sub in conditional)
+                ranked.sort(key=lambda pair: pair[1], reverse=True)
+                ranked = ranked[:top_k]
+                results[i] = (
+                    {"labels": [lbl for lbl, _ in ranked], "scores": [scr for _, scr in ranked]},
+                    len(categories) + len(subs),
+                )
+        return [r for r in results if r is not None]
+
+    def label_probabilities(
+        self,
+        texts: List[str],
+        label: str,
+        batch_size: Optional[int] = None,
+        index: Optional[TaxonomyIndex] = None,
+    ) -> List[float]:
+        """Probability of ``label`` for each text, one model pair per text (no rules or cache).
+
+        ``index`` defaults to the default taxonomy; pass a tenant's index so its label
+        descriptions and content hash are used.
+        """
+        index = index or self.taxonomy()
+        probs = self.model.label_probabilities(
+            normalize_batch(texts),
+            label,
+            batch_size=batch_size,
+            taxonomy_hash=index.content_hash,
+            label_descriptions=dict(index.descriptions),
+        )
+        return [float(p) for p in probs]
+
+    def label_distribution(self, text: str, index: Optional[TaxonomyIndex] = None) -> Dict[str, float]:
+        """Model probability of every label of ``index`` for ``text``.
+
+        Rules, the cascade, the label prefilter and the result cache are bypassed, so the vector
+        is what the model itself assigns (over leaves when ``HIERARCHICAL_MODE`` is on).
+        """
+        index = index or self.taxonomy()
+        clean = normalize_batch([text])
+        if settings.HIERARCHICAL_MODE:
+            raw, _ = self._predict_hierarchical(clean, len(index.labels), None, index)[0]
+        else:
+            labels = list(index.labels)
+            raw = self.model.predict_batch(
+                clean,
+                candidate_labels=labels,
+                top_k=len(labels),
+                multi_label=False,
+                taxonomy_hash=index.content_hash,
+                label_descriptions=dict(index.descriptions),
+            )[0]
+        return {lbl: float(scr) for lbl, scr in zip(raw["labels"], raw["scores"])}
+
+    def _model_id(self) -> str:
+        """Identity of everything besides text, taxonomy and top_k that shapes a result."""
+        parts = [
+            self.model.engine,
+            self.model.model_name,
+            getattr(self.model, "backend_name", ""),
+            getattr(self.model, "hypothesis_template", ""),
+            f"hier={settings.HIERARCHICAL_MODE}:{settings.HIERARCHY_TOP_K}",
+            f"rules={settings.RULES_MODE}",
+            f"prefilter={settings.PREFILTER_TOP_N}",
+            # The effective length is min(model limits, this cap); the model limits follow model_name
+            f"max_len={settings.MAX_SEQ_LENGTH}",
+        ]
+        temperature = getattr(self.model, "temperature", None)
+        if temperature is not None:
+            parts.append(f"temp={temperature}")
+        if self.cascade is not None:
+            parts.append(f"cascade={self.cascade.fingerprint}:{self._cascade_threshold()}")
+        return "|".join(parts)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        if self.result_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.result_cache.stats()}
+
+    def clear_cache(self) -> None:
+        if self.result_cache is not None:
+            self.result_cache.clear()
+
+    def predict(
+        self, text: str, top_k: int = 5, include_scores: bool = True, taxonomy_id: Optional[str] = None
+    ) -> InferenceResponse:
+        return self.predict_batch([text], top_k=top_k, include_scores=include_scores, taxonomy_id=taxonomy_id)[0]
+
+    def predict_batch(
+        self,
+        texts: List[str],
+        top_k: int = 5,
+        include_scores: bool = True,
+        batch_size: Optional[int] = None,
+        taxonomy_id: Optional[str] = None,
+    ) -> List[InferenceResponse]:
+        """Classify many texts with batched forward passes; results follow input order.
+
+        ``taxonomy_id`` selects a tenant taxonomy from ``TAXONOMY_DIR`` (default: ``TAXONOMY_PATH``).
+        Repeated texts are served from the result cache when enabled; only misses are classified.
+        With ``RESPONSE_TIMINGS`` each response carries the stage breakdown of the call that
+        produced it in ``metadata.timings_ms``.
+        """
+        observe_batch("request", len(texts))
+        if not settings.RESPONSE_TIMINGS:
+            return self._predict_batch(texts, top_k, batch_size, taxonomy_id)
+        start = time.perf_counter()
+        with collect_timings() as timings:
+            results = self._predict_batch(texts, top_k, batch_size, taxonomy_id)
+        breakdown = {stage: round(ms, 3) for stage, ms in timings.items()}
+        breakdown["total"] = round((time.perf_counter() - start) * 1000.0, 3)
+        return [r.model_copy(update={"metadata": dict(r.metadata, timings_ms=breakdown)}) for r in results]
+
+    def _predict_batch(
+        self, texts: List[str], top_k: int, batch_size: Optional[int], taxonomy_id: Optional[str]
+    ) -> List[InferenceResponse]:
+        with timed("normalize"):
+            clean_texts = normalize_batch(texts)
+        with timed("label_fetch"):
+            index = self.taxonomy(taxonomy_id)
+        if self.result_cache is None:
+            return self._predict_uncached(texts, clean_texts, top_k, batch_size, index)
+
+        model_id = self._model_id()
+        results: List[Optional[InferenceResponse]] = [None] * len(texts)
+        with timed("cache"):
+            keys = [self.result_cache.make_key(t, index.content_hash, model_id, top_k) for t in clean_texts]
+            for i, key in enumerate(keys):
+                cached = self.result_cache.get(key)
+                if cached is not None:
+                    metadata = dict(cached.get("metadata") or {}, cache="hit")
+                    results[i] = InferenceResponse(**{**cached, "input_text": texts[i], "metadata": metadata})
+        miss_idx = [i for i, r in enumerate(results) if r is None]
+        if miss_idx:
+            fresh = self._predict_uncached(
+                [texts[i] for i in miss_idx], [clean_texts[i] for i in miss_idx], top_k, batch_size, index
+            )
+            with timed("cache"):
+                for i, response in zip(miss_idx, fresh):
+                    self.result_cache.set(keys[i], response.model_dump(exclude={"input_text"}))
+                    results[i] = response.model_copy(update={"metadata": dict(response.metadata, cache="miss")})
+        return [r for r in results if r is not None]
+
+    def _predict_uncached(
+        self,
+        texts: List[str],
+        clean_texts: List[str],
+        top_k: int,
+        batch_size: Optional[int],
+        index: TaxonomyIndex,
+    ) -> List[InferenceResponse]:
+        """Rules and model path.
+
+        With ``RULES_MODE=shortcircuit`` texts settled by a keyword rule skip the model; with
+        ``RULES_MODE=shadow`` both paths run and their agreement is recorded. When a cascade model
+        is loaded it sees the texts bound for the model first and answers the confident ones.
+        """
+        with timed("label_fetch"):
+            labels = self._candidate_labels(index)
+        with timed("rules"):
+            matches = self._match_rules(clean_texts, index)
+        shortcircuit = settings.RULES_MODE == "shortcircuit"
+        model_idx = [i for i, m in enumerate(matches) if m is None or not shortcircuit]
+
+        results: List[Optional[InferenceResponse]] = [None] * len(texts)
+        first_stage: Dict[int, Tuple[Optional[Dict[str, Any]], float]] = {}
+        if self.cascade is not None and model_idx:
+            with timed("cascade"):
+                first_stage = dict(zip(model_idx, self._run_cascade([clean_texts[i] for i in model_idx], top_k, index)))
+        answered_idx = [i for i, (raw, _) in first_stage.items() if raw is not None]
+        model_idx = [i for i in model_idx if i not in first_stage or first_stage[i][0] is None]
+        scored: List[Tuple[Dict[str, Any], int]] = []
+        if model_idx:
+            predict_fn = self._predict_hierarchical if settings.HIERARCHICAL_MODE else self._predict_flat
+            scored = predict_fn([clean_texts[i] for i in model_idx], top_k, batch_size, index)
+
+        with timed("postprocess"):
+            for i, (raw, num_scored) in zip(model_idx, scored):
+                extra: Dict[str, Any] = {
+                    "source": "model",
+                    "hierarchical": settings.HIERARCHICAL_MODE,
+                    "taxonomy_version": index.version,
+                }
+                if i in first_stage:
+                    extra["cascade_confidence"] = first_stage[i][1]
+                match = matches[i]
+                if match is not None:
+                    extra.update(self._compare_rules(match, raw))
+                results[i] = self._build_response(texts[i], raw, top_k, num_scored, extra)
+
+            for i in answered_idx:
+                raw, confidence = first_stage[i]
+                assert raw is not None and self.cascade is not None
+                extra = {
+                    "source": "cascade",
+                    "model": f"cascade:{self.cascade.fingerprint}",
+                    "engine": "hashed-ngram",
+                    "backend": "numpy",
+                    "cascade_confidence": confidence,
+                    "taxonomy_version": index.version,
+                }
+                match = matches[i]
+                if match is not None:
+                    extra.update(self._compare_rules(match, raw))
+                results[i] = self._build_response(texts[i], raw, top_k, len(self.cascade.labels), extra)
+
+            for i, match in enumerate(matches):
+                if results[i] is None and match is not None:
+                    raw = {"labels": [match.label], "scores": [settings.RULES_CONFIDENCE]}
+                    extra = {
+                        "source": "rules",
+                        "matched_keywords": list(match.keywords),
+                        "taxonomy_version": index.version,
+                    }
+                    results[i] = self._build_response(texts[i], raw, top_k, len(labels), extra)
+        if shortcircuit:
+            with self._stats_lock:
+                self._rules_stats["short_circuited"] += len(texts) - len(model_idx) - len(answered_idx)
+        return [r for r in results if r is not None]
+
+    async def predict_async(
+        self, text: str, top_k: int = 5, include_scores: bool = True, taxonomy_id: Optional[str] = None
+    ) -> InferenceResponse:
+        """Non-blocking predict for async handlers.
+
+        Requests are coalesced by the micro-batcher when enabled; otherwise the blocking
+        predict runs on a worker thread so the event loop keeps serving.
+        """
+        if settings.MICRO_BATCH_ENABLED:
+            if self._batcher is None:
+                self._batcher = MicroBatcher(self)
+            return await self._batcher.submit(
+                text, top_k=top_k, include_scores=include_scores, taxonomy_id=taxonomy_id
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, lambda: self.predict(text, top_k=top_k, include_scores=include_scores, taxonomy_id=taxonomy_id)
+        )
+
+
+@dataclass
+class _PendingRequest:
+    text: str
+    top_k: int
+    include_scores: bool
+    taxonomy_id: Optional[str]
+    future: asyncio.Future
+
+
+class MicroBatcher:
+    """Dynamic micro-batching scheduler in front of the model.
+
+    Requests are queued on the event loop; a background task gathers those arriving within
+    ``max_wait_ms`` (up to ``max_batch_size``), runs them as one ``predict_batch`` call on a
+    dedicated worker thread and resolves each caller's future. While a batch is running, new
+    arrivals accumulate in the queue and form the next batch.
+    """
+
+    def __init__(
+        self,
+        service: InferenceService,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+    ) -> None:
+        self.service = service
+        self.max_batch_size = max_batch_size or settings.MICRO_BATCH_MAX_SIZE
+        self.max_wait_ms = max_wait_ms if max_wait_ms is not None else settings.MICRO_BATCH_MAX_WAIT_MS
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ati-microbatch")
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def submit(
+        self, text: str, top_k: int = 5, include_scores: bool = True, taxonomy_id: Optional[str] = None
+    ) -> InferenceResponse:
+        self._ensure_started()
+        assert self._queue is not None and self._loop is not None
+        future = self._loop.create_future()
+        await self._queue.put(_PendingRequest(text, top_k, include_scores, taxonomy_id, future))
+        return await future
+
+    async def _run(self) -> None:
+        assert self._queue is not None and self._loop is not None
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait_ms / 1000.0
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._dispatch(batch)
+
+    def _predict_groups(
+        self, groups: Dict[Optional[str], List[_PendingRequest]]
+    ) -> List[Tuple[List[_PendingRequest], Union[List[InferenceResponse], Exception]]]:
+        """One ``predict_batch`` per taxonomy; a failing tenant does not fail the others."""
+        out: List[Tuple[List[_PendingRequest], Union[List[InferenceResponse], Exception]]] = []
+        for taxonomy_id, reqs in groups.items():
+            try:
+                top_k = max(req.top_k for req in reqs)
+                texts = [req.text for req in reqs]
+                out.append((reqs, self.service.predict_batch(texts, top_k=top_k, taxonomy_id=taxonomy_id)))
+            except Exception as e:
+                out.append((reqs, e))
+        return out
+
+    async def _dispatch(self, batch: List[_PendingRequest]) -> None:
+        assert self._loop is not None
+        live = [req for req in batch if not req.future.done()]
+        if not live:
+            return
+        observe_batch("micro_batch", len(live))
+        groups: Dict[Optional[str], List[_PendingRequest]] = {}
+        for req in live:
+            groups.setdefault(req.taxonomy_id, []).append(req)
+        try:
+            outcomes = await self._loop.run_in_executor(self._executor, self._predict_groups, groups)
+        except Exception as e:
+            outcomes = [(live, e)]
+        for reqs, results in outcomes:
+            if isinstance(results, Exception):
+                for req in reqs:
+                    if not req.future.done():
+                        req.future.set_exception(results)
+                continue
+            for req, result in zip(reqs, results):
+                if req.future.done():
+                    continue
+                metadata = dict(result.metadata, batch_size=len(live))
+                update = {"top_predictions": result.top_predictions[: req.top_k], "metadata": metadata}
+                req.future.set_result(result.model_copy(update=update))
+
 
 # Dependency provider
 _service_singleton: Optional[InferenceService] = None
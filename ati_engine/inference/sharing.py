@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import re
+from typing import Any, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+WEIGHTS_FILENAME = "weights.pt"
+
+
+def shared_weights_dir(model_name: str, shared_dir: str) -> str:
+    """Directory holding the shareable copy of ``model_name`` under ``shared_dir``."""
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "--", model_name.strip("/")) or "model"
+    return os.path.join(shared_dir, slug)
+
+
+@contextlib.contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """Exclusive inter-process lock so only one worker converts the weights."""
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - non-POSIX hosts convert without locking
+        yield
+        return
+    with open(path, "a+") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def prepare_shared_weights(model_name: str, shared_dir: str) -> str:
+    """Write ``model_name`` once as a single memory-mappable tensor file plus config/tokenizer.
+
+    Non-persistent buffers (e.g. position ids) are stored as well, so the model can be
+    rebuilt without allocating anything of its own. Safe to call from every worker: the
+    first one converts under a file lock, the others find the file in place.
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    out_dir = shared_weights_dir(model_name, shared_dir)
+    path = os.path.join(out_dir, WEIGHTS_FILENAME)
+    if os.path.exists(path):
+        return out_dir
+    os.makedirs(out_dir, exist_ok=True)
+    with _file_lock(os.path.join(out_dir, ".lock")):
+        if os.path.exists(path):
+            return out_dir
+        logger.info("Converting %s to shared weights in %s", model_name, out_dir)
+        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        tensors = {**dict(model.named_parameters()), **dict(model.named_buffers())}
+        model.config.save_pretrained(out_dir)
+        AutoTokenizer.from_pretrained(model_name).save_pretrained(out_dir)
+        tmp = path + f".{os.getpid()}.tmp"
+        torch.save({name: t.detach().contiguous() for name, t in tensors.items()}, tmp)
+        os.replace(tmp, path)
+    return out_dir
+
+
+def load_shared_model(model_name: str, shared_dir: str) -> Tuple[Any, Any]:
+    """Return ``(model, tokenizer)`` whose tensors are read-only views of a memory-mapped file.
+
+    The module tree is built on the meta device (no weight memory) and every parameter and
+    buffer is then pointed at the mapped file. Pages come from the OS page cache, so all
+    worker processes on a host share one physical copy of the weights; nothing is written to
+    them during inference, so they are never copied.
+    """
+    import torch
+    from transformers import AutoConfig, AutoModelForSequenceClassification, AutoTokenizer
+
+    out_dir = prepare_shared_weights(model_name, shared_dir)
+    config = AutoConfig.from_pretrained(out_dir)
+    with torch.device("meta"):
+        model = AutoModelForSequenceClassification.from_config(config)
+    state = torch.load(os.path.join(out_dir, WEIGHTS_FILENAME), mmap=True, weights_only=True, map_location="cpu")
+    for name, tensor in state.items():
+        module_name, _, attr = name.rpartition(".")
+        module = model.get_submodule(module_name)
+        if attr in module._parameters:
+            module._parameters[attr] = torch.nn.Parameter(tensor, requires_grad=False)
+        else:
+            module._buffers[attr] = tensor
+    model.tie_weights()
+    missing = [n for n, t in [*model.named_parameters(), *model.named_buffers()] if t.is_meta]
+    if missing:
+        raise RuntimeError(f"Shared weights in {out_dir} do not cover: {', '.join(missing)}")
+    model.eval()
+    logger.info("Memory-mapped %d tensors from %s", len(state), out_dir)
+    return model, AutoTokenizer.from_pretrained(out_dir)
@@ -0,0 +1,168 @@
+"""Train the cascade's hashed n-gram first stage and tune its confidence threshold.
+
+Usage:
+    python -m ati_engine.inference.train_cascade INPUT --output models/cascade.npz [--target-agreement 0.97]
+    python -m ati_engine.inference.train_cascade results.jsonl --from-results --output models/cascade.npz
+
+INPUT is labeled history (JSONL or CSV with ``--text-field``/``--label-field``) or, with
+``--from-results``, output of ``python -m ati_engine.batch`` / saved API responses, whose
+``primary_label`` becomes the target; rows answered by the cascade itself are skipped so the
+first stage never learns from its own answers. A held-out split is halved: one half fits the
+softmax temperature, the other picks the lowest threshold whose answered texts agree with the
+reference label at ``--target-agreement``. Point ``CASCADE_MODEL_PATH`` at the output to serve it.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import logging
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from ati_engine.core.config import settings
+from ati_engine.core.logging import configure_logging
+from ati_engine.inference.cascade import HashedNgramClassifier, tune_threshold
+from ati_engine.preprocessing.cleaner import normalize_batch
+from ati_engine.taxonomy.loader import TaxonomyLoader
+
+logger = logging.getLogger(__name__)
+
+
+def iter_examples(
+    path: str,
+    fmt: Optional[str] = None,
+    text_field: str = "text",
+    label_field: str = "label",
+    from_results: bool = False,
+) -> Iterator[Tuple[str, str]]:
+    """Yield ``(text, label)`` pairs from a JSONL or CSV file (format inferred from the extension)."""
+    if from_results:
+        text_field, label_field = "input_text", "primary_label"
+    fmt = (fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")).lower()
+    with open(path, encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            rows: Iterator[Any] = csv.DictReader(f)
+        elif fmt == "jsonl":
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            raise ValueError(f"Unknown input format: {fmt!r} (expected 'jsonl' or 'csv')")
+        for row in rows:
+            if not isinstance(row, dict):
+                continue
+            if from_results and (row.get("metadata") or {}).get("source") == "cascade":
+                continue
+            text, label = row.get(text_field), row.get(label_field)
+            if isinstance(text, str) and text.strip() and isinstance(label, str) and label and label != "UNKNOWN":
+                yield text, label
+
+
+def train(
+    texts: List[str],
+    labels: List[str],
+    target_agreement: float = 0.97,
+    holdout: float = 0.2,
+    n_features: int = 2**18,
+    epochs: int = 10,
+    min_answered: int = 20,
+    seed: int = 0,
+) -> Tuple[HashedNgramClassifier, Dict[str, Any]]:
+    """Fit, calibrate and threshold a first-stage model; returns it with a held-out report."""
+    if len(texts) != len(labels):
+        raise ValueError("texts and labels differ in length")
+    classes = sorted(set(labels))
+    if len(classes) < 2:
+        raise ValueError(f"Need at least two distinct labels to train, got {classes}")
+    clean = normalize_batch(texts)
+    class_ids = {lbl: j for j, lbl in enumerate(classes)}
+    targets = np.array([class_ids[lbl] for lbl in labels], dtype=np.int64)
+    order = np.random.default_rng(seed).permutation(len(clean))
+    n_held = max(2, int(len(order) * holdout))
+    if n_held >= len(order):
+        raise ValueError(f"Too few examples ({len(order)}) for a {holdout:.0%} held-out split")
+    train_idx, calib_idx, tune_idx = order[n_held:], order[: n_held // 2], order[n_held // 2 : n_held]
+
+    model = HashedNgramClassifier(classes, n_features=n_features)
+    start = time.perf_counter()
+    model.fit([clean[i] for i in train_idx], targets[train_idx], epochs=epochs, seed=seed)
+    train_s = time.perf_counter() - start
+    model.calibrate([clean[i] for i in calib_idx], targets[calib_idx])
+
+    probs = model.predict_proba([clean[i] for i in tune_idx])
+    confidences = probs.max(axis=1)
+    correct = probs.argmax(axis=1) == targets[tune_idx]
+    threshold, coverage, agreement = tune_threshold(confidences, correct, target_agreement, min_answered)
+    model.threshold = threshold
+    calibration = {
+        "target_agreement": target_agreement,
+        "coverage": coverage,
+        "agreement": agreement,
+        "held_out_accuracy": float(correct.mean()),
+        "tuning_examples": int(len(tune_idx)),
+    }
+    model.meta.update(calibration=calibration, trained_on=int(len(train_idx)), trained_at=time.time())
+    report = {
+        "examples": len(clean),
+        "labels": len(classes),
+        "train_s": round(train_s, 3),
+        "temperature": model.temperature,
+        "threshold": threshold if np.isfinite(threshold) else None,
+        **calibration,
+    }
+    return model, report
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="Labeled JSONL/CSV, or API/batch results with --from-results")
+    parser.add_argument("--output", required=True, help="Where to write the model (.npz)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default=None, help="Input format (default: extension)")
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--label-field", default="label")
+    parser.add_argument(
+        "--from-results", action="store_true", help="Learn from saved responses (input_text -> primary_label)"
+    )
+    parser.add_argument(
+        "--taxonomy",
+        default=settings.TAXONOMY_PATH,
+        help="Drop examples whose label is not in this taxonomy ('' keeps all labels)",
+    )
+    parser.add_argument(
+        "--target-agreement", type=float, default=0.97, help="Required agreement of answered texts with the reference"
+    )
+    parser.add_argument("--holdout", type=float, default=0.2, help="Fraction held out for calibration and tuning")
+    parser.add_argument("--features", type=int, default=2**18, help="Hashed feature dimension")
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    examples = list(iter_examples(args.input, args.format, args.text_field, args.label_field, args.from_results))
+    if args.taxonomy:
+        loader = TaxonomyLoader(args.taxonomy)
+        known = set(loader.list_labels(loader.load()))
+        kept = [(t, lbl) for t, lbl in examples if lbl in known]
+        if len(kept) < len(examples):
+            logger.warning("Dropped %d examples with labels outside %s", len(examples) - len(kept), args.taxonomy)
+        examples = kept
+    model, report = train(
+        [t for t, _ in examples],
+        [lbl for _, lbl in examples],
+        target_agreement=args.target_agreement,
+        holdout=args.holdout,
+        n_features=args.features,
+        epochs=args.epochs,
+        seed=args.seed,
+    )
+    model.save(args.output)
+    if report["threshold"] is None:
+        logger.warning(
+            "No threshold reaches %.1f%% agreement; the cascade will escalate everything", 100 * args.target_agreement
+        )
+    print(json.dumps(dict(report, output=args.output), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Measure text normalization throughput (texts/sec) and how much canonicalization shortens inputs.
+
+Usage:
+    python -m ati_engine.preprocessing.benchmark [--n 200000] [--workers 4] [--input FILE]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ati_engine.preprocessing.cleaner import normalize_batch, normalize_text
+
+SAMPLE_DESCRIPTORS = [
+    "UBER *TRIP HELP.UBER.COM 12/31",
+    "NETFLIX.COM 866-579-7172 CA",
+    "Paid $23.45 at Starbucks Seattle #0042",
+    "AMAZON MKTPLACE PMTS AMZN.COM/BILL WA REF 8F7A6B5C4D3E",
+    "POS DEBIT CARD XXXX1234 WALMART STORE 5521 2024-01-05",
+    "CHECKCARD 0105 SHELL OIL 57442 ***4421",
+    "TST* SHAKE SHACK 1234 NEW YORK NY",
+    "SQ *BLUE BOTTLE COFFEE 10/02 #778812",
+]
+
+
+def synthetic_texts(n: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    return [f"{rng.choice(SAMPLE_DESCRIPTORS)} {rng.randint(0, 99999)}" for _ in range(n)]
+
+
+def _throughput(fn: Callable[[], List[str]], n: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return n / best
+
+
+def _mean_words(texts: Sequence[str]) -> float:
+    return sum(len(t.split()) for t in texts) / max(len(texts), 1)
+
+
+def run(texts: Sequence[str], workers: int = 0, repeat: int = 3) -> Dict[str, Any]:
+    n = len(texts)
+    plain = normalize_batch(texts, canonicalize=False, workers=0)
+    canonical = normalize_batch(texts, canonicalize=True, workers=0)
+    report: Dict[str, Any] = {
+        "n_texts": n,
+        "texts_per_s": {
+            "normalize_text_loop": _throughput(lambda: [normalize_text(t) for t in texts], n, repeat),
+            "normalize_batch": _throughput(lambda: normalize_batch(texts, canonicalize=False, workers=0), n, repeat),
+            "normalize_batch_canonical": _throughput(
+                lambda: normalize_batch(texts, canonicalize=True, workers=0), n, repeat
+            ),
+        },
+        "mean_chars": {
+            "normalized": sum(map(len, plain)) / max(n, 1),
+            "canonical": sum(map(len, canonical)) / max(n, 1),
+        },
+        "mean_words": {"normalized": _mean_words(plain), "canonical": _mean_words(canonical)},
+    }
+    if workers > 1:
+        # Warm the pool first so process start-up is not counted
+        normalize_batch(texts[: 2 * workers], canonicalize=True, workers=workers, chunk_size=1, min_pool_batch=0)
+        report["texts_per_s"][f"normalize_batch_canonical_pool{workers}"] = _throughput(
+            lambda: normalize_batch(texts, canonicalize=True, workers=workers, min_pool_batch=0), n, repeat
+        )
+    return report
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=200000, help="Number of synthetic descriptors (default: 200000)")
+    parser.add_argument("--input", default=None, help="Benchmark the lines of this file instead")
+    parser.add_argument("--workers", type=int, default=0, help="Also measure a process pool of this size")
+    parser.add_argument("--repeat", type=int, default=3, help="Best of this many runs (default: 3)")
+    args = parser.parse_args(argv)
+    if args.input:
+        with open(args.input, encoding="utf-8") as f:
+            texts = [line.rstrip("\n") for line in f]
+    else:
+        texts = synthetic_texts(args.n)
+    print(json.dumps(run(texts, workers=args.workers, repeat=args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,38 @@ from __future__ import annotations
 
 import re
 import sys
+import threading
 import unicodedata
-from typing import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence
 
+from ati_engine.core.config import settings
 
 _whitespace_re = re.compile(r"\s+")
-_punct_tbl = dict.fromkeys(i for i in range(sys.maxunicode) if unicodedata.category(chr(i)).startswith("P"))
+
+# Descriptor noise, matched on lowercased text in a single pass. Each alternative removes a
+# whole token, so surrounding words are never split.
+_descriptor_noise_re = re.compile(
+    r"""
+      (?<!\S)(?:[^\w\s]|[\d_])*\d(?:[^\w\s]|[\d_])*(?!\S)  # digits/punctuation only: amounts, dates,
+                                                         # phone and store numbers (#0042, 12/31)
+    | (?<!\w)(?=\w*\d\w*\d\w*\d)\w{8,}(?!\w)              # long reference ids with 3+ digits
+    | (?<!\w)x{2,}\d{2,6}(?!\w)                            # masked card suffixes (xxxx1234)
+    | (?<!\S)[^\w\s]+(?!\S)                               # punctuation left standing alone
+    """,
+    re.VERBOSE,
+)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _punct_tbl() -> Dict[int, Optional[int]]:
+    # Built on first use: scanning every code point takes ~1s and most processes never need it
+    return dict.fromkeys(i for i in range(sys.maxunicode) if unicodedata.category(chr(i)).startswith("P"))
 
 
 def normalize_text(text: str) -> str:
@@ -28,4 +54,69 @@ def normalize_text(text: str) -> str:
 
 
 def strip_punctuation(text: str) -> str:
-    return text.translate(_punct_tbl)
+    return text.translate(_punct_tbl())
+
+
+def canonicalize_descriptor(text: str) -> str:
+    """Strip bank-descriptor noise from normalized text: card suffixes, store and phone
+    numbers, dates, amounts and long reference ids.
+
+    Returns the input unchanged if nothing but noise would remain.
+    """
+    canonical = _whitespace_re.sub(" ", _descriptor_noise_re.sub(" ", text)).strip()
+    return canonical or text
+
+
+def _normalize_chunk(texts: Sequence[str], canonicalize: bool) -> List[str]:
+    # Bind module globals to locals: this loop is the hot path for large batches
+    nfkc, ws, noise = unicodedata.normalize, _whitespace_re.sub, _descriptor_noise_re.sub
+    out: List[str] = []
+    for text in texts:
+        if not isinstance(text, str):
+            raise TypeError("text must be a string")
+        t = ws(" ", nfkc("NFKC", text).lower()).strip()
+        if canonicalize:
+            t = ws(" ", noise(" ", t)).strip() or t
+        out.append(t)
+    return out
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            import multiprocessing
+
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # Spawned workers import only this module, never the model stack
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def normalize_batch(
+    texts: Sequence[str],
+    canonicalize: Optional[bool] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 10000,
+    min_pool_batch: Optional[int] = None,
+) -> List[str]:
+    """Normalize many texts at once; equivalent to ``normalize_text`` (plus
+    ``canonicalize_descriptor`` when ``canonicalize``) applied to each.
+
+    Batches of at least ``min_pool_batch`` (default ``PREPROCESS_POOL_MIN_BATCH``) texts are
+    split into ``chunk_size`` chunks and spread over a process pool of ``workers`` (default
+    ``PREPROCESS_WORKERS``; 0 or 1 keeps everything in-process).
+    """
+    canonicalize = settings.CANONICALIZE_DESCRIPTORS if canonicalize is None else canonicalize
+    workers = settings.PREPROCESS_WORKERS if workers is None else workers
+    min_pool_batch = settings.PREPROCESS_POOL_MIN_BATCH if min_pool_batch is None else min_pool_batch
+    if workers <= 1 or len(texts) < min_pool_batch:
+        return _normalize_chunk(texts, canonicalize)
+    chunks = [list(texts[i : i + chunk_size]) for i in range(0, len(texts), chunk_size)]
+    pool = _get_pool(workers)
+    out: List[str] = []
+    for part in pool.map(_normalize_chunk, chunks, [canonicalize] * len(chunks)):
+        out.extend(part)
+    return out
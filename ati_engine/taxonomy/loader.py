@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 from typing import Dict, List, Any
 import yaml
@@ -31,3 +33,40 @@ class TaxonomyLoader:
             if isinstance(subs, list):
                 labels.extend([f"{cat}::{sub}" for sub in subs])
         return labels
+
+    def hierarchy(self, taxonomy: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Map each top-level category to its ``cat::sub`` labels (empty when it has none)."""
+        tree: Dict[str, List[str]] = {}
+        for cat, spec in taxonomy.items():
+            subs = spec.get("subcategories") if isinstance(spec, dict) else None
+            tree[cat] = [f"{cat}::{sub}" for sub in subs] if isinstance(subs, list) else []
+        return tree
+
+    def label_keywords(self, taxonomy: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Map each top-level category to its ``keywords`` list."""
+        keywords: Dict[str, List[str]] = {}
+        for cat, spec in taxonomy.items():
+            words = spec.get("keywords") if isinstance(spec, dict) else None
+            if isinstance(words, list) and words:
+                keywords[cat] = [str(w) for w in words]
+        return keywords
+
+    def label_descriptions(self, taxonomy: Dict[str, Any]) -> Dict[str, str]:
+        """Describe each label by its name plus its category keywords, for embedding labels."""
+        descriptions: Dict[str, str] = {}
+        for cat, spec in taxonomy.items():
+            spec = spec if isinstance(spec, dict) else {}
+            keywords = [str(k) for k in spec.get("keywords") or []]
+            suffix = f": {', '.join(keywords)}" if keywords else ""
+            descriptions[cat] = f"{cat}{suffix}"
+            subs = spec.get("subcategories")
+            if isinstance(subs, list):
+                for sub in subs:
+                    descriptions[f"{cat}::{sub}"] = f"{sub}, {cat}{suffix}"
+        return descriptions
+
+    @staticmethod
+    def content_hash(taxonomy: Dict[str, Any]) -> str:
+        """Stable hash of the taxonomy content, independent of YAML formatting and key order."""
+        canonical = json.dumps(taxonomy, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from ati_engine.inference.rules import KeywordMatcher
+from ati_engine.taxonomy.loader import TaxonomyLoader
+
+logger = logging.getLogger(__name__)
+
+# Also enforced on request schemas; ids are file names, so no path separators
+TAXONOMY_ID_PATTERN = r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$"
+_TAXONOMY_EXTENSIONS = (".yaml", ".yml")
+
+
+class UnknownTaxonomyError(LookupError):
+    """Raised for a taxonomy id with no matching file in ``TAXONOMY_DIR``."""
+
+
+@dataclass(frozen=True)
+class TaxonomyIndex:
+    """Immutable, pre-compiled view of one version of a taxonomy file.
+
+    Everything a request needs (labels, parent/child maps, keyword sets and matcher, label
+    descriptions, the serialized API body) is derived once at load time. Requests hold on to
+    the index they started with, so a reload never changes a taxonomy under a running request.
+    """
+
+    version: int
+    content_hash: str
+    path: str
+    loaded_at: float
+    taxonomy: Mapping[str, Any]
+    labels: Tuple[str, ...]
+    hierarchy: Mapping[str, Tuple[str, ...]]
+    parents: Mapping[str, str]
+    keywords: Mapping[str, FrozenSet[str]]
+    descriptions: Mapping[str, str]
+    matcher: KeywordMatcher
+    body: bytes
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.content_hash[:32]}"'
+
+    @classmethod
+    def compile(cls, loader: TaxonomyLoader, taxonomy: Dict[str, Any], version: int) -> "TaxonomyIndex":
+        labels = tuple(loader.list_labels(taxonomy))
+        if not labels:
+            raise ValueError("No labels found in taxonomy")
+        hierarchy = {cat: tuple(subs) for cat, subs in loader.hierarchy(taxonomy).items()}
+        keywords = loader.label_keywords(taxonomy)
+        body = json.dumps({"labels": list(labels), "taxonomy": taxonomy}, ensure_ascii=False, default=str)
+        return cls(
+            version=version,
+            content_hash=loader.content_hash(taxonomy),
+            path=loader.path,
+            loaded_at=time.time(),
+            taxonomy=MappingProxyType(taxonomy),
+            labels=labels,
+            hierarchy=MappingProxyType(hierarchy),
+            parents=MappingProxyType({sub: cat for cat, subs in hierarchy.items() for sub in subs}),
+            keywords=MappingProxyType({cat: frozenset(words) for cat, words in keywords.items()}),
+            descriptions=MappingProxyType(loader.label_descriptions(taxonomy)),
+            matcher=KeywordMatcher(keywords),
+            body=body.encode("utf-8"),
+        )
+
+
+class TaxonomyRegistry:
+    """Holds the current ``TaxonomyIndex`` for a taxonomy file and swaps it on change.
+
+    ``current()`` re-checks the file's mtime/size at most every ``watch_interval_s`` seconds
+    (0 disables watching) and recompiles when it changed; ``reload()`` forces a re-read. The
+    new index is built off to the side and published with a single reference assignment, so
+    readers never wait on a reload and never see a half-built index. A file that fails to parse
+    is logged and the previous index stays in service.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        loader: Optional[TaxonomyLoader] = None,
+        watch_interval_s: float = 0.0,
+    ) -> None:
+        self.loader = loader or TaxonomyLoader(path)
+        self.path = self.loader.path
+        self.watch_interval_s = watch_interval_s
+        self._index: Optional[TaxonomyIndex] = None
+        self._stat: Optional[Tuple[float, int]] = None
+        self._checked_at = 0.0
+        self._reload_lock = threading.Lock()
+
+    def _file_stat(self) -> Optional[Tuple[float, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime, st.st_size
+
+    def current(self) -> TaxonomyIndex:
+        index = self._index
+        if index is None:
+            return self.reload()
+        if self.watch_interval_s > 0:
+            now = time.monotonic()
+            if now - self._checked_at >= self.watch_interval_s:
+                self._checked_at = now
+                stat = self._file_stat()
+                # Only one thread reloads; the others keep serving the current index meanwhile
+                if stat is not None and stat != self._stat and self._reload_lock.acquire(blocking=False):
+                    try:
+                        self._reload_locked(stat)
+                    except Exception:
+                        logger.exception("Taxonomy reload from %s failed; keeping version %d", self.path, index.version)
+                    finally:
+                        self._reload_lock.release()
+        return self._index or index
+
+    def reload(self) -> TaxonomyIndex:
+        """Re-read the file now; returns the (possibly unchanged) current index."""
+        with self._reload_lock:
+            return self._reload_locked(self._file_stat())
+
+    def _reload_locked(self, stat: Optional[Tuple[float, int]]) -> TaxonomyIndex:
+        # Record the stat first so a broken file is not re-parsed on every request
+        self._stat = stat
+        taxonomy = self.loader.load()
+        current = self._index
+        if current is not None and self.loader.content_hash(taxonomy) == current.content_hash:
+            return current
+        index = TaxonomyIndex.compile(self.loader, taxonomy, version=current.version + 1 if current else 1)
+        self._index = index
+        logger.info(
+            "Loaded taxonomy %s version %d (%d labels, hash %s)",
+            self.path,
+            index.version,
+            len(index.labels),
+            index.content_hash[:12],
+        )
+        return index
+
+
+class TaxonomyCatalog:
+    """Per-tenant taxonomies stored as ``<directory>/<taxonomy_id>.yaml``.
+
+    Each id gets its own ``TaxonomyRegistry`` (and so its own compiled, hot-reloadable index),
+    created on first use. At most ``max_loaded`` are kept; the least recently used is dropped
+    and simply recompiled if that tenant comes back.
+    """
+
+    def __init__(self, directory: str, max_loaded: int = 32, watch_interval_s: float = 0.0) -> None:
+        self.directory = directory
+        self.max_loaded = max_loaded
+        self.watch_interval_s = watch_interval_s
+        self._registries: "OrderedDict[str, TaxonomyRegistry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, taxonomy_id: str) -> str:
+        if not re.match(TAXONOMY_ID_PATTERN, taxonomy_id):
+            raise UnknownTaxonomyError(f"Invalid taxonomy id: {taxonomy_id!r}")
+        for ext in _TAXONOMY_EXTENSIONS:
+            path = os.path.join(self.directory, taxonomy_id + ext)
+            if os.path.isfile(path):
+                return path
+        raise UnknownTaxonomyError(f"Unknown taxonomy id: {taxonomy_id!r}")
+
+    def get(self, taxonomy_id: str) -> TaxonomyRegistry:
+        with self._lock:
+            registry = self._registries.get(taxonomy_id)
+            if registry is not None:
+                self._registries.move_to_end(taxonomy_id)
+                return registry
+        # Resolve and create outside the lock; a racing duplicate is harmless
+        registry = TaxonomyRegistry(self._path(taxonomy_id), watch_interval_s=self.watch_interval_s)
+        with self._lock:
+            registry = self._registries.setdefault(taxonomy_id, registry)
+            self._registries.move_to_end(taxonomy_id)
+            while len(self._registries) > self.max_loaded:
+                evicted, _ = self._registries.popitem(last=False)
+                logger.info("Evicted taxonomy %s from memory", evicted)
+        return registry
+
+    def available(self) -> List[str]:
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        ids = {os.path.splitext(n)[0] for n in names if n.endswith(_TAXONOMY_EXTENSIONS)}
+        return sorted(i for i in ids if re.match(TAXONOMY_ID_PATTERN, i))
+
+    def loaded(self) -> List[str]:
+        with self._lock:
+            return list(self._registries)
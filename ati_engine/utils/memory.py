@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Dict
+
+_SMAPS_ROLLUP = "/proc/self/smaps_rollup"
+
+
+def memory_report() -> Dict[str, Any]:
+    """Resident memory of this process split into unique and shared pages (in MiB).
+
+    ``unique_mb`` (private pages) is what each additional worker costs; ``shared_mb`` counts
+    pages also mapped by other processes, such as memory-mapped model weights, and ``pss_mb``
+    charges each shared page proportionally. Values are None where ``/proc`` is unavailable.
+    """
+    report: Dict[str, Any] = {"pid": os.getpid(), "rss_mb": None, "pss_mb": None, "unique_mb": None, "shared_mb": None}
+    try:
+        with open(_SMAPS_ROLLUP, encoding="ascii") as f:
+            fields = {}
+            for line in f:
+                key, _, rest = line.partition(":")
+                parts = rest.split()
+                if len(parts) == 2 and parts[1] == "kB":
+                    fields[key] = int(parts[0])
+    except OSError:
+        return report
+    mb = 1024.0
+    report["rss_mb"] = fields.get("Rss", 0) / mb
+    report["pss_mb"] = fields.get("Pss", 0) / mb
+    report["unique_mb"] = (fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)) / mb
+    report["shared_mb"] = (fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)) / mb
+    return report
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import math
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+_SPECIAL_TOKENS = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+_BASE_WORDS = (
+    "this example is paid at payment purchase card pos debit credit ref the a to for of and com www "
+    "monthly subscription order trip ride store online"
+)
+
+
+def build_tiny_nli_model(
+    out_dir: str, taxonomy: Optional[Dict[str, Any]] = None, seed: int = 0, initializer_range: float = 0.02
+) -> str:
+    """Write a tiny randomly initialized DistilBERT MNLI stand-in to ``out_dir``.
+
+    The vocabulary covers the taxonomy names and keywords plus single characters, so any
+    transaction text tokenizes without network access. Scores are meaningless; the model
+    exists for tests and benchmarks that exercise the real code paths offline. With the
+    default ``initializer_range`` outputs barely depend on the input; raise it (e.g. ``0.3``)
+    when a test needs input-sensitive scores.
+    """
+    import torch
+    from transformers import DistilBertConfig, DistilBertForSequenceClassification, DistilBertTokenizerFast
+
+    words = set(_BASE_WORDS.split())
+    for cat, spec in (taxonomy or {}).items():
+        words.update(_words([cat]))
+        if isinstance(spec, dict):
+            words.update(_words(spec.get("keywords") or []))
+            words.update(_words(spec.get("subcategories") or []))
+    chars = list("abcdefghijklmnopqrstuvwxyz0123456789.,&:;-_#$/*'()")
+    vocab = _SPECIAL_TOKENS + sorted(words - set(chars)) + chars + [f"##{c}" for c in chars]
+
+    os.makedirs(out_dir, exist_ok=True)
+    vocab_path = os.path.join(out_dir, "vocab.txt")
+    with open(vocab_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(vocab))
+    tokenizer = DistilBertTokenizerFast(vocab_path, do_lower_case=True, model_max_length=128)
+    config = DistilBertConfig(
+        vocab_size=len(vocab),
+        dim=32,
+        hidden_dim=64,
+        n_layers=2,
+        n_heads=2,
+        max_position_embeddings=128,
+        initializer_range=initializer_range,
+        id2label={0: "CONTRADICTION", 1: "NEUTRAL", 2: "ENTAILMENT"},
+        label2id={"CONTRADICTION": 0, "NEUTRAL": 1, "ENTAILMENT": 2},
+    )
+    torch.manual_seed(seed)
+    model = DistilBertForSequenceClassification(config)
+    model.save_pretrained(out_dir)
+    tokenizer.save_pretrained(out_dir)
+    return out_dir
+
+
+class KeywordStubModel:
+    """Deterministic classifier stand-in whose scores depend only on keyword hits.
+
+    A label's logit is the number of its keywords among the text's words, so tests can reason
+    about attribution signs and score ordering. Every scored text is appended to ``evaluated``
+    and every model call is counted in ``calls``.
+    """
+
+    engine = "stub"
+    tokenizer = None
+
+    def __init__(self, keywords: Dict[str, Iterable[str]], model_name: str = "keyword-stub") -> None:
+        self.keywords = {label: {w.lower() for w in words} for label, words in keywords.items()}
+        self.model_name = model_name
+        self.evaluated: List[str] = []
+        self.calls = 0
+
+    def _logit(self, text: str, label: str) -> float:
+        words = re.findall(r"\w+", text.lower())
+        return float(sum(w in self.keywords.get(label, ()) for w in words))
+
+    def label_probabilities(self, texts: Sequence[str], label: str, **kwargs: Any) -> np.ndarray:
+        self.calls += 1
+        self.evaluated.extend(texts)
+        return np.array([1.0 / (1.0 + math.exp(1.0 - self._logit(t, label))) for t in texts], dtype=np.float32)
+
+    def predict_batch(
+        self, texts: Sequence[str], candidate_labels: Optional[List[str]] = None, top_k: int = 5, **kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        self.calls += 1
+        self.evaluated.extend(texts)
+        labels = list(candidate_labels or self.keywords)
+        results = []
+        for text in texts:
+            logits = np.array([self._logit(text, lbl) for lbl in labels])
+            scores = np.exp(logits - logits.max())
+            scores /= scores.sum()
+            order = np.argsort(-scores, kind="stable")[:top_k]
+            results.append({"labels": [labels[j] for j in order], "scores": [float(scores[j]) for j in order]})
+        return results
+
+
+def _words(items: Iterable[Any]) -> set:
+    return {w for item in items for w in re.findall(r"\w+", str(item).lower())}
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ati_engine.api.schemas import ExplainResponse, TokenAttribution
+from ati_engine.core.config import settings
+from ati_engine.inference.model import GradientInputs
+from ati_engine.inference.service import InferenceService
+from ati_engine.preprocessing.cleaner import normalize_batch
+from ati_engine.taxonomy.registry import TaxonomyIndex
+from ati_engine.xai.explainer import FastShapExplainer
+
+if TYPE_CHECKING:
+    import torch
+
+logger = logging.getLogger(__name__)
+
+
+def _to_response(
+    text: str,
+    target_label: str,
+    pairs: List[Tuple[str, float]],
+    max_tokens: int,
+    summary: Dict[str, Any],
+) -> ExplainResponse:
+    ranked = sorted(pairs, key=lambda x: abs(x[1]), reverse=True)[:max_tokens]
+    attributions = [TokenAttribution(token=t, value=float(v)) for t, v in ranked]
+    summary = {"num_tokens": len(attributions), **summary}
+    return ExplainResponse(input_text=text, target_label=target_label, attributions=attributions, summary=summary)
+
+
+class OcclusionExplainer:
+    """Leave-one-token-out occlusion.
+
+    Every variant with one whitespace token removed is scored, together with the full text,
+    in a single batched ``label_probabilities`` call; a token's attribution is the drop in the
+    target probability when it is removed. Works with any classifier engine. With ``max_evals``
+    smaller than the number of variants, contiguous spans of tokens are removed together and
+    each token gets an equal share of its span's drop.
+    """
+
+    method = "occlusion"
+
+    def __init__(self, service: InferenceService, index: Optional[TaxonomyIndex] = None) -> None:
+        self.service = service
+        self.index = index
+
+    def explain(
+        self, text: str, target_label: str, max_tokens: int = 50, max_evals: Optional[int] = None
+    ) -> ExplainResponse:
+        start = time.perf_counter()
+        tokens = text.split()
+        n_spans = max(min(len(tokens), max_evals - 1 if max_evals else len(tokens)), 1)
+        spans = [span.tolist() for span in np.array_split(np.arange(len(tokens)), n_spans) if len(span)]
+        variants = [text] + [" ".join(tokens[: span[0]] + tokens[span[-1] + 1 :]) for span in spans]
+        probs = self.service.label_probabilities(variants, target_label, index=self.index)
+        full = probs[0]
+        pairs = [(tokens[i], (full - p) / len(span)) for span, p in zip(spans, probs[1:]) for i in span]
+        summary = {
+            "method": self.method,
+            "target_probability": full,
+            "num_evals": len(variants),
+            "compute_ms": (time.perf_counter() - start) * 1000.0,
+        }
+        return _to_response(text, target_label, pairs, max_tokens, summary)
+
+
+class GradientExplainer:
+    """Gradient-based attribution over the NLI model's input embeddings.
+
+    Attributes the target label's entailment probability (entailment vs contradiction for the
+    target hypothesis) to the premise word pieces, using the inputs returned by
+    ``DistilBertClassifier.gradient_inputs``. ``gradient_x_input`` needs one forward and
+    backward pass; ``integrated_gradients`` integrates (trapezoid rule) from a padding-embedding
+    baseline over ``IG_STEPS`` interpolation points, endpoints included, evaluated as one batch,
+    so its attributions sum to roughly ``target_probability - baseline_probability``.
+    """
+
+    def __init__(self, service: InferenceService, method: str = "gradient_x_input") -> None:
+        if method not in ("gradient_x_input", "integrated_gradients"):
+            raise ValueError(f"Unknown gradient method: {method!r}")
+        if service.model.engine != "nli":
+            raise ValueError(f"{method} requires the 'nli' classifier engine")
+        self.service = service
+        self.method = method
+
+    @staticmethod
+    def _probability(embeds: torch.Tensor, encoded: GradientInputs) -> torch.Tensor:
+        import torch
+
+        n = embeds.shape[0]
+        extra = {k: v.expand(n, -1) for k, v in encoded.inputs.items() if k != "input_ids"}
+        logits = encoded.model(inputs_embeds=embeds, **extra).logits
+        pair = logits[:, [encoded.contradiction_id, encoded.entailment_id]]
+        return torch.softmax(pair, dim=-1)[:, 1]
+
+    def explain(
+        self, text: str, target_label: str, max_tokens: int = 50, max_evals: Optional[int] = None
+    ) -> ExplainResponse:
+        import torch
+
+        start = time.perf_counter()
+        encoded = self.service.model.gradient_inputs(normalize_batch([text])[0], target_label)
+        input_ids = encoded.inputs["input_ids"]
+        lo, hi = encoded.premise_span
+        tokens = encoded.tokenizer.convert_ids_to_tokens(input_ids[0, lo:hi].tolist())
+        emb_layer = encoded.model.get_input_embeddings()
+        summary: Dict[str, Any] = {"method": self.method}
+        with torch.enable_grad():
+            inputs = emb_layer(input_ids).detach()
+            if self.method == "gradient_x_input":
+                embeds = inputs.clone().requires_grad_(True)
+                prob = self._probability(embeds, encoded)
+                (grads,) = torch.autograd.grad(prob.sum(), embeds)
+                scores = (grads * inputs).sum(-1)[0]
+                summary.update(target_probability=float(prob[0].detach()), num_evals=1)
+            else:
+                steps = max(int(max_evals or settings.IG_STEPS), 2)
+                baseline_ids = input_ids.clone()
+                baseline_ids[:, lo:hi] = encoded.pad_id
+                baseline = emb_layer(baseline_ids).detach()
+                alphas = torch.linspace(0.0, 1.0, steps, device=inputs.device).view(-1, 1, 1)
+                embeds = (baseline + alphas * (inputs - baseline)).requires_grad_(True)
+                prob = self._probability(embeds, encoded)
+                (grads,) = torch.autograd.grad(prob.sum(), embeds)
+                weights = torch.full((steps, 1, 1), 1.0 / (steps - 1), device=inputs.device)
+                weights[[0, -1]] /= 2.0
+                scores = ((grads * weights).sum(dim=0) * (inputs - baseline)[0]).sum(-1)
+                summary.update(
+                    target_probability=float(prob[-1].detach()),
+                    baseline_probability=float(prob[0].detach()),
+                    num_evals=steps,
+                )
+        values = scores[lo:hi].detach().float().cpu().numpy()
+        pairs = list(zip(tokens, np.asarray(values, dtype=np.float64).tolist()))
+        summary["compute_ms"] = (time.perf_counter() - start) * 1000.0
+        return _to_response(text, target_label, pairs, max_tokens, summary)
+
+
+def build_explainer(method: str, service: InferenceService, index: Optional[TaxonomyIndex] = None) -> Any:
+    """Return the explainer for an ``ExplainRequest.method`` over ``index`` (default taxonomy if None)."""
+    if method == "shap":
+        return FastShapExplainer(service, index=index)
+    if method == "occlusion":
+        return OcclusionExplainer(service, index=index)
+    if method in ("gradient_x_input", "integrated_gradients"):
+        # Hypotheses are built from the label name alone, so the taxonomy is not needed
+        return GradientExplainer(service, method=method)
+    raise ValueError(f"Unknown explain method: {method!r}")
@@ -1,29 +1,44 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Tuple
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
-import shap
 
 from ati_engine.api.schemas import ExplainResponse, TokenAttribution
+from ati_engine.core.config import settings
+from ati_engine.core.metrics import timed
 from ati_engine.inference.service import InferenceService
+from ati_engine.taxonomy.registry import TaxonomyIndex
 
 logger = logging.getLogger(__name__)
 
 
 class ShapExplainer:
-    def __init__(self, service: InferenceService) -> None:
+    method = "shap_text_masker"
+
+    def __init__(
+        self, service: InferenceService, max_cached: Optional[int] = None, index: Optional[TaxonomyIndex] = None
+    ) -> None:
         self.service = service
+        # Taxonomy the target labels belong to; None means the default taxonomy at call time
+        self.index = index
         self._tokenizer = None
+        self._masker = None
+        # shap.Explainer objects per target label, reused across requests
+        self._explainers: "OrderedDict[str, Any]" = OrderedDict()
+        self._max_cached = max_cached or settings.EXPLAIN_CACHE_SIZE
+        self._lock = threading.Lock()
 
     def _get_tokenizer(self):
         if self._tokenizer is not None:
             return self._tokenizer
-        # Try to pull tokenizer from zero-shot pipeline; fallback to text-classification; else None
+        # Try to pull tokenizer from the NLI backend; fallback to text-classification; else None
         try:
-            pipe = self.service.model._get_zero_shot()
-            self._tokenizer = getattr(pipe, "tokenizer", None)
+            self._tokenizer = self.service.model.tokenizer
         except Exception:
             try:
                 pipe = self.service.model._get_text_class()
@@ -46,17 +61,44 @@ class ShapExplainer:
 
         return f
 
-    def explain(self, text: str, target_label: str, max_tokens: int = 50) -> ExplainResponse:
-        # Try to get a tokenizer; fallback to simple tokenization
-        tokenizer = self._get_tokenizer()
-        masker = shap.maskers.Text(tokenizer=tokenizer if tokenizer else "simple")
-        f = self._target_probability_fn(target_label)
+    def _get_masker(self):
+        if self._masker is None:
+            import shap
+
+            # Try to get a tokenizer; fallback to simple tokenization
+            tokenizer = self._get_tokenizer()
+            # A string is read as a split regex, so fall back with None (shap splits on non-word runs)
+            self._masker = shap.maskers.Text(tokenizer=tokenizer or None)
+        return self._masker
+
+    def _get_explainer(self, target_label: str):
+        explainer = self._explainers.get(target_label)
+        if explainer is None:
+            import shap
+
+            explainer = shap.Explainer(self._target_probability_fn(target_label), self._get_masker())
+            self._explainers[target_label] = explainer
+            while len(self._explainers) > self._max_cached:
+                self._explainers.popitem(last=False)
+        else:
+            self._explainers.move_to_end(target_label)
+        return explainer
+
+    def _call_kwargs(self, max_evals: Optional[int]) -> Dict[str, Any]:
+        return {}
+
+    def explain(
+        self, text: str, target_label: str, max_tokens: int = 50, max_evals: Optional[int] = None
+    ) -> ExplainResponse:
+        start = time.perf_counter()
         shap_values = None
-        explainer = None
         shap_error: str | None = None
         try:
-            explainer = shap.Explainer(f, masker)
-            shap_values = explainer([text])
+            # SHAP explainers keep per-call state, so calls on one instance are serialized
+            with self._lock:
+                explainer = self._get_explainer(target_label)
+                with timed("shap"):
+                    shap_values = explainer([text], **self._call_kwargs(max_evals))
         except Exception as e:
             shap_error = str(e)
             logger.exception("SHAP explanation failed; returning empty attributions")
@@ -65,8 +107,9 @@ class ShapExplainer:
         attributions: List[TokenAttribution] = []
         if shap_values is not None:
             try:
-                tokens: List[str] = shap_values.data[0]
-                values: List[float] = shap_values.values[0].tolist()
+                tokens: List[str] = list(shap_values.data[0])
+                # Values carry a trailing output axis (one output: the target probability)
+                values: List[float] = np.asarray(shap_values.values[0]).reshape(len(tokens), -1)[:, 0].tolist()
                 pairs: List[Tuple[str, float]] = list(zip(tokens, values))
                 pairs.sort(key=lambda x: abs(x[1]), reverse=True)
                 pairs = pairs[:max_tokens]
@@ -81,8 +124,33 @@ class ShapExplainer:
 
         summary: Dict[str, Any] = {
             "num_tokens": len(attributions),
-            "method": "shap_text_masker",
+            "method": self.method,
             "fallback": shap_values is None,
             "error": shap_error,
+            "compute_ms": (time.perf_counter() - start) * 1000.0,
         }
+        summary.update(self._call_kwargs(max_evals))
         return ExplainResponse(input_text=text, target_label=target_label, attributions=attributions, summary=summary)
+
+
+class FastShapExplainer(ShapExplainer):
+    """SHAP over the target label's own probability, with batched masked evaluations.
+
+    Each masked variant costs a single premise/hypothesis pair for the target label rather
+    than a full prediction over every label, and the real probability is attributed instead
+    of a 0/1 "is top label" indicator. All variants of a SHAP round are scored in one batched
+    model call, and the number of evaluations is capped by ``max_evals``.
+    """
+
+    method = "shap_fast"
+
+    def _target_probability_fn(self, target_label: str):
+        def f(inputs: List[str]) -> np.ndarray:
+            probs = self.service.label_probabilities([str(t) for t in inputs], target_label, index=self.index)
+            return np.asarray(probs, dtype=np.float32).reshape(-1, 1)
+
+        return f
+
+    def _call_kwargs(self, max_evals: Optional[int]) -> Dict[str, Any]:
+        budget = max_evals or settings.SHAP_MAX_SAMPLES
+        return {"max_evals": budget, "batch_size": budget}
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from ati_engine.api.schemas import ExplainJobResponse, ExplainRequest, ExplainResponse
+from ati_engine.core.config import settings
+from ati_engine.core.metrics import timed
+from ati_engine.inference.service import InferenceService, get_inference_service
+from ati_engine.taxonomy.registry import TaxonomyIndex
+from ati_engine.xai.attribution import build_explainer
+
+logger = logging.getLogger(__name__)
+
+_EWMA_ALPHA = 0.2
+
+
+class ExplainService:
+    """Long-lived explanation orchestrator shared by all requests in the process.
+
+    Explainers are cached per (method, content hash of the request's taxonomy) and score labels
+    with that taxonomy's descriptions; SHAP explainers additionally keep one ``shap.Explainer``
+    per target label, so maskers and explainers are built once. Without a target label, one model
+    pass (rules and cascade bypassed) over every label picks the default target and the same
+    vector is returned in ``summary.label_probabilities``; with one, nothing is predicted. Slow
+    explanations can run as background jobs polled by id.
+    """
+
+    def __init__(self, service: InferenceService, max_explainers: int = 8) -> None:
+        self.service = service
+        self.max_explainers = max_explainers
+        self._explainers: "OrderedDict[Tuple[str, Optional[str]], Any]" = OrderedDict()
+        self._ms_per_token: Dict[str, float] = {}
+        self._jobs: "OrderedDict[str, ExplainJobResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.EXPLAIN_JOB_WORKERS, thread_name_prefix="ati-explain"
+        )
+
+    def _get_explainer(self, method: str, index: TaxonomyIndex) -> Any:
+        key = (method, index.content_hash)
+        with self._lock:
+            explainer = self._explainers.get(key)
+            if explainer is None:
+                explainer = build_explainer(method, self.service, index=index)
+                self._explainers[key] = explainer
+                while len(self._explainers) > self.max_explainers:
+                    self._explainers.popitem(last=False)
+            else:
+                self._explainers.move_to_end(key)
+        return explainer
+
+    def predict_full(self, text: str, taxonomy_id: Optional[str] = None) -> Dict[str, float]:
+        """Model probability of every label of the taxonomy (rules and cascade bypassed)."""
+        return self.service.label_distribution(text, self.service.taxonomy(taxonomy_id))
+
+    def explain(self, request: ExplainRequest, probabilities: Optional[Dict[str, float]] = None) -> ExplainResponse:
+        """Explain ``request``; ``probabilities`` is a ``predict_full`` result already computed for it."""
+        index = self.service.taxonomy(request.taxonomy_id)
+        if request.target_label is None and probabilities is None:
+            probabilities = self.service.label_distribution(request.text, index)
+        predicted_label = max(probabilities, key=probabilities.__getitem__) if probabilities else None
+        target_label = request.target_label or predicted_label
+        if target_label is None:
+            raise ValueError("No target label: the taxonomy has no labels")
+        explainer = self._get_explainer(request.method, index)
+        with timed("explain"):
+            response = explainer.explain(
+                request.text, target_label=target_label, max_tokens=request.max_tokens, max_evals=request.max_evals
+            )
+        self._record_latency(request, response)
+        if probabilities is not None:
+            response.summary.update({"predicted_label": predicted_label, "label_probabilities": probabilities})
+        return response
+
+    def _record_latency(self, request: ExplainRequest, response: ExplainResponse) -> None:
+        compute_ms = response.summary.get("compute_ms")
+        if compute_ms is None:
+            return
+        per_token = float(compute_ms) / max(len(request.text.split()), 1)
+        with self._lock:
+            previous = self._ms_per_token.get(request.method)
+            self._ms_per_token[request.method] = (
+                per_token if previous is None else (1 - _EWMA_ALPHA) * previous + _EWMA_ALPHA * per_token
+            )
+
+    def estimate_ms(self, request: ExplainRequest) -> Optional[float]:
+        """Latency estimate from recent explanations of the same method, or None if unknown."""
+        per_token = self._ms_per_token.get(request.method)
+        if per_token is None:
+            return None
+        return per_token * max(len(request.text.split()), 1)
+
+    def should_run_async(self, request: ExplainRequest) -> bool:
+        if request.mode == "async":
+            return True
+        if request.mode == "auto":
+            estimate = self.estimate_ms(request)
+            return estimate is not None and estimate > settings.EXPLAIN_ASYNC_THRESHOLD_MS
+        return False
+
+    def submit(
+        self, request: ExplainRequest, probabilities: Optional[Dict[str, float]] = None
+    ) -> ExplainJobResponse:
+        job = ExplainJobResponse(job_id=uuid.uuid4().hex, status="pending")
+        with self._lock:
+            self._jobs[job.job_id] = job
+            while len(self._jobs) > settings.EXPLAIN_JOB_RETENTION:
+                self._jobs.popitem(last=False)
+        self._executor.submit(self._run_job, job.job_id, request, probabilities)
+        return job
+
+    def _set_job(self, job_id: str, **update: Any) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                self._jobs[job_id] = job.model_copy(update=update)
+
+    def _run_job(self, job_id: str, request: ExplainRequest, probabilities: Optional[Dict[str, float]]) -> None:
+        self._set_job(job_id, status="running")
+        try:
+            result = self.explain(request, probabilities=probabilities)
+            self._set_job(job_id, status="done", result=result)
+        except Exception as e:
+            logger.exception("Explain job %s failed", job_id)
+            self._set_job(job_id, status="failed", error=str(e))
+
+    def get_job(self, job_id: str) -> Optional[ExplainJobResponse]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+
+# Dependency provider
+_explain_singleton: Optional[ExplainService] = None
+
+
+def get_explain_service() -> ExplainService:
+    global _explain_singleton
+    if _explain_singleton is None:
+        _explain_singleton = ExplainService(get_inference_service())
+    return _explain_singleton
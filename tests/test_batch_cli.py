@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from ati_engine.batch import run  # noqa: E402
+from ati_engine.inference.model import DistilBertClassifier  # noqa: E402
+from ati_engine.inference.service import InferenceService  # noqa: E402
+from ati_engine.utils.testing import build_tiny_nli_model  # noqa: E402
+
+TEXTS = ["Paid $23.45 at Starbucks", "UBER *TRIP", "", "monthly subscription", "card pos 1234", "online order"]
+
+
+@pytest.fixture(scope="module")
+def service(tmp_path_factory):
+    model_dir = build_tiny_nli_model(str(tmp_path_factory.mktemp("tiny")))
+    return InferenceService(model=DistilBertClassifier(model_name=model_dir), result_cache=None)
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_batch_matches_service_and_resumes(tmp_path, service):
+    src = tmp_path / "in.jsonl"
+    src.write_text("\n".join(json.dumps({"id": i, "text": t}) for i, t in enumerate(TEXTS)) + "\n")
+
+    full = tmp_path / "full.jsonl"
+    stats = run(str(src), str(full), id_field="id", top_k=2, chunk_size=2, service=service)
+    rows = _read(full)
+    assert stats["rows_done"] == len(TEXTS)
+    assert [r["row"] for r in rows] == list(range(len(TEXTS)))
+    assert rows[2]["error"]
+    expected = service.predict(TEXTS[0], top_k=2)
+    assert rows[0]["primary_label"] == expected.primary_label and rows[0]["id"] == "0"
+
+    partial = tmp_path / "partial.jsonl"
+    run(str(src), str(partial), id_field="id", top_k=2, chunk_size=2, limit=3, service=service)
+    # Simulate a crash mid-chunk: bytes past the checkpoint must be discarded on resume
+    with open(partial, "a", encoding="utf-8") as f:
+        f.write('{"row": 99, "trunc')
+    stats = run(str(src), str(partial), id_field="id", top_k=2, chunk_size=2, resume=True, service=service)
+    assert stats["rows_processed"] == len(TEXTS) - 3
+    assert [r["row"] for r in _read(partial)] == [r["row"] for r in rows]
+
+
+def test_batch_reads_csv(tmp_path, service):
+    src = tmp_path / "in.csv"
+    src.write_text("description,amount\nNETFLIX.COM,15.49\nUBER TRIP,9.10\n")
+    out = tmp_path / "out.jsonl"
+    run(str(src), str(out), text_field="description", service=service)
+    assert [r["input_text"] for r in _read(out)] == ["NETFLIX.COM", "UBER TRIP"]
+
+
+def test_batch_reports_malformed_jsonl_lines(tmp_path, service):
+    src = tmp_path / "in.jsonl"
+    src.write_text('{"id": 0, "text": "UBER TRIP"}\n{"id": 1, "text": "NETFL\n{"id": 2, "text": "NETFLIX.COM"}\n')
+    out = tmp_path / "out.jsonl"
+    stats = run(str(src), str(out), id_field="id", service=service)
+    rows = _read(out)
+    assert stats["rows_done"] == 3
+    assert [r["row"] for r in rows] == [0, 1, 2]
+    assert rows[1]["error"] and rows[1]["id"] is None
+    assert [rows[0]["input_text"], rows[2]["input_text"]] == ["UBER TRIP", "NETFLIX.COM"]
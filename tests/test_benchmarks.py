@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ati_engine.benchmarks import report, suite
+from ati_engine.benchmarks.load import run_load
+
+
+def test_summarize_and_compare_flag_regressions():
+    summary = report.summarize([0.001, 0.002, 0.003, 0.010], items=8, wall_s=0.5)
+    assert summary["throughput_per_s"] == 16
+    assert summary["p50_ms"] == pytest.approx(2.5)
+    assert summary["max_ms"] == pytest.approx(10.0)
+
+    baseline = {"benchmarks": {"a": {"throughput_per_s": 100.0, "p95_ms": 10.0}, "gone": {"p95_ms": 1.0}}}
+    ok = {"benchmarks": {"a": {"throughput_per_s": 90.0, "p95_ms": 11.0}}}
+    assert report.compare(ok, baseline, tolerance=0.2) == []
+    slow = {"benchmarks": {"a": {"throughput_per_s": 50.0, "p95_ms": 30.0}}}
+    assert {r["metric"] for r in report.compare(slow, baseline, tolerance=0.2)} == {"throughput_per_s", "p95_ms"}
+
+
+def test_suite_writes_report_and_fails_against_faster_baseline(tmp_path, capsys):
+    base = tmp_path / "baseline.json"
+    args = ["--only", "normalize_text,taxonomy_load", "--quick"]
+    assert suite.main(args + ["--save-baseline", str(base)]) == 0
+    saved = json.loads(base.read_text())
+    assert set(saved["benchmarks"]) == {"normalize_text", "taxonomy_load"}
+    assert saved["benchmarks"]["normalize_text"]["throughput_per_s"] > 0
+
+    # Compare throughput only, with a tolerance well above timing noise; only the 1000x gap regresses
+    for summary in saved["benchmarks"].values():
+        for field in report.LOWER_IS_BETTER:
+            summary.pop(field)
+    saved["benchmarks"]["normalize_text"]["throughput_per_s"] *= 1000
+    base.write_text(json.dumps(saved))
+    out = tmp_path / "report.json"
+    assert suite.main(args + ["--baseline", str(base), "--output", str(out), "--tolerance", "0.9"]) == 1
+    regressions = json.loads(out.read_text())["baseline"]["regressions"]
+    assert [(r["benchmark"], r["metric"]) for r in regressions] == [("normalize_text", "throughput_per_s")]
+    assert "REGRESSION normalize_text.throughput_per_s" in capsys.readouterr().err
+
+
+class _InferHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        status = 200 if payload["text"] != "boom" else 500
+        body = b"{}"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_load_generator_counts_latency_and_errors():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _InferHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}"
+        result = run_load(url, ["ok", "ok", "boom"], concurrency=3, total_requests=30)
+    finally:
+        server.shutdown()
+    assert result["samples"] == 20 and result["errors"] == 10
+    assert result["error_types"] == {"HTTP 500": 10}
+    assert result["p99_ms"] >= result["p50_ms"] > 0
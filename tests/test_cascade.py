@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import math
+
+import numpy as np
+import pytest
+
+from ati_engine.inference.cascade import load_cascade, tune_threshold
+from ati_engine.inference.train_cascade import iter_examples, train
+
+MERCHANTS = {
+    "Transport::Rideshare": ["uber trip", "lyft ride", "uber help"],
+    "Entertainment::Streaming": ["netflix com", "hulu plus", "disney plus"],
+    "Crypto": ["coinbase transfer", "binance deposit", "kraken buy"],
+}
+
+
+def _history(n: int = 600):
+    rng = np.random.default_rng(0)
+    labels = list(MERCHANTS)
+    texts, targets = [], []
+    for _ in range(n):
+        label = labels[rng.integers(len(labels))]
+        merchants = MERCHANTS[label]
+        texts.append(f"{merchants[rng.integers(len(merchants))]} {rng.integers(100, 9999)}")
+        # Some label noise, as in real history
+        targets.append(label if rng.random() > 0.03 else labels[rng.integers(len(labels))])
+    return texts, targets
+
+
+def test_tune_threshold_picks_lowest_threshold_meeting_target():
+    conf = np.array([0.99, 0.95, 0.9, 0.8, 0.7, 0.6])
+    correct = np.array([1, 1, 1, 0, 1, 0], dtype=bool)
+    threshold, coverage, agreement = tune_threshold(conf, correct, target_agreement=0.8, min_answered=2)
+    assert (threshold, coverage, agreement) == (0.7, 5 / 6, 0.8)
+    assert tune_threshold(conf, correct, target_agreement=1.0, min_answered=4)[0] == math.inf
+
+
+def test_train_calibrates_and_round_trips(tmp_path):
+    texts, labels = _history()
+    model, report = train(texts, labels, target_agreement=0.95, n_features=2**12, min_answered=10)
+    assert report["agreement"] >= 0.95 and report["coverage"] > 0.5
+    assert model.threshold == report["threshold"] and model.temperature > 0
+
+    path = str(tmp_path / "cascade.npz")
+    model.save(path)
+    loaded = load_cascade(path)
+    assert loaded is not None and loaded.labels == model.labels and loaded.fingerprint
+    assert loaded.meta["calibration"]["coverage"] == report["coverage"]
+    np.testing.assert_allclose(loaded.predict_proba(["uber trip 42"]), model.predict_proba(["uber trip 42"]))
+    assert load_cascade("") is None
+
+
+def test_iter_examples_from_results_skips_cascade_answers(tmp_path):
+    path = tmp_path / "results.jsonl"
+    rows = [
+        {"input_text": "uber trip", "primary_label": "Transport", "metadata": {"source": "model"}},
+        {"input_text": "netflix", "primary_label": "Entertainment", "metadata": {"source": "cascade"}},
+        {"input_text": "???", "primary_label": "UNKNOWN", "metadata": {"source": "model"}},
+    ]
+    path.write_text("\n".join(json.dumps(r) for r in rows) + "\n")
+    assert list(iter_examples(str(path), from_results=True)) == [("uber trip", "Transport")]
+
+
+def test_service_answers_confident_texts_and_escalates_the_rest(tmp_path, monkeypatch):
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    from ati_engine.core.config import settings
+    from ati_engine.inference.model import DistilBertClassifier
+    from ati_engine.inference.service import InferenceService
+    from ati_engine.utils.testing import build_tiny_nli_model
+
+    monkeypatch.setattr(settings, "RULES_MODE", "off")
+    monkeypatch.setattr(settings, "CASCADE_THRESHOLD", 0.8)
+    texts, labels = _history()
+    cascade, _ = train(texts, labels, n_features=2**12, min_answered=10)
+    service = InferenceService(
+        model=DistilBertClassifier(model_name=build_tiny_nli_model(str(tmp_path))), cascade=cascade
+    )
+    service.result_cache = None
+
+    # "Crypto" is not in the sample taxonomy, so even a confident answer escalates
+    confident, unseen, off_taxonomy = service.predict_batch(["uber trip 77", "zqx", "coinbase transfer 5"], top_k=2)
+    assert confident.metadata["source"] == "cascade"
+    assert confident.primary_label == "Transport::Rideshare"
+    assert confident.metadata["cascade_confidence"] >= 0.8
+    assert all(p.label in service.labels for p in confident.top_predictions)
+    for escalated in (unseen, off_taxonomy):
+        assert escalated.metadata["source"] == "model"
+        assert "cascade_confidence" in escalated.metadata
+    assert off_taxonomy.metadata["cascade_confidence"] >= 0.8
+
+    stats = service.cascade_stats()
+    assert (stats["answered"], stats["escalated"], stats["threshold"]) == (1, 2, 0.8)
+    assert 'ati_cascade_total{outcome="answered"} 1' in service.render_metrics()
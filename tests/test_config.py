@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from ati_engine.core.config import Settings
+
+
+@pytest.mark.parametrize(
+    "field, good, bad",
+    [
+        ("CLASSIFIER_MODE", "embedding", "embeddings"),
+        ("RESULT_CACHE_BACKEND", "sqlite", "redis"),
+        ("INFERENCE_BACKEND", "onnx-int8", "onnx_int8"),
+        ("MODEL_SHARING", "mmap", "shared"),
+    ],
+)
+def test_mode_settings_reject_unknown_values_at_startup(field, good, bad):
+    assert getattr(Settings(**{field: good}), field) == good
+    with pytest.raises(ValidationError):
+        Settings(**{field: bad})
+
+
+def test_label_cache_holds_every_loaded_taxonomy():
+    assert Settings(MAX_LOADED_TAXONOMIES=40).LABEL_CACHE_SIZE == 41
+    assert Settings(MAX_LOADED_TAXONOMIES=4, LABEL_CACHE_SIZE=10).LABEL_CACHE_SIZE == 10
+    with pytest.raises(ValidationError, match="LABEL_CACHE_SIZE"):
+        Settings(MAX_LOADED_TAXONOMIES=32, LABEL_CACHE_SIZE=8)
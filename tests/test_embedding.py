@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import zlib
+
+import numpy as np
+import pytest
+
+from ati_engine.inference.embedding import EmbeddingClassifier
+
+
+def _stub_encoder(clf: EmbeddingClassifier) -> list:
+    """Replace the transformer with a deterministic bag-of-words encoder; returns the call log."""
+    calls = []
+
+    def embed(texts, batch_size=None):
+        calls.append(list(texts))
+        out = np.zeros((len(texts), 64), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.lower().replace(",", " ").replace(":", " ").split():
+                out[i, zlib.crc32(word.encode()) % 64] += 1.0
+        return out / np.clip(np.linalg.norm(out, axis=1, keepdims=True), 1e-12, None)
+
+    clf.embed = embed
+    return calls
+
+
+def test_scores_sum_to_one_and_labels_are_embedded_once_per_taxonomy():
+    clf = EmbeddingClassifier(model_name="stub")
+    calls = _stub_encoder(clf)
+    labels = ["Transport", "Entertainment", "Shopping"]
+    descriptions = {"Transport": "Transport: uber, taxi", "Entertainment": "Entertainment: netflix"}
+
+    first = clf.predict_batch(
+        ["uber trip", "netflix"], candidate_labels=labels, top_k=3, taxonomy_hash="h1", label_descriptions=descriptions
+    )
+    assert [r["labels"][0] for r in first] == ["Transport", "Entertainment"]
+    for raw in first:
+        assert sum(raw["scores"]) == pytest.approx(1.0)
+    clf.predict_batch(["taxi"], candidate_labels=labels, taxonomy_hash="h1", label_descriptions=descriptions)
+    label_texts = [descriptions["Transport"], descriptions["Entertainment"], "Shopping"]
+    assert calls == [label_texts, ["uber trip", "netflix"], ["taxi"]]
+
+    # A single-label lookup (as explanations do) reuses the cached matrix instead of replacing it
+    calls.clear()
+    probs = clf.label_probabilities(["uber"], "Transport", taxonomy_hash="h1", label_descriptions=descriptions)
+    assert calls == [["uber"]] and 0.0 <= probs[0] <= 1.0
+    clf.predict_batch(["uber"], candidate_labels=labels, taxonomy_hash="h1", label_descriptions=descriptions)
+    assert calls == [["uber"], ["uber"]]
+
+    # A label new to the taxonomy hash is embedded alone and appended
+    calls.clear()
+    clf.predict_batch(["uber"], candidate_labels=labels + ["Travel"], taxonomy_hash="h1")
+    assert calls == [["Travel"], ["uber"]]
+    # A different taxonomy hash gets its own matrix
+    calls.clear()
+    clf.predict_batch(["uber"], candidate_labels=labels, taxonomy_hash="h2")
+    assert calls[0] == labels
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import pytest
+
+from ati_engine.core.config import settings
+from ati_engine.inference.service import InferenceService
+from ati_engine.utils.testing import KeywordStubModel
+from ati_engine.xai.attribution import OcclusionExplainer, build_explainer
+from ati_engine.xai.explainer import FastShapExplainer
+
+TEXT = "monthly netflix payment ref 8841 card"
+
+
+def _service(monkeypatch):
+    monkeypatch.setattr(settings, "RULES_MODE", "off")
+    model = KeywordStubModel({"Entertainment::Streaming": ["netflix"], "Transport::Rideshare": ["uber"]})
+    service = InferenceService(model=model)
+    service.result_cache = None
+    return service, model
+
+
+def test_occlusion_attributes_the_keyed_token(monkeypatch):
+    service, model = _service(monkeypatch)
+    explainer = OcclusionExplainer(service)
+
+    result = explainer.explain(TEXT, "Entertainment::Streaming")
+    assert result.attributions[0].token == "netflix"
+    assert result.attributions[0].value > 0
+    assert all(a.value == pytest.approx(0.0) for a in result.attributions[1:])
+    assert model.calls == 1 and result.summary["num_evals"] == len(TEXT.split()) + 1
+
+    # Removing the keyword of another label raises nothing for it: the sign follows the key
+    other = explainer.explain("uber netflix", "Transport::Rideshare")
+    assert {a.token: a.value > 0 for a in other.attributions if a.value} == {"uber": True}
+
+
+def test_occlusion_respects_max_evals(monkeypatch):
+    service, model = _service(monkeypatch)
+    result = OcclusionExplainer(service).explain(TEXT, "Entertainment::Streaming", max_evals=3)
+    assert len(model.evaluated) == 3 and result.summary["num_evals"] == 3
+    # Every token still gets a share of its span's drop
+    assert len(result.attributions) == len(TEXT.split())
+    assert {a.token for a in result.attributions if a.value > 0} == {"monthly", "netflix", "payment"}
+
+
+def test_fast_shap_max_evals_bounds_model_calls(monkeypatch):
+    pytest.importorskip("shap")
+    service, model = _service(monkeypatch)
+    result = FastShapExplainer(service).explain(TEXT, "Entertainment::Streaming", max_evals=20)
+    assert not result.summary["fallback"]
+    assert 0 < len(model.evaluated) <= 20
+    top = result.attributions[0]
+    assert top.token.strip() == "netflix" and top.value > 0
+
+
+def test_build_explainer_rejects_unknown_methods(monkeypatch):
+    service, _ = _service(monkeypatch)
+    assert isinstance(build_explainer("occlusion", service), OcclusionExplainer)
+    with pytest.raises(ValueError, match="Unknown explain method"):
+        build_explainer("lime", service)
+    # Gradients need the NLI engine's PyTorch model
+    with pytest.raises(ValueError, match="requires the 'nli'"):
+        build_explainer("gradient_x_input", service)
+
+
+def test_explanations_use_the_request_taxonomy_and_bypass_rules(tmp_path, monkeypatch):
+    from ati_engine.api.schemas import ExplainRequest
+    from ati_engine.taxonomy.registry import TaxonomyCatalog
+    from ati_engine.xai.service import ExplainService
+
+    (tmp_path / "acme.yaml").write_text("Streaming:\n  keywords: [netflix]\nTravel:\n  keywords: [airline]\n")
+    monkeypatch.setattr(settings, "RULES_MODE", "shortcircuit")
+    # The model disagrees with the keyword rule, so a rule-derived summary would be visible
+    model = KeywordStubModel({"Travel": ["netflix"]})
+    service = InferenceService(model=model, catalog=TaxonomyCatalog(str(tmp_path)))
+    service.result_cache = None
+    seen = []
+    label_probabilities = model.label_probabilities
+
+    def recording(texts, label, **kwargs):
+        seen.append(kwargs)
+        return label_probabilities(texts, label, **kwargs)
+
+    model.label_probabilities = recording
+    passes = []
+    predict_batch = model.predict_batch
+
+    def counting(texts, candidate_labels=None, **kwargs):
+        passes.append(list(candidate_labels))
+        return predict_batch(texts, candidate_labels=candidate_labels, **kwargs)
+
+    model.predict_batch = counting
+    explain = ExplainService(service)
+    tenant = service.taxonomy("acme")
+    assert service.predict("netflix monthly", taxonomy_id="acme").primary_label == "Streaming"
+    passes.clear()
+
+    result = explain.explain(ExplainRequest(text="netflix monthly", method="occlusion", taxonomy_id="acme"))
+    # One model pass over every tenant label picks the target and fills the summary; the rule is bypassed
+    assert passes == [list(tenant.labels)]
+    assert result.target_label == "Travel" and result.summary["predicted_label"] == "Travel"
+    probs = result.summary["label_probabilities"]
+    assert set(probs) == {"Streaming", "Travel"} and probs["Travel"] > probs["Streaming"]
+    assert sum(probs.values()) == pytest.approx(1.0)
+    assert {kw["taxonomy_hash"] for kw in seen} == {tenant.content_hash}
+    assert all(kw["label_descriptions"] == dict(tenant.descriptions) for kw in seen)
+
+    # A vector computed up front (as the router does) is reused rather than recomputed
+    probabilities = explain.predict_full("netflix monthly", taxonomy_id="acme")
+    again = explain.explain(ExplainRequest(text="netflix monthly", taxonomy_id="acme"), probabilities=probabilities)
+    assert len(passes) == 2 and again.summary["label_probabilities"] == probabilities
+
+    # With a target label nothing is predicted, and the default taxonomy gets its own explainer
+    passes.clear()
+    given = explain.explain(ExplainRequest(text="netflix monthly", method="occlusion", target_label="Entertainment"))
+    assert passes == [] and "label_probabilities" not in given.summary
+    assert seen[-1]["taxonomy_hash"] == service.taxonomy_hash != tenant.content_hash
+    assert [key for key in explain._explainers] == [
+        ("occlusion", tenant.content_hash),
+        ("shap", tenant.content_hash),
+        ("occlusion", service.taxonomy_hash),
+    ]
+
+
+def test_gradient_methods_on_a_real_model(tmp_path, monkeypatch):
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    from ati_engine.inference.model import DistilBertClassifier
+    from ati_engine.utils.testing import build_tiny_nli_model
+
+    monkeypatch.setattr(settings, "RULES_MODE", "off")
+    model = DistilBertClassifier(model_name=build_tiny_nli_model(str(tmp_path), seed=1, initializer_range=0.3))
+    service = InferenceService(model=model)
+    text = "uber trip ride store online card pos debit"
+    premise_tokens = model.gradient_inputs(text, "Shopping").tokenizer.tokenize(text)
+
+    saliency = build_explainer("gradient_x_input", service).explain(text, "Shopping")
+    assert saliency.summary["num_evals"] == 1
+    assert sorted(a.token for a in saliency.attributions) == sorted(premise_tokens)
+
+    ig = build_explainer("integrated_gradients", service).explain(text, "Shopping", max_evals=64)
+    assert ig.summary["num_evals"] == 64
+    assert sorted(a.token for a in ig.attributions) == sorted(premise_tokens)
+    # Completeness: attributions account for the move from the padding baseline to the input
+    delta = ig.summary["target_probability"] - ig.summary["baseline_probability"]
+    assert abs(delta) > 0.1
+    assert sum(a.value for a in ig.attributions) == pytest.approx(delta, rel=0.05)
+    assert ig.summary["target_probability"] == pytest.approx(
+        float(model.label_probabilities([text], "Shopping")[0]), abs=1e-4
+    )
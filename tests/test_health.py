@@ -6,3 +6,65 @@ from ati_engine.core.config import settings
 def test_settings_loaded():
     assert isinstance(settings.APP_VERSION, str)
     assert settings.APP_VERSION
+
+
+def test_readiness_waits_for_warmup(monkeypatch):
+    import types
+
+    from fastapi import Response
+
+    from ati_engine.api.routers import health
+
+    service = types.SimpleNamespace(ready=False, warmup_error=None, warmup_ms=None)
+    monkeypatch.setattr(health, "get_inference_service", lambda: service)
+    monkeypatch.setattr(settings, "WARMUP_ON_STARTUP", True)
+
+    response = Response()
+    assert health.ready(response).status == "starting"
+    assert response.status_code == 503
+
+    service.ready = True
+    response = Response()
+    assert health.ready(response).status == "ready"
+    assert response.status_code == 200
+
+
+def test_api_import_does_not_load_heavy_libraries():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, ati_engine.api.main; "
+        "loaded = [m for m in ('torch', 'transformers', 'shap') if m in sys.modules]; "
+        "assert not loaded, loaded"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_failed_warmup_task_is_logged_and_fails_readiness(monkeypatch, caplog):
+    import time
+    import types
+
+    from fastapi.testclient import TestClient
+
+    from ati_engine.api import main
+    from ati_engine.api.routers import health
+
+    def warm_up():
+        raise RuntimeError()
+
+    service = types.SimpleNamespace(ready=False, warmup_error=None, warmup_ms=None, warm_up=warm_up)
+    monkeypatch.setattr(main, "get_inference_service", lambda: service)
+    monkeypatch.setattr(health, "get_inference_service", lambda: service)
+    monkeypatch.setattr(settings, "WARMUP_ON_STARTUP", True)
+
+    with TestClient(main.app) as client:
+        deadline = time.monotonic() + 5
+        while True:
+            response = client.get("/health/ready")
+            if response.json()["status"] != "starting" or time.monotonic() > deadline:
+                break
+            time.sleep(0.01)
+    assert response.status_code == 503
+    assert response.json()["status"] == "failed" and response.json()["checks"]["error"] == "RuntimeError"
+    assert "Warm-up task failed" in caplog.text
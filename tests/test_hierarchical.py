@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import pytest
+
+from ati_engine.core.config import settings
+from ati_engine.inference.service import InferenceService
+
+# Stage-one category weights: Shopping is not expanded but outranks Food & Dining's subcategories
+_WEIGHTS = {
+    "Food & Dining": 4.0,
+    "Shopping": 3.5,
+    "Transport": 1.5,
+    "Bills & Utilities": 0.6,
+    "Entertainment": 0.4,
+    "Food & Dining::Restaurants": 2.0,
+    "Food & Dining::Groceries": 1.5,
+    "Food & Dining::Delivery": 1.5,
+}
+
+
+class _StubModel:
+    engine = "nli"
+    model_name = "stub"
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def predict_batch(self, texts, candidate_labels=None, top_k=5, **kwargs):
+        self.calls.append(list(candidate_labels))
+        weights = [_WEIGHTS.get(lbl, 1.0) for lbl in candidate_labels]
+        total = sum(weights)
+        order = sorted(range(len(weights)), key=lambda j: -weights[j])[:top_k]
+        return [{"labels": [candidate_labels[j] for j in order], "scores": [weights[j] / total for j in order]}] * len(
+            texts
+        )
+
+
+def test_hierarchical_predictions_are_sorted_and_expand_only_winners(monkeypatch):
+    monkeypatch.setattr(settings, "HIERARCHICAL_MODE", True)
+    monkeypatch.setattr(settings, "HIERARCHY_TOP_K", 1)
+    monkeypatch.setattr(settings, "RULES_MODE", "off")
+    model = _StubModel()
+    service = InferenceService(model=model)
+    service.result_cache = None
+    index = service.taxonomy()
+
+    full = service.predict("corner diner", top_k=len(index.labels))
+    scores = [p.score for p in full.top_predictions]
+    assert scores == sorted(scores, reverse=True)
+    assert full.primary_label == "Shopping"
+    assert sum(scores) == pytest.approx(1.0)
+
+    food = _WEIGHTS["Food & Dining"] / sum(_WEIGHTS[c] for c in index.hierarchy)
+    subs = {p.label: p.score for p in full.top_predictions if p.label.startswith("Food & Dining::")}
+    assert set(subs) == set(index.hierarchy["Food & Dining"])
+    assert sum(subs.values()) == pytest.approx(food)
+    # Stage two only scores the winning category's subcategories
+    assert model.calls[-1] == list(index.hierarchy["Food & Dining"])
+    assert full.metadata["num_labels"] == len(index.hierarchy) + len(subs)
+
+    truncated = service.predict("corner diner", top_k=2)
+    assert [p.label for p in truncated.top_predictions] == [p.label for p in full.top_predictions[:2]]
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from ati_engine.inference.label_cache import LabelEncodingCache
+from ati_engine.taxonomy.loader import TaxonomyLoader
+
+
+class _CountingTokenizer:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, texts, add_special_tokens=False):
+        self.calls += 1
+        return {"input_ids": [[len(t)] for t in texts]}
+
+
+def test_label_encodings_reused_until_taxonomy_changes():
+    tok = _CountingTokenizer()
+    cache = LabelEncodingCache(max_entries=2)
+    first = cache.encode(tok, ["A", "B"], "This example is {}.", taxonomy_hash="h1")
+    again = cache.encode(tok, ["B", "A"], "This example is {}.", taxonomy_hash="h1")
+    assert again == first[::-1]
+    assert tok.calls == 1
+    cache.encode(tok, ["A", "B"], "This example is {}.", taxonomy_hash="h2")
+    assert tok.calls == 2
+
+
+def test_taxonomy_content_hash_ignores_key_order():
+    assert TaxonomyLoader.content_hash({"a": 1, "b": [1, 2]}) == TaxonomyLoader.content_hash({"b": [1, 2], "a": 1})
+    assert TaxonomyLoader.content_hash({"a": 1}) != TaxonomyLoader.content_hash({"a": 2})
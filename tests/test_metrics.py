@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from ati_engine.core.metrics import Histogram, collect_timings, format_metric, timed
+
+
+def test_histogram_renders_cumulative_buckets():
+    hist = Histogram("t_seconds", "test", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        hist.observe(value, stage="forward")
+    text = hist.render()
+    assert 't_seconds_bucket{stage="forward",le="0.1"} 1' in text
+    assert 't_seconds_bucket{stage="forward",le="1"} 3' in text
+    assert 't_seconds_bucket{stage="forward",le="+Inf"} 4' in text
+    assert 't_seconds_count{stage="forward"} 4' in text
+    assert hist.snapshot(stage="forward") == (4, pytest.approx(4.05))
+    with pytest.raises(ValueError):
+        hist.observe(1.0)
+    assert format_metric("g", "gauge", "h", [({"a": 'x"y'}, 2)]).endswith('g{a="x\\"y"} 2\n')
+
+
+def test_collect_timings_spans_nested_calls_and_is_per_context():
+    seen = {}
+
+    def other_thread():
+        with collect_timings() as timings:
+            with timed("forward"):
+                pass
+        seen["other"] = timings
+
+    with collect_timings() as outer:
+        with timed("normalize"):
+            thread = threading.Thread(target=other_thread)
+            thread.start()
+            thread.join()
+        with collect_timings() as inner:
+            with timed("forward"):
+                pass
+    assert inner is outer
+    assert set(outer) == {"normalize", "forward"}
+    assert set(seen["other"]) == {"forward"}
+
+
+def test_metrics_endpoint_and_response_timings(tmp_path, monkeypatch):
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    from fastapi.testclient import TestClient
+
+    from ati_engine.api.main import app
+    from ati_engine.core.config import settings
+    from ati_engine.inference.cache import MemoryCacheBackend, ResultCache
+    from ati_engine.inference.model import DistilBertClassifier
+    from ati_engine.inference.service import InferenceService, get_inference_service
+    from ati_engine.utils.testing import build_tiny_nli_model
+
+    monkeypatch.setattr(settings, "WARMUP_ON_STARTUP", False)
+    monkeypatch.setattr(settings, "MICRO_BATCH_ENABLED", False)
+    monkeypatch.setattr(settings, "RESPONSE_TIMINGS", True)
+    monkeypatch.setattr(settings, "RULES_MODE", "off")
+    model_dir = build_tiny_nli_model(str(tmp_path))
+    cache = ResultCache(MemoryCacheBackend(max_size=100), ttl_s=60)
+    service = InferenceService(model=DistilBertClassifier(model_name=model_dir), result_cache=cache)
+    app.dependency_overrides[get_inference_service] = lambda: service
+    try:
+        with TestClient(app) as client:
+            first = client.post("/v1/infer/batch", json={"texts": ["uber trip", "netflix"], "top_k": 2}).json()
+            again = client.post("/v1/infer", json={"text": "uber trip", "top_k": 2}).json()
+            text = client.get("/metrics").text
+    finally:
+        app.dependency_overrides.clear()
+
+    timings = first["results"][0]["metadata"]["timings_ms"]
+    assert {"normalize", "label_fetch", "tokenize", "forward", "postprocess", "total"} <= set(timings)
+    assert again["metadata"]["cache"] == "hit" and "forward" not in again["metadata"]["timings_ms"]
+    assert 'ati_stage_seconds_count{stage="forward"}' in text
+    assert 'ati_batch_size_bucket{kind="request",le="2"}' in text
+    assert 'ati_cache_hits_total{cache="result"} 1' in text
+    assert 'ati_http_requests_total{path="/v1/infer/batch",status="200"} 1' in text
+    assert "ati_micro_batch_queue_depth 0" in text
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+
+from ati_engine.api.schemas import InferenceResponse, Prediction
+from ati_engine.core.config import settings
+from ati_engine.inference.service import InferenceService
+
+
+class _StubModel:
+    engine = "stub"
+    model_name = "stub"
+
+
+def _service(monkeypatch, fail=None):
+    monkeypatch.setattr(settings, "MICRO_BATCH_ENABLED", True)
+    monkeypatch.setattr(settings, "MICRO_BATCH_MAX_SIZE", 64)
+    monkeypatch.setattr(settings, "MICRO_BATCH_MAX_WAIT_MS", 50.0)
+    service = InferenceService(model=_StubModel())
+    calls = []
+
+    def predict_batch(texts, top_k=5, include_scores=True, batch_size=None, taxonomy_id=None):
+        calls.append((taxonomy_id, list(texts)))
+        if fail is not None:
+            raise fail
+        return [
+            InferenceResponse(
+                input_text=t,
+                top_predictions=[Prediction(label=f"{taxonomy_id}:{t}", score=0.9), Prediction(label="x", score=0.1)],
+                primary_label=f"{taxonomy_id}:{t}",
+                metadata={},
+            )
+            for t in texts
+        ]
+
+    service.predict_batch = predict_batch
+    return service, calls
+
+
+async def _gather(service, n):
+    return await asyncio.wait_for(
+        asyncio.gather(
+            *(service.predict_async(f"t{i}", top_k=1, taxonomy_id="a" if i % 2 else "b") for i in range(n)),
+            return_exceptions=True,
+        ),
+        timeout=5,
+    )
+
+
+def test_concurrent_requests_are_coalesced_per_taxonomy(monkeypatch):
+    service, calls = _service(monkeypatch)
+    results = asyncio.run(_gather(service, 10))
+
+    for i, result in enumerate(results):
+        taxonomy_id = "a" if i % 2 else "b"
+        assert result.input_text == f"t{i}"
+        assert result.primary_label == f"{taxonomy_id}:t{i}"
+        assert len(result.top_predictions) == 1
+        assert result.metadata["batch_size"] == 10
+    # Ten callers, one forward pass per taxonomy, texts in submission order
+    assert sorted(calls) == [("a", [f"t{i}" for i in range(1, 10, 2)]), ("b", [f"t{i}" for i in range(0, 10, 2)])]
+
+
+def test_model_error_reaches_every_waiting_caller(monkeypatch):
+    service, calls = _service(monkeypatch, fail=RuntimeError("model down"))
+    results = asyncio.run(_gather(service, 6))
+    assert len(calls) == 2
+    assert all(isinstance(r, RuntimeError) and str(r) == "model down" for r in results)
+
+
+def test_executor_failure_reaches_every_waiting_caller(monkeypatch):
+    service, _ = _service(monkeypatch)
+
+    async def run():
+        # Create the batcher, then make the executor-side call itself blow up
+        await service.predict_async("warm", taxonomy_id="a")
+
+        def broken(groups):
+            raise RuntimeError("executor died")
+
+        service._batcher._predict_groups = broken
+        return await _gather(service, 6)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) and str(r) == "executor died" for r in results)
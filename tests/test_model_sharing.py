@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from ati_engine.inference.model import DistilBertClassifier  # noqa: E402
+from ati_engine.inference.sharing import load_shared_model  # noqa: E402
+from ati_engine.utils.memory import memory_report  # noqa: E402
+from ati_engine.utils.testing import build_tiny_nli_model  # noqa: E402
+
+TEXTS = ["paid at starbucks seattle", "uber trip 1234"]
+LABELS = ["Food & Dining", "Transport", "Entertainment"]
+
+
+def test_mmap_weights_match_private_copy(tmp_path, monkeypatch):
+    from ati_engine.core.config import settings
+
+    model_dir = build_tiny_nli_model(str(tmp_path / "tiny"))
+    shared_dir = str(tmp_path / "shared")
+    model, _ = load_shared_model(model_dir, shared_dir)
+    assert not any(p.is_meta for p in model.parameters())
+    assert not any(b.is_meta for b in model.buffers())
+
+    reference = DistilBertClassifier(model_name=model_dir, backend="torch")
+    expected = reference._nli_scores(TEXTS, LABELS, multi_label=False, batch_size=4)
+    monkeypatch.setattr(settings, "MODEL_SHARING", "mmap")
+    monkeypatch.setattr(settings, "SHARED_WEIGHTS_DIR", shared_dir)
+    shared = DistilBertClassifier(model_name=model_dir, backend="torch")
+    actual = shared._nli_scores(TEXTS, LABELS, multi_label=False, batch_size=4)
+    np.testing.assert_allclose(actual, expected, atol=1e-6)
+
+
+def test_memory_report_keys():
+    report = memory_report()
+    assert {"pid", "rss_mb", "pss_mb", "unique_mb", "shared_mb"} <= set(report)
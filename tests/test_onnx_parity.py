@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")
+
+from ati_engine.inference.export import export_onnx  # noqa: E402
+from ati_engine.inference.model import DistilBertClassifier  # noqa: E402
+from ati_engine.utils.testing import build_tiny_nli_model  # noqa: E402
+
+TEXTS = ["paid at starbucks seattle", "uber trip 1234", "netflix.com monthly subscription"]
+LABELS = ["Food & Dining", "Transport", "Entertainment", "Shopping"]
+
+
+@pytest.fixture(scope="module")
+def onnx_dir(tmp_path_factory):
+    model_dir = build_tiny_nli_model(str(tmp_path_factory.mktemp("tiny")))
+    export_onnx(model_dir, model_dir, quantize=True)
+    return model_dir
+
+
+@pytest.mark.parametrize("backend,atol", [("onnx", 1e-4), ("onnx-int8", 2e-2)])
+def test_onnx_scores_match_torch(onnx_dir, monkeypatch, backend, atol):
+    from ati_engine.core.config import settings
+
+    monkeypatch.setattr(settings, "ONNX_MODEL_DIR", onnx_dir)
+    reference = DistilBertClassifier(model_name=onnx_dir, backend="torch")
+    candidate = DistilBertClassifier(model_name=onnx_dir, backend=backend)
+    expected = reference._nli_scores(TEXTS, LABELS, multi_label=True, batch_size=4)
+    actual = candidate._nli_scores(TEXTS, LABELS, multi_label=True, batch_size=4)
+    np.testing.assert_allclose(actual, expected, atol=atol)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from ati_engine.inference.padding import PaddingStats, length_buckets
+
+
+def test_length_buckets_group_similar_lengths_and_cover_all_indices():
+    lengths = [30, 5, 12, 6, 29, 11, 4, 31]
+    buckets = list(length_buckets(lengths, batch_size=3))
+    assert sorted(i for b in buckets for i in b) == list(range(len(lengths)))
+    assert [[lengths[i] for i in b] for b in buckets] == [[4, 5, 6], [11, 12, 29], [30, 31]]
+
+    # A token budget lets short rows batch wider than long ones
+    buckets = list(length_buckets(lengths, batch_size=8, max_tokens=40))
+    assert all(len(b) * max(lengths[i] for i in b) <= 40 or len(b) == 1 for b in buckets)
+    assert len(buckets[0]) > len(buckets[-1])
+
+
+def test_padding_stats_snapshot():
+    stats = PaddingStats()
+    assert stats.snapshot()["padding_efficiency"] is None
+    stats.record([4, 4, 2], width=4)
+    stats.record_truncated(1)
+    snap = stats.snapshot()
+    assert snap["real_tokens"] == 10 and snap["padded_tokens"] == 12
+    assert snap["padding_efficiency"] == pytest.approx(10 / 12)
+    assert snap["truncated_sequences"] == 1 and snap["batches"] == 1
+
+
+def test_nli_scores_keep_input_order_and_respect_max_seq_length(tmp_path, monkeypatch):
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    from ati_engine.core.config import settings
+    from ati_engine.inference.model import DistilBertClassifier
+    from ati_engine.utils.testing import build_tiny_nli_model
+
+    model_dir = build_tiny_nli_model(str(tmp_path))
+    texts = ["uber trip", "paid at starbucks seattle " * 20, "netflix", "amazon marketplace order 1234"]
+    labels = ["Food & Dining", "Transport", "Entertainment"]
+
+    clf = DistilBertClassifier(model_name=model_dir, backend="torch")
+    unbatched = np.vstack([clf._nli_scores([t], labels, multi_label=True, batch_size=1) for t in texts])
+    batched = clf._nli_scores(texts, labels, multi_label=True, batch_size=4)
+    np.testing.assert_allclose(batched, unbatched, atol=1e-5)
+    assert clf.padding.snapshot()["padding_efficiency"] < 1.0
+
+    monkeypatch.setattr(settings, "MAX_SEQ_LENGTH", 48)
+    capped = DistilBertClassifier(model_name=model_dir, backend="torch")
+    capped._nli_scores(texts, labels, multi_label=True, batch_size=4)
+    snap = capped.padding.snapshot()
+    assert snap["truncated_sequences"] == len(labels)
+    assert snap["padded_tokens"] <= 48 * len(texts) * len(labels)
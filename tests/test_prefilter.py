@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from ati_engine.core.config import settings
+from ati_engine.inference.prefilter import LabelPrefilter, recall_report, shortlist_recall
+from ati_engine.taxonomy.loader import TaxonomyLoader
+from ati_engine.taxonomy.registry import TaxonomyIndex
+
+
+def _index() -> TaxonomyIndex:
+    loader = TaxonomyLoader(settings.TAXONOMY_PATH)
+    return TaxonomyIndex.compile(loader, loader.load(), version=1)
+
+
+def test_prefilter_ranks_keyword_overlap_first():
+    prefilter = LabelPrefilter.from_index(_index())
+    netflix, bill, unknown = prefilter.shortlist(["netflix.com 866-579-7172", "comcast internet bill", "zzz"], 3)
+    assert {prefilter.labels[j].split("::")[0] for j in netflix} == {"Entertainment"}
+    assert prefilter.labels[bill[0]] == "Bills & Utilities::Internet"
+    # No overlap at all: ties keep taxonomy order
+    assert unknown == [0, 1, 2]
+    assert prefilter.shortlist(["x"], 100) == [list(range(len(prefilter.labels)))]
+
+
+def test_shortlist_recall_counts_recovered_top_k():
+    full = np.array([[0.5, 0.3, 0.2], [0.1, 0.2, 0.7]])
+    assert shortlist_recall(full, [[0, 2], [1, 0]], ks=(1, 2)) == {"recall_at_1": 0.5, "recall_at_2": 0.5}
+
+
+def test_service_scores_only_the_shortlist(tmp_path, monkeypatch):
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    from ati_engine.inference.model import DistilBertClassifier
+    from ati_engine.inference.service import InferenceService
+    from ati_engine.utils.testing import build_tiny_nli_model
+
+    monkeypatch.setattr(settings, "RULES_MODE", "off")
+    service = InferenceService(model=DistilBertClassifier(model_name=build_tiny_nli_model(str(tmp_path))))
+    service.result_cache = None
+    texts = ["netflix.com 866-579-7172", "uber trip help"]
+    index = service.taxonomy()
+    labels = list(index.labels)
+    full = service.model.predict_batch(texts, candidate_labels=labels, top_k=len(labels))
+
+    monkeypatch.setattr(settings, "PREFILTER_TOP_N", 4)
+    service.model.padding.reset()
+    results = service.predict_batch(texts, top_k=2)
+    assert service.padding_stats()["sequences"] == 4 * len(texts)
+    shortlists = LabelPrefilter.from_index(index).shortlist(texts, 4)
+    for result, raw, picked in zip(results, full, shortlists):
+        assert result.metadata["num_labels"] == 4
+        allowed = {labels[j] for j in picked}
+        assert {p.label for p in result.top_predictions} <= allowed
+        # Same NLI logits, softmax taken over the shortlist only
+        full_scores = dict(zip(raw["labels"], raw["scores"]))
+        total = sum(full_scores[lbl] for lbl in allowed)
+        for p in result.top_predictions:
+            assert p.score == pytest.approx(full_scores[p.label] / total, rel=1e-4)
+
+    report = recall_report(service, texts, top_ns=[4, len(labels)], ks=(1,))
+    assert report["shortlists"][str(len(labels))]["recall_at_1"] == 1.0
+    assert report["shortlists"]["4"]["pairs_scored_fraction"] == pytest.approx(4 / len(labels))
+
+
+def test_per_taxonomy_caches_keep_recently_used_entries(tmp_path, monkeypatch):
+    from ati_engine.inference.service import InferenceService
+    from ati_engine.taxonomy.registry import TaxonomyCatalog
+    from ati_engine.utils.testing import KeywordStubModel
+
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.yaml").write_text(f"{name.upper()}1: {{}}\n{name.upper()}2: {{}}\n")
+    monkeypatch.setattr(settings, "PREFILTER_TOP_N", 1)
+    monkeypatch.setattr(settings, "MAX_LOADED_TAXONOMIES", 1)
+    model = KeywordStubModel({})
+    model.engine = "nli"
+    service = InferenceService(model=model, catalog=TaxonomyCatalog(str(tmp_path)))
+    a, b, c = (service.taxonomy(name) for name in ("a", "b", "c"))
+
+    first = service._prefilter(a)
+    service._candidate_labels(a)
+    service._prefilter(b)
+    service._candidate_labels(b)
+    # A hit refreshes "a", so adding "c" evicts "b" instead
+    assert service._prefilter(a) is first
+    service._candidate_labels(a)
+    service._prefilter(c)
+    service._candidate_labels(c)
+    assert list(service._prefilters) == [a.content_hash, c.content_hash]
+    assert list(service._candidates) == [a.content_hash, c.content_hash]
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import pytest
+
+from ati_engine.preprocessing.cleaner import canonicalize_descriptor, normalize_batch, normalize_text
+
+TEXTS = ["UBER *TRIP HELP.UBER.COM 12/31", "  Paid $23.45 at\tStarbucks  ", "Ｆｕｌｌ width ＣＡＦＥ", "12345"]
+
+
+def test_normalize_batch_matches_normalize_text():
+    assert normalize_batch(TEXTS, canonicalize=False) == [normalize_text(t) for t in TEXTS]
+    with pytest.raises(TypeError):
+        normalize_batch(["ok", None], canonicalize=False)
+
+
+@pytest.mark.parametrize(
+    "raw,expected",
+    [
+        ("POS DEBIT CARD XXXX1234 WALMART STORE 5521 2024-01-05", "pos debit card walmart store"),
+        ("NETFLIX.COM 866-579-7172", "netflix.com"),
+        ("AMAZON MKTPLACE PMTS AMZN.COM/BILL REF 8F7A6B5C4D3E", "amazon mktplace pmts amzn.com/bill ref"),
+        ("Paid $23.45 at Starbucks #0042", "paid at starbucks"),
+        ("7-ELEVEN 33421", "7-eleven"),
+        ("12345", "12345"),
+    ],
+)
+def test_canonicalize_strips_descriptor_noise(raw, expected):
+    assert canonicalize_descriptor(normalize_text(raw)) == expected
+    assert normalize_batch([raw], canonicalize=True) == [expected]
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import time
+
+from ati_engine.inference.cache import MemoryCacheBackend, ResultCache, SQLiteCacheBackend
+
+
+def test_memory_cache_evicts_lru_and_counts_hits():
+    cache = ResultCache(MemoryCacheBackend(max_size=2), ttl_s=60)
+    for name in ("a", "b", "c"):
+        cache.set(name, {"primary_label": name})
+    assert cache.get("a") is None
+    assert cache.get("c") == {"primary_label": "c"}
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["size"] == 2
+
+
+def test_cache_entries_expire():
+    cache = ResultCache(MemoryCacheBackend(max_size=10), ttl_s=0.01)
+    cache.set("k", {"primary_label": "x"})
+    time.sleep(0.02)
+    assert cache.get("k") is None
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    writer = ResultCache(SQLiteCacheBackend(path, max_size=10), ttl_s=60)
+    reader = ResultCache(SQLiteCacheBackend(path, max_size=10), ttl_s=60)
+    key = ResultCache.make_key("netflix.com", "hash", "nli|model", 5)
+    writer.set(key, {"primary_label": "Entertainment"})
+    assert reader.get(key) == {"primary_label": "Entertainment"}
+    assert ResultCache.make_key("netflix.com", "other", "nli|model", 5) != key
+
+
+def test_cached_results_are_keyed_by_inference_backend(monkeypatch):
+    from ati_engine.core.config import settings
+    from ati_engine.inference.service import InferenceService
+    from ati_engine.utils.testing import KeywordStubModel
+
+    monkeypatch.setattr(settings, "RULES_MODE", "off")
+    model = KeywordStubModel({"Entertainment": ["netflix"]})
+    model.backend_name = "onnx-int8"
+    service = InferenceService(model=model, result_cache=ResultCache(MemoryCacheBackend(max_size=10), ttl_s=60))
+
+    first = service.predict("netflix.com")
+    assert first.metadata["backend"] == "onnx-int8"
+    assert service.predict("netflix.com").metadata["backend"] == "onnx-int8" and model.calls == 1
+    # Switching backend must not serve the other backend's scores
+    model.backend_name = "torch"
+    assert service.predict("netflix.com").metadata["backend"] == "torch" and model.calls == 2
+
+
+def test_cached_results_are_keyed_by_truncation_and_temperature(monkeypatch):
+    from ati_engine.core.config import settings
+    from ati_engine.inference.service import InferenceService
+    from ati_engine.utils.testing import KeywordStubModel
+
+    monkeypatch.setattr(settings, "RULES_MODE", "off")
+    model = KeywordStubModel({"Entertainment": ["netflix"]})
+    service = InferenceService(model=model, result_cache=ResultCache(MemoryCacheBackend(max_size=10), ttl_s=60))
+
+    service.predict("netflix.com")
+    service.predict("netflix.com")
+    assert model.calls == 1
+    monkeypatch.setattr(settings, "MAX_SEQ_LENGTH", settings.MAX_SEQ_LENGTH // 2)
+    service.predict("netflix.com")
+    assert model.calls == 2
+    model.temperature = 0.1
+    service.predict("netflix.com")
+    assert model.calls == 3
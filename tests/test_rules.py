@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from ati_engine.inference.rules import KeywordMatcher
+from ati_engine.preprocessing.cleaner import normalize_text
+from ati_engine.taxonomy.loader import TaxonomyLoader
+
+
+def _matcher() -> KeywordMatcher:
+    loader = TaxonomyLoader("ati_engine/taxonomy/sample_taxonomy.yaml")
+    return KeywordMatcher(loader.label_keywords(loader.load()))
+
+
+def test_keyword_hit_classifies_known_merchant():
+    match = _matcher().classify(normalize_text("NETFLIX.COM 866-579-7172"))
+    assert match is not None
+    assert match.label == "Entertainment"
+
+
+def test_longest_keyword_wins_and_word_boundaries_apply():
+    matcher = _matcher()
+    assert matcher.classify("uber eats order").label == "Food & Dining"
+    assert matcher.classify("uber trip downtown").label == "Transport"
+    assert matcher.classify("gasket replacement") is None
+
+
+def test_conflicting_keywords_are_left_to_the_model():
+    assert _matcher().classify("amazon netflix gift") is None
+
+
+def test_rules_are_opt_in_and_mode_is_validated():
+    import pytest
+    from pydantic import ValidationError
+
+    from ati_engine.core.config import Settings
+
+    assert Settings.model_fields["RULES_MODE"].default == "off"
+    with pytest.raises(ValidationError):
+        Settings(RULES_MODE="short-circuit")
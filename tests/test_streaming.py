@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+
+from fastapi.testclient import TestClient
+
+from ati_engine.api.main import app
+from ati_engine.api.schemas import InferenceResponse, Prediction
+from ati_engine.core.config import settings
+from ati_engine.inference.service import get_inference_service
+
+
+class _StubService:
+    def __init__(self) -> None:
+        self.batches = []
+
+    def predict_batch(self, texts, top_k=5, include_scores=True, batch_size=None, taxonomy_id=None):
+        self.batches.append(list(texts))
+        preds = [Prediction(label=f"L{i}", score=1.0 / (i + 1)) for i in range(top_k)]
+        return [
+            InferenceResponse(input_text=t, top_predictions=preds, primary_label="L0", metadata={}) for t in texts
+        ]
+
+
+def test_stream_classifies_in_rolling_batches(monkeypatch):
+    monkeypatch.setattr(settings, "STREAM_BATCH_SIZE", 3)
+    monkeypatch.setattr(settings, "WARMUP_ON_STARTUP", False)
+    stub = _StubService()
+    app.dependency_overrides[get_inference_service] = lambda: stub
+    lines = [json.dumps({"text": f"txn {i}", "top_k": 1 + i % 2}) for i in range(7)]
+    lines.insert(2, "{not json")
+    lines.insert(4, "")
+    body = ("\n".join(lines) + "\n").encode("utf-8")
+    try:
+        with TestClient(app) as client:
+            response = client.post("/v1/infer/stream", content=iter([body[:50], body[50:]]))
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    out = [json.loads(line) for line in response.text.splitlines()]
+    assert [o.get("input_text") for o in out] == ["txn 0", "txn 1", None] + [f"txn {i}" for i in range(2, 7)]
+    assert out[2]["line"] == 2 and "error" in out[2]
+    assert [len(o["top_predictions"]) for o in out if "error" not in o] == [1 + i % 2 for i in range(7)]
+    assert all(len(b) <= 3 for b in stub.batches) and sum(map(len, stub.batches)) == 7
+    assert out[-1]["metadata"]["line"] == 8
+
+
+def test_stream_rejects_oversized_complete_lines(monkeypatch):
+    monkeypatch.setattr(settings, "STREAM_MAX_LINE_BYTES", 64)
+    monkeypatch.setattr(settings, "WARMUP_ON_STARTUP", False)
+    stub = _StubService()
+    app.dependency_overrides[get_inference_service] = lambda: stub
+    # The oversized line arrives complete within one chunk, so it never sits in the partial buffer
+    lines = [json.dumps({"text": "txn 0"}), json.dumps({"text": "x" * 100}), json.dumps({"text": "txn 2"})]
+    try:
+        with TestClient(app) as client:
+            response = client.post("/v1/infer/stream", content=iter([("\n".join(lines) + "\n").encode("utf-8")]))
+    finally:
+        app.dependency_overrides.clear()
+
+    out = [json.loads(line) for line in response.text.splitlines()]
+    assert [o.get("input_text") for o in out] == ["txn 0", None]
+    assert out[-1]["error"] == "Line 1 exceeds 64 bytes"
+    assert stub.batches == [["txn 0"]]
+
+
+def test_stream_flushes_partial_batch_while_client_pauses(monkeypatch):
+    import asyncio
+
+    from ati_engine.api.streaming import classify_ndjson
+
+    monkeypatch.setattr(settings, "STREAM_BATCH_SIZE", 64)
+    monkeypatch.setattr(settings, "STREAM_MAX_WAIT_MS", 20.0)
+    stub = _StubService()
+
+    async def run():
+        resume = asyncio.Event()
+
+        async def body():
+            yield (json.dumps({"text": "txn 0"}) + "\n" + json.dumps({"text": "txn 1"}) + "\n").encode("utf-8")
+            # The client pauses until it has seen results for what it already sent
+            await resume.wait()
+            yield (json.dumps({"text": "txn 2"}) + "\n").encode("utf-8")
+
+        seen = []
+        async for chunk in classify_ndjson(body(), stub):
+            seen.extend(json.loads(line)["input_text"] for line in chunk.decode("utf-8").splitlines())
+            resume.set()
+        return seen
+
+    assert asyncio.run(asyncio.wait_for(run(), timeout=5)) == ["txn 0", "txn 1", "txn 2"]
+    assert stub.batches == [["txn 0", "txn 1"], ["txn 2"]]
+
+
+def test_stream_isolates_a_failing_taxonomy(monkeypatch):
+    monkeypatch.setattr(settings, "WARMUP_ON_STARTUP", False)
+
+    class _FlakyService(_StubService):
+        def predict_batch(self, texts, top_k=5, include_scores=True, batch_size=None, taxonomy_id=None):
+            if taxonomy_id == "broken":
+                raise RuntimeError("tenant model failed")
+            return super().predict_batch(texts, top_k=top_k, taxonomy_id=taxonomy_id)
+
+    app.dependency_overrides[get_inference_service] = lambda: _FlakyService()
+    lines = [
+        json.dumps({"text": "txn 0"}),
+        json.dumps({"text": "txn 1", "taxonomy_id": "broken"}),
+        json.dumps({"text": "txn 2"}),
+    ]
+    try:
+        with TestClient(app) as client:
+            response = client.post("/v1/infer/stream", content=("\n".join(lines) + "\n").encode("utf-8"))
+    finally:
+        app.dependency_overrides.clear()
+
+    out = [json.loads(line) for line in response.text.splitlines()]
+    assert [o.get("input_text") for o in out] == ["txn 0", None, "txn 2"]
+    assert out[1] == {"line": 1, "error": "tenant model failed"}
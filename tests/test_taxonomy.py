@@ -10,3 +10,78 @@ def test_taxonomy_labels_list():
     assert any("Food" in l for l in labels)
     assert isinstance(labels, list)
     assert len(labels) > 0
+
+
+def _write(path, text):
+    import os
+    import time
+
+    path.write_text(text)
+    # Make sure the mtime moves even on coarse-grained filesystems
+    stamp = time.time() + 1
+    os.utime(path, (stamp, stamp))
+
+
+def test_registry_compiles_and_hot_reloads(tmp_path):
+    from ati_engine.taxonomy.registry import TaxonomyRegistry
+
+    path = tmp_path / "taxonomy.yaml"
+    _write(path, "Food:\n  subcategories: [Groceries]\n  keywords: [grocery]\n")
+    registry = TaxonomyRegistry(str(path), watch_interval_s=1e-6)
+    first = registry.current()
+    assert first.version == 1
+    assert first.labels == ("Food", "Food::Groceries")
+    assert first.parents["Food::Groceries"] == "Food"
+    assert first.keywords["Food"] == frozenset({"grocery"})
+
+    _write(path, "Food:\n  keywords: [grocery]\nTransport: {}\n")
+    second = registry.current()
+    assert second.version == 2 and second.labels == ("Food", "Transport")
+    assert first.labels == ("Food", "Food::Groceries")  # old index untouched
+
+    _write(path, "Food: [unclosed\n")
+    assert registry.current() is second  # broken file keeps the last good version
+    _write(path, "Food:\n  keywords: [grocery]\nTransport: {}\n")
+    assert registry.current() is second  # same content, same version
+
+
+def test_taxonomy_endpoint_supports_etag(monkeypatch):
+    import types
+
+    from fastapi.testclient import TestClient
+
+    from ati_engine.api.main import app
+    from ati_engine.core.config import settings
+    from ati_engine.inference.service import get_inference_service
+    from ati_engine.taxonomy.registry import TaxonomyRegistry
+
+    monkeypatch.setattr(settings, "WARMUP_ON_STARTUP", False)
+    registry = TaxonomyRegistry("ati_engine/taxonomy/sample_taxonomy.yaml")
+    stub = types.SimpleNamespace(taxonomy=lambda taxonomy_id=None: registry.current())
+    app.dependency_overrides[get_inference_service] = lambda: stub
+    try:
+        with TestClient(app) as client:
+            response = client.get("/v1/taxonomy")
+            assert response.status_code == 200 and "Food & Dining" in response.json()["labels"]
+            etag = response.headers["etag"]
+            cached = client.get("/v1/taxonomy", headers={"If-None-Match": etag})
+            assert cached.status_code == 304 and cached.headers["etag"] == etag
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_catalog_serves_tenants_from_directory(tmp_path):
+    import pytest
+
+    from ati_engine.taxonomy.registry import TaxonomyCatalog, UnknownTaxonomyError
+
+    (tmp_path / "retail.yaml").write_text("Groceries: {}\nFuel: {}\n")
+    (tmp_path / "travel.yml").write_text("Flights: {}\nHotels: {}\n")
+    catalog = TaxonomyCatalog(str(tmp_path), max_loaded=1)
+    assert catalog.available() == ["retail", "travel"]
+    assert catalog.get("retail").current().labels == ("Groceries", "Fuel")
+    assert catalog.get("travel").current().labels == ("Flights", "Hotels")
+    assert catalog.loaded() == ["travel"]
+    for bad in ("missing", "../retail"):
+        with pytest.raises(UnknownTaxonomyError):
+            catalog.get(bad)